@@ -162,6 +162,11 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                "Honor the __builtins__ key of a module dictionary",
                default=False),
 
+    BoolOption("quickening",
+               "run hot code objects with superinstructions for common "
+               "sequences of opcodes (not used by the JIT)",
+               default=False),
+
     BoolOption("disable_call_speedhacks",
                "make sure that all calls go through space.call_args",
                default=False),
@@ -199,6 +204,19 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                    "use specialised tuples",
                    default=False),
 
+        BoolOption("withunboxedtuple",
+                   "store tuples of ints, floats or strings unboxed",
+                   default=False),
+
+        BoolOption("withtuplelist",
+                   "store lists of tuples of the same shape column-wise",
+                   default=False,
+                   requires=[("objspace.std.withliststrategies", True)]),
+
+        BoolOption("withstrbuf",
+                   "use strings optimized for repeated addition",
+                   default=False),
+
         BoolOption("withliststrategies",
                    "enable optimized ways to store lists of primitives ",
                    default=True),
@@ -210,6 +228,10 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
         IntOption("methodcachesizeexp",
                   " 2 ** methodcachesizeexp is the size of the of the method cache ",
                   default=11),
+        IntOption("methodcachemaxsizeexp",
+                  "the method cache grows up to 2 ** methodcachemaxsizeexp "
+                  "entries when it has too many collisions",
+                  default=15),
         BoolOption("intshortcut",
                    "special case addition and subtraction of two integers in BINARY_ADD/"
                    "/BINARY_SUBTRACT and their inplace counterparts",
@@ -242,8 +264,10 @@ def set_pypy_opt_level(config, level):
     if level in ['2', '3', 'jit']:
         config.objspace.std.suggest(intshortcut=True)
         config.objspace.std.suggest(optimized_list_getitem=True)
+        config.objspace.suggest(quickening=True)
         #config.objspace.std.suggest(newshortcut=True)
         config.objspace.std.suggest(withspecialisedtuple=True)
+        config.objspace.std.suggest(withunboxedtuple=True)
         #if not IS_64_BITS:
         #    config.objspace.std.suggest(withsmalllong=True)
 
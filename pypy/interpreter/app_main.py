@@ -47,6 +47,8 @@ PYPY_IRC_TOPIC: if set to a non-empty value, print a random #pypy IRC
                topic at startup of interactive mode.
 PYPYLOG: If set to a non-empty value, enable logging.
 PYPY_DISABLE_JIT: if set to a non-empty value, disable JIT.
+PYPY_JIT_PROFILE: file from which to load the JIT warmup profile at
+               startup, and to which to save it at exit.
 """
 
 try:
@@ -276,6 +278,12 @@ def run_faulthandler():
         except ValueError:
             pass      # ignore "2 is not a valid file descriptor"
 
+def start_jit_profile():
+    # starting the pypyjit module loads the warmup profile named by
+    # PYPY_JIT_PROFILE, records it during the run and saves it at exit
+    if 'pypyjit' in sys.builtin_module_names:
+        import pypyjit
+
 def set_runtime_options(options, Xparam, *args):
     if Xparam == 'track-resources':
         sys.pypy_set_track_resources(True)
@@ -560,6 +568,8 @@ def parse_command_line(argv):
         parse_env('PYTHONOPTIMIZE', "optimize", options)
         if getenv('PYPY_DISABLE_JIT'):
             set_jit_option(options, 'off')
+        if getenv('PYPY_JIT_PROFILE'):
+            start_jit_profile()
     if (options["interactive"] or
         (not options["ignore_environment"] and getenv('PYTHONINSPECT'))):
         options["inspect"] = 1
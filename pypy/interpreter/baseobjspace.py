@@ -215,6 +215,10 @@ class W_Root(object):
         raise NotImplementedError
     def _set_mapdict_storage_and_map(self, storage, map):
         raise NotImplementedError
+    def _mapdict_read_unboxed(self, index):
+        raise NotImplementedError
+    def _mapdict_write_unboxed(self, index, value):
+        raise NotImplementedError
 
 
     # -------------------------------------------------------------------
@@ -765,6 +769,11 @@ class ObjSpace(object):
 
     def createframe(self, code, w_globals, outer_func=None):
         "Create an empty PyFrame suitable for this code object."
+        if not jit.we_are_jitted():
+            from pypy.interpreter.generator import take_free_frame
+            frame = take_free_frame(self, code, w_globals, outer_func)
+            if frame is not None:
+                return frame
         return self.FrameClass(self, code, w_globals, outer_func)
 
     def allocate_lock(self):
@@ -1,11 +1,45 @@
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.pyopcode import LoopBlock
-from pypy.interpreter.pycode import CO_YIELD_INSIDE_TRY
+from pypy.interpreter.pycode import PyCode, CO_GENERATOR, CO_YIELD_INSIDE_TRY
 from pypy.interpreter.typedef import TypeDef, make_weakref_descr, interp_attrproperty, GetSetProperty
 from pypy.interpreter.gateway import interp2app
 from rpython.rlib import jit, rgc
 
+# the maximum number of finished frames kept for reuse per code object
+MAX_FREE_FRAMES = 4
+
+
+class GeneratorFrameStats(object):
+    """Counters about the reuse of generator frames, returned by
+    __pypy__.generator_frame_stats()."""
+
+    def __init__(self, space):
+        self.reset()
+
+    def reset(self):
+        self.num_allocated = 0
+        self.num_reused = 0
+        self.num_recycled = 0
+
+
+def take_free_frame(space, code, w_globals, outer_func):
+    """If 'code' is the code of a generator and a finished frame of an
+    earlier generator running it is available, reset and return it.
+    Otherwise return None."""
+    assert isinstance(code, PyCode)
+    if not code.co_flags & CO_GENERATOR:
+        return None
+    stats = space.fromcache(GeneratorFrameStats)
+    free_frames = code._free_generator_frames
+    if not free_frames:
+        stats.num_allocated += 1
+        return None
+    frame = free_frames.pop()
+    frame.reset_finished_frame(w_globals, outer_func)
+    stats.num_reused += 1
+    return frame
+
 
 class GeneratorIterator(W_Root):
     "An iterator created by a generator."
@@ -109,6 +143,7 @@ return next yielded value or raise StopIteration."""
             # if the frame is now marked as finished, it was RETURNed from
             if frame.frame_finished_execution:
                 self.frame_is_finished()
+                self._recycle_frame(frame)
                 raise OperationError(space.w_StopIteration, space.w_None)
             else:
                 return w_result     # YIELDed
@@ -159,6 +194,7 @@ return next yielded value or raise StopIteration."""
 
     def descr_gi_frame(self, space):
         if self.frame is not None and not self.frame.frame_finished_execution:
+            self.frame.mark_as_escaped()
             return self.frame
         else:
             return space.w_None
@@ -192,6 +228,7 @@ return next yielded value or raise StopIteration."""
             if frame is None:    # already finished
                 return
             self.running = True
+            returned = False
             try:
                 pycode = self.pycode
                 while True:
@@ -205,12 +242,15 @@ return next yielded value or raise StopIteration."""
                         break
                     # if the frame is now marked as finished, it was RETURNed from
                     if frame.frame_finished_execution:
+                        returned = True
                         break
                     results.append(w_result)     # YIELDed
             finally:
                 frame.f_backref = jit.vref_None
                 self.running = False
                 self.frame_is_finished()
+            if returned:
+                self._recycle_frame(frame)
         return unpack_into
     unpack_into = _create_unpack_into()
     unpack_into_w = _create_unpack_into()
@@ -233,6 +273,28 @@ return next yielded value or raise StopIteration."""
         self.frame = None
         rgc.may_ignore_finalizer(self)
 
+    def _recycle_frame(self, frame):
+        """Called when the frame returned.  Unless something outside the
+        interpreter can still look at it, keep it on the code object, to be
+        reused by the next generator running the same code.  Frames that
+        finished with an exception are not recycled: the traceback refers
+        to them."""
+        if jit.we_are_jitted():
+            return
+        space = self.space
+        if not frame.can_be_recycled(space.getexecutioncontext()):
+            return
+        code = self.pycode
+        free_frames = code._free_generator_frames
+        if free_frames is None:
+            free_frames = code._free_generator_frames = []
+        elif len(free_frames) >= MAX_FREE_FRAMES:
+            return
+        frame.clear_storage()
+        frame.f_backref = jit.vref_None
+        free_frames.append(frame)
+        space.fromcache(GeneratorFrameStats).num_recycled += 1
+
     def iterator_greenkey(self, space):
         return self.pycode
 
@@ -10,6 +10,7 @@ from pypy.interpreter import eval
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.quicken import quicken, QUICKEN_THRESHOLD
 from pypy.interpreter.astcompiler.consts import (
     CO_OPTIMIZED, CO_NEWLOCALS, CO_VARARGS, CO_VARKEYWORDS, CO_NESTED,
     CO_GENERATOR, CO_KILL_DOCSTRING, CO_YIELD_INSIDE_TRY)
@@ -52,6 +53,8 @@ def make_signature(code):
 class CodeHookCache(object):
     def __init__(self, space):
         self._code_hook = None
+        # see pypy.module.pypyjit.interp_profile
+        self._warmup_profile = None
 
 class PyCode(eval.Code):
     "CPython-style code objects."
@@ -107,7 +110,10 @@ class PyCode(eval.Code):
         return True
 
     def new_code_hook(self):
-        code_hook = self.space.fromcache(CodeHookCache)._code_hook
+        cache = self.space.fromcache(CodeHookCache)
+        if cache._warmup_profile is not None:
+            cache._warmup_profile.seed_code(self)
+        code_hook = cache._code_hook
         if code_hook is not None:
             try:
                 self.space.call_function(code_hook, self)
@@ -137,6 +143,39 @@ class PyCode(eval.Code):
 
         init_mapdict_cache(self)
         self._globals_caches = [None] * len(self.co_names_w)
+        # allocated the first time an attribute of a module is read
+        self._module_attr_caches = None
+        # see pypy.interpreter.quicken
+        self._quickened_code = None
+        self._quicken_countdown = QUICKEN_THRESHOLD
+        # locals_cells_stack_w list of a finished frame, see
+        # PyFrame._release_storage()
+        self._free_frame_storage = None
+        # finished generator frames ready to be reused, see
+        # pypy.interpreter.generator
+        self._free_generator_frames = None
+        # per call site caches for calls with keyword arguments, see
+        # pypy.objspace.std.kwcall
+        self._kwcall_caches = None
+
+    def get_code_for_dispatch(self):
+        """Return the bytecode string that the interpreter should run:
+        co_code, or its quickened copy once this code object is hot.
+        Never called from JITted code."""
+        quickened = self._quickened_code
+        if quickened is not None:
+            return quickened
+        self._quicken_countdown -= 1
+        if self._quicken_countdown > 0:
+            return self.co_code
+        quickened = quicken(self.co_code)
+        self._quickened_code = quickened
+        return quickened
+
+    def _take_frame_storage(self):
+        storage = self._free_frame_storage
+        self._free_frame_storage = None
+        return storage
 
     def _init_ready(self):
         "This is a hook for the vmprof module, which overrides this method."
@@ -103,7 +103,12 @@ class PyFrame(W_Root):
         size = code.co_nlocals + ncellvars + nfreevars + code.co_stacksize
         # the layout of this list is as follows:
         # | local vars | cells | stack |
-        self.locals_cells_stack_w = [None] * size
+        storage = None
+        if not jit.we_are_jitted():
+            storage = code._take_frame_storage()
+        if storage is None:
+            storage = [None] * size
+        self.locals_cells_stack_w = storage
         self.valuestackdepth = code.co_nlocals + ncellvars + nfreevars
         make_sure_not_resized(self.locals_cells_stack_w)
         check_nonneg(self.valuestackdepth)
@@ -297,9 +302,57 @@ class PyFrame(W_Root):
             got_exception = False
         finally:
             executioncontext.leave(self, w_exitvalue, got_exception)
+        if not jit.we_are_jitted():
+            self._release_storage(executioncontext)
         return w_exitvalue
     execute_frame.insert_stack_check_here = True
 
+    def _release_storage(self, ec):
+        """Called when the frame returned normally.  If nothing outside
+        the interpreter can still look at it, hand its locals_cells_stack_w
+        list back to the code object, to be reused by the next frame
+        running the same code.  Frames that escaped (see mark_as_escaped()),
+        have debug data (tracing, profiling, f_locals, ...) or belong to a
+        generator keep their storage.
+        """
+        code = self.pycode
+        if (code.co_flags & pycode.CO_GENERATOR or
+                not self.can_be_recycled(ec)):
+            return
+        self.clear_storage()
+        code._free_frame_storage = self.locals_cells_stack_w
+
+    def can_be_recycled(self, ec):
+        """Whether nothing outside the interpreter can still look at this
+        finished frame: it did not escape, has no debug data, and no
+        profiler or reverse debugger is running."""
+        return not (self.escaped or self.debugdata is not None or
+                    ec.profilefunc is not None or
+                    self.space.reverse_debugging)
+
+    def clear_storage(self):
+        storage = self.locals_cells_stack_w
+        for i in range(len(storage)):
+            storage[i] = None
+
+    def reset_finished_frame(self, w_globals, outer_func):
+        """Prepare a finished frame, whose storage was cleared by
+        clear_storage(), to run its code again from the start.  Only used
+        for generator frames, see pypy.interpreter.generator."""
+        code = self.pycode
+        self.frame_finished_execution = False
+        self.last_instr = -1
+        self.last_exception = None
+        self.f_backref = jit.vref_None
+        self.lastblock = None
+        if code.frame_stores_global(w_globals):
+            self.getorcreatedebug().w_globals = w_globals
+        self.valuestackdepth = (code.co_nlocals + len(code.co_cellvars) +
+                                len(code.co_freevars))
+        if self.space.config.objspace.honor__builtins__:
+            self.builtin = self.space.builtin.pick_builtin(w_globals)
+        self.initialize_frame_scopes(outer_func, code)
+
     # stack manipulation helpers
     def pushvalue(self, w_object):
         depth = self.valuestackdepth
@@ -869,7 +922,10 @@ class PyFrame(W_Root):
         return ExecutionContext.getnextframe_nohidden(self)
 
     def fget_f_back(self, space):
-        return self.get_f_back()
+        f_back = self.get_f_back()
+        if f_back is not None:
+            f_back.mark_as_escaped()
+        return f_back
 
     def fget_f_lasti(self, space):
         return self.space.newint(self.last_instr)
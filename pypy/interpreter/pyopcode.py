@@ -12,7 +12,7 @@ from rpython.rlib.rarithmetic import r_uint, intmask
 from rpython.tool.sourcetools import func_with_new_name
 
 from pypy.interpreter import (
-    gateway, function, eval, pyframe, pytraceback, pycode
+    gateway, function, eval, pyframe, pytraceback, pycode, quicken
 )
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
@@ -43,6 +43,22 @@ def binaryoperation(operationname):
 
     return func_with_new_name(opimpl, "opcode_impl_for_%s" % operationname)
 
+@not_rpython
+def localvarpair(first, second):
+    # superinstruction for two LOAD_FAST or STORE_FAST in a row, see
+    # pypy.interpreter.quicken
+    def opimpl(self, varindex, next_instr, ec):
+        getattr(self, first)(varindex, next_instr)
+        if self._must_trace_each_opcode(ec):
+            return next_instr
+        varindex2 = self._quickened_oparg(next_instr)
+        self.last_instr = intmask(next_instr)
+        next_instr += 3
+        getattr(self, second)(varindex2, next_instr)
+        return next_instr
+
+    return func_with_new_name(opimpl, "%s_%s" % (first, second))
+
 
 opcodedesc = bytecode_spec.opcodedesc
 HAVE_ARGUMENT = bytecode_spec.HAVE_ARGUMENT
@@ -57,9 +73,12 @@ class __extend__(pyframe.PyFrame):
         # For the sequel, force 'next_instr' to be unsigned for performance
         next_instr = r_uint(next_instr)
         co_code = pycode.co_code
+        quickening = self.space.config.objspace.quickening
 
         try:
             while True:
+                if quickening:
+                    co_code = pycode.get_code_for_dispatch()
                 next_instr = self.handle_bytecode(co_code, next_instr, ec)
         except ExitFrame:
             self.last_exception = None
@@ -444,6 +463,23 @@ class __extend__(pyframe.PyFrame):
                 self.YIELD_VALUE(oparg, next_instr)
             elif opcode == opcodedesc.LOAD_REVDB_VAR.index:
                 self.LOAD_REVDB_VAR(oparg, next_instr)
+            elif opcode == quicken.LOAD_FAST_LOAD_ATTR:
+                next_instr = self.LOAD_FAST_LOAD_ATTR(oparg, next_instr, ec)
+            elif opcode == quicken.LOAD_FAST_LOAD_CONST_BINARY_ADD:
+                next_instr = self.LOAD_FAST_LOAD_CONST_BINARY_ADD(
+                    oparg, next_instr, ec)
+            elif opcode == quicken.COMPARE_OP_POP_JUMP_IF_FALSE:
+                next_instr = self.COMPARE_OP_POP_JUMP_IF_FALSE(
+                    oparg, next_instr, ec)
+            elif opcode == quicken.COMPARE_OP_POP_JUMP_IF_TRUE:
+                next_instr = self.COMPARE_OP_POP_JUMP_IF_TRUE(
+                    oparg, next_instr, ec)
+            elif opcode == quicken.LOAD_FAST_LOAD_FAST:
+                next_instr = self.LOAD_FAST_LOAD_FAST(oparg, next_instr, ec)
+            elif opcode == quicken.STORE_FAST_LOAD_FAST:
+                next_instr = self.STORE_FAST_LOAD_FAST(oparg, next_instr, ec)
+            elif opcode == quicken.STORE_FAST_STORE_FAST:
+                next_instr = self.STORE_FAST_STORE_FAST(oparg, next_instr, ec)
             else:
                 self.MISSING_OPCODE(oparg, next_instr)
 
@@ -1100,6 +1136,64 @@ class __extend__(pyframe.PyFrame):
             return target
         return next_instr
 
+    ##  Superinstructions, see pypy.interpreter.quicken.  They only appear
+    ##  in the quickened copy of co_code, which is never run by the JIT.
+
+    def _must_trace_each_opcode(self, ec):
+        # mirrors the conditions of ec.bytecode_only_trace()
+        return (self.space.reverse_debugging or
+                (self.get_w_f_trace() is not None and
+                 ec.gettrace() is not None))
+
+    def _quickened_oparg(self, next_instr):
+        # the argument of the (unmodified) instruction at 'next_instr'
+        co_code = self.pycode.co_code
+        lo = ord(co_code[next_instr + 1])
+        hi = ord(co_code[next_instr + 2])
+        return (hi * 256) | lo
+
+    def LOAD_FAST_LOAD_ATTR(self, varindex, next_instr, ec):
+        self.LOAD_FAST(varindex, next_instr)
+        if self._must_trace_each_opcode(ec):
+            return next_instr
+        nameindex = self._quickened_oparg(next_instr)
+        self.last_instr = intmask(next_instr)
+        next_instr += 3
+        self.LOAD_ATTR(nameindex, next_instr)
+        return next_instr
+
+    def LOAD_FAST_LOAD_CONST_BINARY_ADD(self, varindex, next_instr, ec):
+        self.LOAD_FAST(varindex, next_instr)
+        if self._must_trace_each_opcode(ec):
+            return next_instr
+        constindex = self._quickened_oparg(next_instr)
+        next_instr += 3
+        self.LOAD_CONST(constindex, next_instr)
+        self.last_instr = intmask(next_instr)
+        next_instr += 1
+        self.BINARY_ADD(0, next_instr)
+        return next_instr
+
+    def COMPARE_OP_POP_JUMP_IF_FALSE(self, testnum, next_instr, ec):
+        self.COMPARE_OP(testnum, next_instr)
+        if self._must_trace_each_opcode(ec):
+            return next_instr
+        target = self._quickened_oparg(next_instr)
+        self.last_instr = intmask(next_instr)
+        return self.POP_JUMP_IF_FALSE(target, next_instr + 3)
+
+    def COMPARE_OP_POP_JUMP_IF_TRUE(self, testnum, next_instr, ec):
+        self.COMPARE_OP(testnum, next_instr)
+        if self._must_trace_each_opcode(ec):
+            return next_instr
+        target = self._quickened_oparg(next_instr)
+        self.last_instr = intmask(next_instr)
+        return self.POP_JUMP_IF_TRUE(target, next_instr + 3)
+
+    LOAD_FAST_LOAD_FAST = localvarpair('LOAD_FAST', 'LOAD_FAST')
+    STORE_FAST_LOAD_FAST = localvarpair('STORE_FAST', 'LOAD_FAST')
+    STORE_FAST_STORE_FAST = localvarpair('STORE_FAST', 'STORE_FAST')
+
     def JUMP_IF_FALSE_OR_POP(self, target, next_instr):
         w_value = self.peekvalue()
         if not self.space.is_true(w_value):
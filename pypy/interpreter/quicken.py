@@ -0,0 +1,91 @@
+"""
+Quickening: once a code object is hot, the bytecode interpreter runs a
+copy of its co_code in which some common sequences of opcodes start with
+a superinstruction that executes the whole sequence in one dispatch.
+
+Within a sequence, only the opcode byte of its first instruction is
+rewritten.  The arguments and the other instructions of the sequence are
+left alone, so a superinstruction can always fall back to executing just
+its first instruction (this is what it does when the frame is being
+traced).  Sequences may overlap: an instruction in the middle of one
+sequence can itself start another one and then be rewritten too, e.g.
+the LOAD_FASTs of 'a, b, c.x' become LOAD_FAST_LOAD_FAST,
+LOAD_FAST_LOAD_FAST, LOAD_FAST_LOAD_ATTR.  A jump into the middle of a
+sequence therefore finds either the original instruction or a
+superinstruction that starts there, and both are correct at that point.
+
+co_code itself is never modified: 'dis', marshal, code comparison and
+the JIT (which reads co_code as a green) never see the superinstructions.
+"""
+
+from pypy.tool.stdlib_opcode import opcodedesc, opmap, HAVE_ARGUMENT
+
+# number of times a code object is dispatched into (function entries,
+# generator resumptions and backward jumps) before it is quickened
+QUICKEN_THRESHOLD = 32
+
+# the superinstructions use opcode numbers that CPython 2.7 leaves free
+LOAD_FAST_LOAD_ATTR = 150
+LOAD_FAST_LOAD_CONST_BINARY_ADD = 151
+COMPARE_OP_POP_JUMP_IF_FALSE = 152
+COMPARE_OP_POP_JUMP_IF_TRUE = 153
+LOAD_FAST_LOAD_FAST = 154
+STORE_FAST_LOAD_FAST = 155
+STORE_FAST_STORE_FAST = 156
+
+SUPERINSTRUCTIONS = [
+    (LOAD_FAST_LOAD_ATTR,
+        [opcodedesc.LOAD_FAST.index, opcodedesc.LOAD_ATTR.index]),
+    (LOAD_FAST_LOAD_CONST_BINARY_ADD,
+        [opcodedesc.LOAD_FAST.index, opcodedesc.LOAD_CONST.index,
+         opcodedesc.BINARY_ADD.index]),
+    (COMPARE_OP_POP_JUMP_IF_FALSE,
+        [opcodedesc.COMPARE_OP.index, opcodedesc.POP_JUMP_IF_FALSE.index]),
+    (COMPARE_OP_POP_JUMP_IF_TRUE,
+        [opcodedesc.COMPARE_OP.index, opcodedesc.POP_JUMP_IF_TRUE.index]),
+    # the longer sequences starting with LOAD_FAST must come first
+    (LOAD_FAST_LOAD_FAST,
+        [opcodedesc.LOAD_FAST.index, opcodedesc.LOAD_FAST.index]),
+    (STORE_FAST_LOAD_FAST,
+        [opcodedesc.STORE_FAST.index, opcodedesc.LOAD_FAST.index]),
+    (STORE_FAST_STORE_FAST,
+        [opcodedesc.STORE_FAST.index, opcodedesc.STORE_FAST.index]),
+]
+
+for _superop, _ops in SUPERINSTRUCTIONS:
+    assert _superop not in opmap.values()
+    # the generic decoding in dispatch_bytecode() gives the argument of the
+    # first instruction of the sequence
+    assert (_superop >= HAVE_ARGUMENT) == (_ops[0] >= HAVE_ARGUMENT)
+del _superop, _ops
+
+
+def _instr_size(opcode):
+    if opcode >= HAVE_ARGUMENT:
+        return 3
+    return 1
+
+def _match(co_code, i, ops):
+    for op in ops:
+        if i >= len(co_code) or ord(co_code[i]) != op:
+            return False
+        i += _instr_size(op)
+    return i <= len(co_code)
+
+def quicken(co_code):
+    """Return a copy of 'co_code' where the sequences listed in
+    SUPERINSTRUCTIONS start with the corresponding superinstruction."""
+    n = len(co_code)
+    code = [co_code[i] for i in range(n)]
+    i = 0
+    extended_arg = False
+    while i < n:
+        opcode = ord(co_code[i])
+        if not extended_arg:
+            for superop, ops in SUPERINSTRUCTIONS:
+                if _match(co_code, i, ops):
+                    code[i] = chr(superop)
+                    break
+        extended_arg = opcode == opcodedesc.EXTENDED_ARG.index
+        i += _instr_size(opcode)
+    return ''.join(code)
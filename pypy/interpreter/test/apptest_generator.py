@@ -309,3 +309,44 @@ def test_multiple_invalid_sends():
         g.send(2)
     with raises(TypeError):
         g.send(2)
+
+def test_reused_frames_start_afresh():
+    def make(k):
+        def g(n):
+            a = [k]
+            def h():
+                return a[0] + n
+            yield h()
+            a[0] += 100
+            yield h()
+            b = n
+            yield b
+        return g
+    g1 = make(1)
+    for i in range(5):
+        assert list(g1(i)) == [1 + i, 101 + i, i]
+    g2 = make(2)
+    gens = [g2(i) for i in range(5)]
+    assert [next(gen) for gen in gens] == [2, 3, 4, 5, 6]
+    for gen in gens:
+        list(gen)
+    assert list(g2(10)) == [12, 112, 10]
+    assert sum(x for x in range(10)) == 45
+    assert sum(x for x in range(20)) == 190
+
+def test_frame_of_failed_generator_is_kept():
+    import sys
+    def g(n, fail):
+        yield n
+        if fail:
+            raise ValueError(n)
+    tbs = []
+    for i in range(3):
+        try:
+            list(g(i, True))
+        except ValueError:
+            tbs.append(sys.exc_info()[2])
+    for i in range(3):
+        assert list(g(i + 10, False)) == [i + 10]
+    for i, tb in enumerate(tbs):
+        assert tb.tb_next.tb_frame.f_locals == {'n': i, 'fail': True}
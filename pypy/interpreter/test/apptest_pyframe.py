@@ -574,3 +574,35 @@ def test_local_trace_function_returning_None_ignored():
     function()
     sys.settrace(None)
     assert seen == ["line", "line", "line", "return"]
+
+def test_escaped_frame_keeps_locals():
+    import sys
+    def f(x):
+        y = x * 2
+        return sys._getframe()
+    frames = [f(i) for i in range(5)]
+    assert [(fr.f_locals['x'], fr.f_locals['y']) for fr in frames] == [
+        (i, i * 2) for i in range(5)]
+
+def test_traceback_frame_keeps_locals():
+    import sys
+    def f(x):
+        try:
+            raise ValueError
+        except ValueError:
+            return sys.exc_info()[2]
+    tbs = [f(i) for i in range(5)]
+    assert [tb.tb_frame.f_locals['x'] for tb in tbs] == range(5)
+
+def test_f_back_escapes():
+    def gen():
+        while True:
+            yield it.gi_frame.f_back
+    def resume(x):
+        return next(it)
+    it = gen()
+    f_back = resume(42)
+    assert f_back.f_code is resume.__code__
+    assert f_back.f_locals['x'] == 42
+    resume(43)
+    assert f_back.f_locals['x'] == 42
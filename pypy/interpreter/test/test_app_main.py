@@ -235,6 +235,18 @@ class TestParseCommandLine:
         self.check(['-X', 'track-resources'], {}, sys_argv=[''], run_stdin=True)
         assert myflag[0] == True
 
+    def test_jit_profile_envvar(self, monkeypatch):
+        from pypy.interpreter import app_main
+        started = []
+        monkeypatch.setattr(app_main, 'start_jit_profile',
+                            lambda: started.append(True))
+        self.check([], {'PYPY_JIT_PROFILE': 'profile'}, sys_argv=[''],
+                   run_stdin=True)
+        assert started == [True]
+        self.check(['-E'], {'PYPY_JIT_PROFILE': 'profile'}, sys_argv=[''],
+                   run_stdin=True, ignore_environment=1)
+        assert started == [True]
+
 
 class TestInteraction:
     """
@@ -13,3 +13,36 @@ def test_should_not_inline(space):
         return g.__code__
     ''')
     assert should_not_inline(w_co) == True
+
+def test_finished_frames_are_reused(space):
+    from pypy.interpreter.generator import MAX_FREE_FRAMES
+    w_res = space.appexec([], '''():
+        def g(n):
+            for i in range(n):
+                yield i
+        assert sum(g(5)) == 10
+        frames = []
+        for i in range(3):
+            gen = g(2)
+            frames.append(gen.gi_frame)
+            list(gen)
+        assert sum(g(5)) == 10
+        return g.__code__, frames
+    ''')
+    w_code, w_frames = space.unpackiterable(w_res)
+    free_frames = w_code._free_generator_frames
+    assert len(free_frames) == 1
+    frames_w = space.unpackiterable(w_frames)
+    # frames exposed with gi_frame are never reused
+    for w_frame in frames_w:
+        assert w_frame.escaped
+        assert w_frame not in free_frames
+    w_g = space.appexec([], '''():
+        def g():
+            yield 1
+        gens = [g() for i in range(%d)]
+        for gen in gens:
+            list(gen)
+        return g
+    ''' % (MAX_FREE_FRAMES + 3))
+    assert len(w_g.code._free_generator_frames) == MAX_FREE_FRAMES
@@ -56,3 +56,44 @@ class AppTestPyFrame:
         assert res == 2
         if hasattr(self, "check_no_w_locals"): # not appdirect
             assert self.check_no_w_locals(fh.frame)
+
+
+class TestFrameStorage:
+    def test_storage_reused(self):
+        space = self.space
+        w_f = space.appexec([], """():
+            def f(x):
+                y = x + 1
+                return y
+            return f""")
+        code = w_f.code
+        assert code._free_frame_storage is None
+        space.call_function(w_f, space.newint(1))
+        storage = code._free_frame_storage
+        assert storage is not None
+        assert storage == [None] * len(storage)
+        w_res = space.call_function(w_f, space.newint(41))
+        assert space.int_w(w_res) == 42
+        assert code._free_frame_storage is storage
+
+    def test_storage_of_escaped_frame_not_reused(self):
+        space = self.space
+        w_f = space.appexec([], """():
+            import sys
+            def f(x):
+                return sys._getframe()
+            return f""")
+        code = w_f.code
+        w_frame = space.call_function(w_f, space.newint(1))
+        assert code._free_frame_storage is None
+        assert w_frame.locals_cells_stack_w[0] is not None
+
+    def test_generator_storage_not_reused(self):
+        space = self.space
+        w_gen = space.appexec([], """():
+            def gen():
+                yield 1
+            for x in gen():
+                pass
+            return gen""")
+        assert w_gen.code._free_frame_storage is None
@@ -0,0 +1,219 @@
+from pypy.interpreter import quicken
+from pypy.interpreter.pycode import PyCode
+from pypy.tool.stdlib_opcode import opcodedesc
+
+
+def _instr(opcode, arg=None):
+    if arg is None:
+        return chr(opcode)
+    return chr(opcode) + chr(arg & 0xff) + chr(arg >> 8)
+
+LOAD_FAST = opcodedesc.LOAD_FAST.index
+LOAD_ATTR = opcodedesc.LOAD_ATTR.index
+LOAD_CONST = opcodedesc.LOAD_CONST.index
+BINARY_ADD = opcodedesc.BINARY_ADD.index
+COMPARE_OP = opcodedesc.COMPARE_OP.index
+POP_JUMP_IF_FALSE = opcodedesc.POP_JUMP_IF_FALSE.index
+STORE_FAST = opcodedesc.STORE_FAST.index
+EXTENDED_ARG = opcodedesc.EXTENDED_ARG.index
+RETURN_VALUE = opcodedesc.RETURN_VALUE.index
+
+
+class TestQuicken:
+    def test_rewrites_first_opcode_only(self):
+        co_code = (_instr(LOAD_FAST, 0) + _instr(LOAD_ATTR, 1) +
+                   _instr(LOAD_FAST, 1) + _instr(LOAD_CONST, 2) +
+                   _instr(BINARY_ADD) +
+                   _instr(COMPARE_OP, 0) + _instr(POP_JUMP_IF_FALSE, 300) +
+                   _instr(RETURN_VALUE))
+        res = quicken.quicken(co_code)
+        assert len(res) == len(co_code)
+        assert ord(res[0]) == quicken.LOAD_FAST_LOAD_ATTR
+        assert ord(res[6]) == quicken.LOAD_FAST_LOAD_CONST_BINARY_ADD
+        assert ord(res[13]) == quicken.COMPARE_OP_POP_JUMP_IF_FALSE
+        changed = [i for i in range(len(co_code)) if res[i] != co_code[i]]
+        assert changed == [0, 6, 13]
+
+    def test_local_variable_pairs(self):
+        co_code = (_instr(LOAD_FAST, 0) + _instr(LOAD_FAST, 1) +
+                   _instr(LOAD_FAST, 2) + _instr(LOAD_ATTR, 0) +
+                   _instr(STORE_FAST, 3) + _instr(STORE_FAST, 4) +
+                   _instr(STORE_FAST, 5) + _instr(LOAD_FAST, 3) +
+                   _instr(RETURN_VALUE))
+        res = quicken.quicken(co_code)
+        assert [ord(res[i]) for i in range(0, 24, 3)] == [
+            quicken.LOAD_FAST_LOAD_FAST, quicken.LOAD_FAST_LOAD_FAST,
+            quicken.LOAD_FAST_LOAD_ATTR, LOAD_ATTR,
+            quicken.STORE_FAST_STORE_FAST, quicken.STORE_FAST_STORE_FAST,
+            quicken.STORE_FAST_LOAD_FAST, LOAD_FAST]
+
+    def test_no_partial_match(self):
+        co_code = (_instr(LOAD_FAST, 0) + _instr(LOAD_CONST, 1) +
+                   _instr(RETURN_VALUE))
+        assert quicken.quicken(co_code) == co_code
+        co_code = _instr(LOAD_FAST, 0) + _instr(LOAD_CONST, 1)
+        assert quicken.quicken(co_code) == co_code
+
+    def test_extended_arg(self):
+        co_code = (_instr(EXTENDED_ARG, 1) + _instr(LOAD_FAST, 0) +
+                   _instr(LOAD_ATTR, 1) +
+                   _instr(LOAD_FAST, 0) + _instr(EXTENDED_ARG, 1) +
+                   _instr(LOAD_ATTR, 1))
+        assert quicken.quicken(co_code) == co_code
+
+
+class TestQuickenedCode:
+    spaceconfig = {"objspace.quickening": True}
+
+    def test_code_object_gets_quickened(self):
+        space = self.space
+        w_f = space.appexec([], """():
+            def f(x):
+                return x.real + 1
+            return f""")
+        w_code = space.getattr(w_f, space.newtext('__code__'))
+        code = space.interp_w(PyCode, w_code)
+        for i in range(quicken.QUICKEN_THRESHOLD - 1):
+            space.call_function(w_f, space.newint(i))
+        assert code._quickened_code is None
+        w_res = space.call_function(w_f, space.newint(41))
+        assert space.int_w(w_res) == 42
+        assert code._quickened_code is not None
+        assert code._quickened_code != code.co_code
+        assert ord(code._quickened_code[0]) == quicken.LOAD_FAST_LOAD_ATTR
+
+
+class AppTestQuickening:
+    spaceconfig = {"objspace.quickening": True}
+
+    def test_results(self):
+        def f(a, b, n):
+            total = 0
+            i = 0
+            while i < n:
+                total = total + 1
+                if a < b:
+                    total = total + a.real
+                if a == b:
+                    total = total + 1000
+                i = i + 1
+            return total
+        assert f(1, 2, 100) == 200
+        assert f(2, 1, 100) == 100
+        assert f(2, 2, 100) == 100100
+        assert f(1.5, 2, 100) == 250.0
+        big = 2 ** 62
+        assert f(big, big * 2, 50) == 50 + 50 * big
+        assert f(1, 2, 100) == 200
+
+    def test_add_overflow_and_other_types(self):
+        import sys
+        def f(x):
+            return x + 1
+        for i in range(100):
+            assert f(i) - i == 1
+        assert f(sys.maxint) == sys.maxint + 1
+        assert f(1.5) == 2.5
+        assert f(True) == 2
+        raises(TypeError, f, "abc")
+
+    def test_compare_special(self):
+        def f(a, b):
+            n = 0
+            for i in range(50):
+                if a in b:
+                    n += 1
+                if a is not b:
+                    n += 2
+                if a > b:
+                    n += 4
+            return n
+        assert f(1, [1, 2]) == 150
+        assert f(3, [1, 2]) == 100
+        assert f("b", "a") == 300
+
+    def test_local_variables(self):
+        def f(n):
+            a, b = 0, 1
+            for i in range(n):
+                a, b = b, a + b
+                c = a
+                d = b
+            return a, b, c, d
+        for i in range(1, 50):
+            f(i)
+        assert f(10) == (55, 89, 55, 89)
+
+    def test_unbound_local_in_pair(self):
+        import sys
+        def f(x):
+            if x:
+                y = 1
+            return x + y
+        def g(x):
+            z = x
+            del x
+            return z, x
+        for i in range(1, 100):
+            assert f(i) == i + 1
+            raises(UnboundLocalError, g, i)
+        try:
+            f(0)
+        except UnboundLocalError:
+            tb = sys.exc_info()[2]
+        assert tb.tb_next.tb_lineno == f.__code__.co_firstlineno + 3
+        exc = raises(UnboundLocalError, g, 0)
+        assert "'x'" in str(exc.value)
+
+    def test_co_code_unchanged(self):
+        def f(x):
+            return x.real + 1
+        co_code = f.__code__.co_code
+        for i in range(100):
+            f(i)
+        assert f.__code__.co_code == co_code
+
+    def test_attribute_error_lineno(self):
+        import sys
+        def f(x):
+            y = 0
+            return x.foobar
+        for i in range(100):
+            try:
+                f(i)
+            except AttributeError:
+                tb = sys.exc_info()[2]
+        assert tb.tb_next.tb_lineno == f.__code__.co_firstlineno + 2
+
+    def test_trace(self):
+        import sys
+        def make():
+            def f(x):
+                a = x + 1
+                if a < 5:
+                    a = a + 2
+                return a.real
+            return f
+        def trace(frame, event, arg):
+            if frame.f_code is f.__code__:
+                events.append((event, frame.f_lineno - firstlineno))
+            return trace
+        f = make()
+        firstlineno = f.__code__.co_firstlineno
+        events = []
+        sys.settrace(trace)
+        try:
+            f(1)
+        finally:
+            sys.settrace(None)
+        expected = events
+        f = make()
+        for i in range(100):
+            f(i)
+        events = []
+        sys.settrace(trace)
+        try:
+            f(1)
+        finally:
+            sys.settrace(None)
+        assert events == expected
@@ -151,13 +151,29 @@ def get_unique_interplevel_subclass(space, cls):
         return subcls
 _unique_subclass_cache = {}
 
-def _getusercls(cls, reallywantdict=False):
+# the variant used for app-level classes with __slots__ and without a
+# __dict__, whose terminator has a non-zero inline_unboxed
+@specialize.memo()
+@not_rpython
+def get_compact_slots_subclass(space, cls):
+    "initialization-time only"
+    try:
+        return _compact_slots_subclass_cache[cls]
+    except KeyError:
+        subcls = _getusercls(cls, compactslots=True)
+        assert cls not in _compact_slots_subclass_cache
+        _compact_slots_subclass_cache[cls] = subcls
+        return subcls
+_compact_slots_subclass_cache = {}
+
+def _getusercls(cls, reallywantdict=False, compactslots=False):
     from rpython.rlib import objectmodel
     from pypy.objspace.std.objectobject import W_ObjectObject
     from pypy.module.__builtin__.interp_classobj import W_InstanceObject
     from pypy.objspace.std.mapdict import (BaseUserClassMapdict,
             MapdictDictSupport, MapdictWeakrefSupport,
-            _make_storage_mixin_size_n, MapdictStorageMixin)
+            _make_storage_mixin_size_n, MapdictStorageMixin,
+            SLOTS_SUBCLASSES_NUM_FIELDS, SLOTS_SUBCLASSES_NUM_UNBOXED)
     # some subtleties here: We want w_obj.getclass to be a small func
     # set, ie less than 5 different implementations. That way, it can be
     # inlined into its callers. This means we cannot give every single
@@ -174,7 +190,12 @@ def _getusercls(cls, reallywantdict=False):
     name = cls.__name__ + "User"
     isobjectsubclass = cls is W_ObjectObject
 
-    if isobjectsubclass or cls is W_InstanceObject:
+    if compactslots:
+        assert isobjectsubclass
+        base_mixin = _make_storage_mixin_size_n(SLOTS_SUBCLASSES_NUM_FIELDS,
+                                                SLOTS_SUBCLASSES_NUM_UNBOXED)
+        name += "Slots"
+    elif isobjectsubclass or cls is W_InstanceObject:
         base_mixin = _make_storage_mixin_size_n()
     else:
         base_mixin = MapdictStorageMixin
@@ -5,6 +5,7 @@ functional programming.
 import operator
 from __pypy__ import resizelist_hint, newlist_hint
 from __pypy__ import specialized_zip_2_lists
+from __pypy__ import specialized_list_sum, specialized_list_any_all
 
 # ____________________________________________________________
 
@@ -24,6 +25,9 @@ def any(seq):
     """any(iterable) -> bool
 
 Return True if bool(x) is True for any x in the iterable."""
+    result = specialized_list_any_all(seq, True)
+    if result is not None:
+        return result
     for x in seq:
         if x:
             return True
@@ -33,6 +37,9 @@ def all(seq):
     """all(iterable) -> bool
 
 Return True if bool(x) is True for all values x in the iterable."""
+    result = specialized_list_any_all(seq, False)
+    if result is not None:
+        return result
     for x in seq:
         if not x:
             return False
@@ -47,6 +54,11 @@ empty, returns start."""
     if isinstance(start, basestring):
         raise TypeError("sum() can't sum strings")
 
+    # lists of ints or floats, and ranges
+    result = specialized_list_sum(sequence, start)
+    if result is not None:
+        return result
+
     # Avoiding isinstance here, since subclasses can override `+`
     if type(start) is list:
         return _list_sum(sequence, start)
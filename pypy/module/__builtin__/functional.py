@@ -155,6 +155,12 @@ def min_max_sequence(space, w_sequence, w_key, implementation_of):
     else:
         compare = space.lt
         jitdriver = min_jitdriver
+    if w_key is None:
+        from pypy.objspace.std.listobject import W_ListObject
+        if type(w_sequence) is W_ListObject:
+            w_result = w_sequence.reduce_min_max(implementation_of == "max")
+            if w_result is not None:
+                return w_result
     w_iter = space.iter(w_sequence)
     greenkey = space.iterator_greenkey(w_iter)
     has_key = w_key is not None
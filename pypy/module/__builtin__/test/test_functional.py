@@ -358,6 +358,88 @@ class AppTestMinMax:
         assert max("100", "50", "30", "-200", key=int) == "100"
 
 
+class AppTestReductionsOfLists:
+    def test_sum(self):
+        import sys
+        assert sum(range(10)) == 45
+        assert sum(range(10), 5) == 50
+        assert sum(range(3, 20, 4)) == 55
+        assert sum(range(10), 0.5) == 45.5
+        assert sum([1, 2, 3], 0.5) == 6.5
+        assert sum([1.5, 2.5]) == 4.0
+        assert sum([1.5, 2.5], 1) == 5.0
+        res = sum([sys.maxint, 1, -2])
+        assert res == sys.maxint - 1
+        assert type(res) is long
+        res = sum(range(sys.maxint - 2, sys.maxint))
+        assert res == 2 * sys.maxint - 3
+        assert type(res) is long
+        res = sum(range(-5, 6))
+        assert res == 0
+        assert type(res) is int
+        assert type(sum([1, 2], 0L)) is long
+        assert sum([1, 2], True) == 4
+        total = 0.0
+        for x in [0.1] * 10:
+            total += x
+        assert sum([0.1] * 10) == total
+
+    def test_sum_empty_keeps_start(self):
+        l = [1.0]
+        l.pop()
+        assert sum(l) == 0
+        assert type(sum(l)) is int
+        assert type(sum(l, 0L)) is long
+        l = [1]
+        l.pop()
+        assert type(sum(l, 0.0)) is float
+        start = 2.5
+        assert sum(l, start) is start
+        l = [0.5] * 100
+        l2 = l[:100]
+        del l2[:]
+        assert type(sum(l2)) is int
+
+    def test_sum_int_subclass_start(self):
+        class I(int):
+            def __add__(self, other):
+                return 42
+        assert sum([1, 2], I(3)) == 44
+        assert sum(range(5), I(3)) == 52
+
+    def test_min_max(self):
+        nan = float('nan')
+        assert min(range(5, 20, 3)) == 5
+        assert max(range(5, 20, 3)) == 17
+        assert min(range(20, 5, -3)) == 8
+        assert max(range(20, 5, -3)) == 20
+        assert min([3, -1, 7]) == -1
+        assert max([3, -1, 7]) == 7
+        assert max([1.5, -2.5]) == 1.5
+        assert str(max([nan, 1.0, 2.0])) == 'nan'
+        assert max([1.0, nan, 2.0]) == 2.0
+        assert min([1.0, nan, 0.0]) == 0.0
+        raises(ValueError, min, [])
+        l = range(3)
+        l.pop(); l.pop(); l.pop()
+        raises(ValueError, max, l)
+        assert max(range(4), key=lambda x: -x) == 0
+
+    def test_any_all(self):
+        assert any(range(2))
+        assert not any(range(1))
+        assert not any(range(0))
+        assert not all(range(5))
+        assert all(range(1, 5))
+        assert all(range(-5, 5, 3))
+        assert not all(range(-6, 5, 3))
+        assert not any([0, 0])
+        assert any([0, 3])
+        assert all([0.5, float('nan')])
+        assert not all([0.5, -0.0])
+        assert not any([0.0, -0.0])
+
+
 try:
     from hypothesis import given, strategies, example
 except ImportError:
@@ -76,3 +76,17 @@ def move_to_end(space, w_obj, w_key, last=True):
     if not isinstance(w_obj, W_DictMultiObject):
         raise OperationError(space.w_TypeError, space.w_None)
     return w_obj.nondescr_move_to_end(space, w_key, last)
+
+@unwrap_spec(by_value=bool, reverse=bool)
+def sorted_items(space, w_obj, by_value=False, reverse=False):
+    """Return the items of a dictionary object as a list of (key, value)
+    pairs, sorted by key or, if by_value is true, by value.
+
+    Equivalent to sorted(d.items(), key=operator.itemgetter(1 if by_value
+    else 0), reverse=reverse), but int, float and string keys or values
+    are compared without boxing them.
+    """
+    from pypy.objspace.std.dictmultiobject import W_DictMultiObject
+    if not isinstance(w_obj, W_DictMultiObject):
+        raise OperationError(space.w_TypeError, space.w_None)
+    return w_obj.nondescr_sorted_items(space, by_value, reverse)
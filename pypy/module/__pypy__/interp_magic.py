@@ -42,6 +42,39 @@ def reset_method_cache_counter(space):
     cache.misses = {}
     cache.hits = {}
 
+def method_cache_stats(space):
+    """Return a tuple (hits, misses, evictions, resizes, size) about the
+    method cache: the number of lookups found in and missing from the
+    cache, the number of misses that evicted another entry, the number of
+    times the cache grew, and its current number of entries."""
+    cache = space.fromcache(MethodCache)
+    return space.newtuple([space.newint(cache.num_hits),
+                           space.newint(cache.num_misses),
+                           space.newint(cache.num_evictions),
+                           space.newint(cache.num_resizes),
+                           space.newint(len(cache.versions))])
+
+def reset_method_cache_stats(space):
+    """Reset the counters returned by method_cache_stats() to zero."""
+    cache = space.fromcache(MethodCache)
+    cache.reset_stats()
+
+def generator_frame_stats(space):
+    """Return a tuple (allocated, reused, recycled) about the frames of
+    generators: the number of frames allocated, the number of generators
+    that reused the frame of an earlier one, and the number of frames
+    that were kept for reuse when their generator finished."""
+    from pypy.interpreter.generator import GeneratorFrameStats
+    stats = space.fromcache(GeneratorFrameStats)
+    return space.newtuple([space.newint(stats.num_allocated),
+                           space.newint(stats.num_reused),
+                           space.newint(stats.num_recycled)])
+
+def reset_generator_frame_stats(space):
+    """Reset the counters returned by generator_frame_stats() to zero."""
+    from pypy.interpreter.generator import GeneratorFrameStats
+    space.fromcache(GeneratorFrameStats).reset()
+
 @unwrap_spec(name='text')
 def mapdict_cache_counter(space, name):
     """Return a tuple (index_cache_hits, index_cache_misses) for lookups
@@ -51,6 +84,58 @@ def mapdict_cache_counter(space, name):
     return space.newtuple2(space.newint(cache.hits.get(name, 0)),
                            space.newint(cache.misses.get(name, 0)))
 
+def utf8_index_counter(space):
+    """Return a tuple (storages, builds, blocks, build_time) about the
+    indexes of non-ascii unicode strings: the number of indexes created,
+    the number of times some of them were filled in, the total number of
+    blocks of 64 characters filled in, and the time spent doing so, in
+    units of rpython.rlib.rtimer.read_timestamp()."""
+    from rpython.rlib.rutf8 import utf8_index_stats as stats
+    return space.newtuple([space.newint(stats.storages),
+                           space.newint(stats.builds),
+                           space.newint(stats.blocks),
+                           space.newint(stats.build_time)])
+
+def reset_utf8_index_counter(space):
+    """Reset the counters returned by utf8_index_counter() to zero."""
+    from rpython.rlib.rutf8 import utf8_index_stats
+    utf8_index_stats.reset()
+
+@unwrap_spec(chunk=int)
+def set_utf8_index_chunk(space, chunk):
+    """Set the number of characters whose position is computed at once when
+    the index of a unicode string is filled in lazily, and return the old
+    value.  The number is rounded up to a multiple of 64."""
+    from rpython.rlib.rutf8 import utf8_index_stats
+    if chunk <= 0:
+        raise oefmt(space.w_ValueError, "chunk must be positive")
+    old = utf8_index_stats.chunk
+    utf8_index_stats.set_chunk(chunk)
+    return space.newint(old)
+
+def mapdict_stats(space, w_cls):
+    """Return a dict describing the tree of maps (the attribute layouts) of
+    the instances of the class: the number of maps, the depth and the
+    largest fan-out of the tree, how many instance dicts were devolved into
+    real dicts, and the storage size instances are expected to need."""
+    from pypy.objspace.std.mapdict import DictTerminator
+    from pypy.objspace.std.typeobject import W_TypeObject
+    if not isinstance(w_cls, W_TypeObject):
+        raise oefmt(space.w_TypeError, "expected a type, got %T", w_cls)
+    terminator = w_cls.terminator
+    num_maps, depth, fanout = terminator.tree_stats()
+    devolved = 0
+    if isinstance(terminator, DictTerminator):
+        devolved = terminator.num_devolved
+    w_result = space.newdict()
+    space.setitem_str(w_result, "maps", space.newint(num_maps))
+    space.setitem_str(w_result, "depth", space.newint(depth))
+    space.setitem_str(w_result, "fanout", space.newint(fanout))
+    space.setitem_str(w_result, "devolved", space.newint(devolved))
+    space.setitem_str(w_result, "size_estimate",
+                      space.newint(terminator.size_estimate()))
+    return w_result
+
 def builtinify(space, w_func):
     """To implement at app-level modules that are, in CPython,
     implemented in C: this decorator protects a function from being ever
@@ -184,6 +269,28 @@ def specialized_zip_2_lists(space, w_list1, w_list2):
     from pypy.objspace.std.specialisedtupleobject import specialized_zip_2_lists
     return specialized_zip_2_lists(space, w_list1, w_list2)
 
+def specialized_list_sum(space, w_list, w_start):
+    """Return sum(w_list, w_start) if w_list is a list of ints or floats or
+    a range, computed on the unwrapped items.  Otherwise return None."""
+    from pypy.objspace.std.listobject import W_ListObject
+    if type(w_list) is W_ListObject:
+        w_result = w_list.reduce_sum(w_start)
+        if w_result is not None:
+            return w_result
+    return space.w_None
+
+@unwrap_spec(is_any=bool)
+def specialized_list_any_all(space, w_list, is_any):
+    """Return any(w_list) or all(w_list) if w_list is a list of ints or
+    floats or a range, computed on the unwrapped items.  Otherwise return
+    None."""
+    from pypy.objspace.std.listobject import W_ListObject
+    if type(w_list) is W_ListObject:
+        w_result = w_list.reduce_any_all(is_any)
+        if w_result is not None:
+            return w_result
+    return space.w_None
+
 def set_code_callback(space, w_callable):
     cache = space.fromcache(CodeHookCache)
     if space.is_none(w_callable):
@@ -107,8 +107,11 @@ class Module(MixedModule):
         'dict_popitem_first'        : 'interp_dict.dict_popitem_first',
         'delitem_if_value_is'       : 'interp_dict.delitem_if_value_is',
         'move_to_end'               : 'interp_dict.move_to_end',
+        'sorted_items'              : 'interp_dict.sorted_items',
         'strategy'                  : 'interp_magic.strategy',  # dict,set,list
         'specialized_zip_2_lists'   : 'interp_magic.specialized_zip_2_lists',
+        'specialized_list_sum'      : 'interp_magic.specialized_list_sum',
+        'specialized_list_any_all'  : 'interp_magic.specialized_list_any_all',
         'set_debug'                 : 'interp_magic.set_debug',
         'locals_to_fast'            : 'interp_magic.locals_to_fast',
         'set_code_callback'         : 'interp_magic.set_code_callback',
@@ -122,6 +125,15 @@ class Module(MixedModule):
         'newmemoryview'             : 'interp_buffer.newmemoryview',
         'utf8content'               : 'interp_magic.utf8content',
         'list_get_physical_size'    : 'interp_magic.list_get_physical_size',
+        'mapdict_stats'             : 'interp_magic.mapdict_stats',
+        'method_cache_stats'        : 'interp_magic.method_cache_stats',
+        'reset_method_cache_stats'  : 'interp_magic.reset_method_cache_stats',
+        'generator_frame_stats'     : 'interp_magic.generator_frame_stats',
+        'reset_generator_frame_stats':
+                          'interp_magic.reset_generator_frame_stats',
+        'utf8_index_counter'        : 'interp_magic.utf8_index_counter',
+        'reset_utf8_index_counter'  : 'interp_magic.reset_utf8_index_counter',
+        'set_utf8_index_chunk'      : 'interp_magic.set_utf8_index_chunk',
     }
     if sys.platform == 'win32':
         interpleveldefs['get_console_cp'] = 'interp_magic.get_console_cp'
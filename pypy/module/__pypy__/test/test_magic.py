@@ -72,6 +72,68 @@ def f():
         assert utf8content(u"a") == b"a"
         assert utf8content(u"\xe4") == b'\xc3\xa4'
 
+    def test_mapdict_stats(self):
+        from __pypy__ import mapdict_stats
+        class A(object):
+            pass
+        stats = mapdict_stats(A)
+        assert stats == {"maps": 1, "depth": 0, "fanout": 0, "devolved": 0,
+                         "size_estimate": 0}
+        for i in range(100):
+            a = A()
+            for j in range(10):
+                setattr(a, "x%d" % j, str(j))
+        b = A()
+        b.y = 5
+        stats = mapdict_stats(A)
+        assert stats["maps"] == 12
+        assert stats["depth"] == 10
+        assert stats["fanout"] == 2
+        assert stats["size_estimate"] >= 9
+        assert stats["devolved"] == 0
+        b.__dict__[1] = 2
+        assert mapdict_stats(A)["devolved"] == 1
+        raises(TypeError, mapdict_stats, 42)
+
+    def test_generator_frame_stats(self):
+        from __pypy__ import (generator_frame_stats,
+                              reset_generator_frame_stats)
+        def g(n):
+            for i in range(n):
+                yield i
+        reset_generator_frame_stats()
+        assert generator_frame_stats() == (0, 0, 0)
+        for i in range(10):
+            assert sum(g(i)) == i * (i - 1) // 2
+        assert generator_frame_stats() == (1, 9, 10)
+        gen = g(1)
+        assert gen.gi_frame.f_locals == {'n': 1}
+        list(gen)
+        assert generator_frame_stats() == (1, 10, 10)
+        for i in range(2):
+            assert sum(g(i)) == 0
+        assert generator_frame_stats() == (2, 11, 12)
+
+    def test_utf8_index_counter(self):
+        from __pypy__ import (utf8_index_counter, reset_utf8_index_counter,
+                              set_utf8_index_chunk)
+        old = set_utf8_index_chunk(128)
+        try:
+            reset_utf8_index_counter()
+            assert utf8_index_counter() == (0, 0, 0, 0)
+            u = u"\xe4" * 1000
+            assert u[10] == u"\xe4"
+            storages, builds, blocks, build_time = utf8_index_counter()
+            assert (storages, builds, blocks) == (1, 1, 2)
+            assert build_time >= 0
+            assert u[999] == u"\xe4"
+            assert utf8_index_counter()[:3] == (1, 2, 16)
+            assert u[20] == u"\xe4"
+            assert utf8_index_counter()[:3] == (1, 2, 16)
+            raises(ValueError, set_utf8_index_chunk, 0)
+        finally:
+            assert set_utf8_index_chunk(old) == 128
+
     @pytest.mark.skipif(sys.platform != 'win32', reason="win32 only")
     def test_get_osfhandle(self):
         from __pypy__ import get_osfhandle
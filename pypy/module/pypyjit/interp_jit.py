@@ -86,6 +86,11 @@ class __extend__(PyFrame):
                     frame=self, next_instr=next_instr, pycode=pycode,
                     is_being_profiled=is_being_profiled)
                 co_code = pycode.co_code
+                if (not we_are_jitted() and
+                        self.space.config.objspace.quickening):
+                    # superinstructions are for the interpreter only; the
+                    # JIT keeps tracing the unmodified co_code
+                    co_code = pycode.get_code_for_dispatch()
                 self.valuestackdepth = hint(self.valuestackdepth, promote=True)
                 next_instr = self.handle_bytecode(co_code, next_instr, ec)
                 is_being_profiled = self.get_is_being_profiled()
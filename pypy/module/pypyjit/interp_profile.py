@@ -0,0 +1,247 @@
+"""Persistent JIT warmup profile.
+
+While recording, every loop compiled by the JIT for the Python interpreter
+adds its greenkey to the profile: the code object, identified by
+(co_filename, co_name, co_firstlineno), and the bytecode offset, with the
+number of loops compiled there.  The profile can be saved to a file and
+loaded by another process.  When a code object matching a loaded entry
+is created, the JIT counters of the recorded offsets are set so that
+tracing starts the next time they are reached, instead of after the usual
+warmup.  Code objects that already exist when the profile is loaded are
+found through the functions of the modules in sys.modules.
+
+If the environment variable PYPY_JIT_PROFILE names a file, the profile is
+loaded from it at startup (if it exists), recorded during the run, and
+saved back to it at exit.  app_main imports pypyjit early for this, which
+calls startup() below, and the space calls shutdown() at exit.
+
+The file format is one entry per line:
+    count <tab> firstlineno <tab> offset <tab> name <tab> filename
+"""
+
+import os
+
+from rpython.rlib import jit_hooks
+from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.rarithmetic import r_uint, string_to_int
+from rpython.rlib.rstring import ParseStringError, ParseStringOverflowError
+from rpython.rlib.streamio import open_file_as_stream, StreamErrors
+from rpython.rtyper.annlowlevel import (cast_instance_to_gcref,
+    cast_base_ptr_to_instance)
+from rpython.rtyper.lltypesystem import lltype
+from rpython.rtyper.rclass import OBJECT
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.function import Function, StaticMethod, ClassMethod
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.module import Module
+from pypy.interpreter.pycode import CodeHookCache, PyCode
+from pypy.interpreter.streamutil import wrap_streamerror
+
+
+class WarmupProfile(object):
+    def __init__(self, space):
+        self.space = space
+        self.recording = False
+        self.filename = None   # where to save at exit, from PYPY_JIT_PROFILE
+        # (filename, name, firstlineno, offset) -> number of loops compiled
+        self.counts = {}
+        # (filename, name, firstlineno) -> offsets to seed in new code
+        self.seeds = {}
+
+    def record_loop(self, pycode, next_instr):
+        key = (pycode.co_filename, pycode.co_name, pycode.co_firstlineno,
+               next_instr)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def add_entry(self, filename, name, firstlineno, offset, count):
+        key = (filename, name, firstlineno, offset)
+        self.counts[key] = self.counts.get(key, 0) + count
+        codekey = (filename, name, firstlineno)
+        offsets = self.seeds.get(codekey, None)
+        if offsets is None:
+            self.seeds[codekey] = [offset]
+            # code objects must now tell us when they are created
+            self.space.fromcache(CodeHookCache)._warmup_profile = self
+        elif offset not in offsets:
+            offsets.append(offset)
+
+    def seed_code(self, pycode):
+        codekey = (pycode.co_filename, pycode.co_name, pycode.co_firstlineno)
+        offsets = self.seeds.get(codekey, None)
+        if offsets is None:
+            return
+        for offset in offsets:
+            if 0 <= offset < len(pycode.co_code):
+                _trace_next_iteration(pycode, offset)
+
+    def seed_existing_code(self):
+        """Seed the code objects created before the profile was loaded: the
+        ones of the functions and methods in the modules of sys.modules,
+        and the code of the functions nested in them."""
+        space = self.space
+        seen = {}
+        w_modules = space.sys.get('modules')
+        for w_mod in space.unpackiterable(space.call_method(w_modules,
+                                                            'values')):
+            if isinstance(w_mod, Module):
+                values_w = space.unpackiterable(
+                    space.call_method(w_mod.w_dict, 'values'))
+                self._seed_values(values_w, seen)
+
+    def _seed_values(self, values_w, seen):
+        space = self.space
+        for w_value in values_w:
+            if (isinstance(w_value, StaticMethod) or
+                    isinstance(w_value, ClassMethod)):
+                w_value = space.getattr(w_value, space.newtext('__func__'))
+            if isinstance(w_value, Function):
+                code = w_value.getcode()
+                if isinstance(code, PyCode):
+                    self._seed_code_tree(code, seen)
+            elif space.isinstance_w(w_value, space.w_type):
+                if w_value in seen:
+                    continue
+                seen[w_value] = None
+                w_dict = space.getattr(w_value, space.newtext('__dict__'))
+                self._seed_values(space.unpackiterable(
+                    space.call_method(w_dict, 'values')), seen)
+
+    def _seed_code_tree(self, pycode, seen):
+        if pycode in seen:
+            return
+        seen[pycode] = None
+        self.seed_code(pycode)
+        for w_const in pycode.co_consts_w:
+            if isinstance(w_const, PyCode):
+                self._seed_code_tree(w_const, seen)
+
+    def load(self, filename):
+        """Add the entries of the file to the profile.  Raises ValueError
+        if the file is not a valid profile, or StreamError/OSError."""
+        stream = open_file_as_stream(filename, "rb")
+        try:
+            data = stream.readall()
+        finally:
+            stream.close()
+        entries = []
+        for line in data.split("\n"):
+            if not line:
+                continue
+            fields = line.split("\t", 4)
+            if len(fields) != 5:
+                raise ValueError
+            entries.append((fields[4], fields[3], _parse_int(fields[1]),
+                            _parse_int(fields[2]), _parse_int(fields[0])))
+        # only change the profile once the whole file is known to be valid
+        for filename, name, firstlineno, offset, count in entries:
+            self.add_entry(filename, name, firstlineno, offset, count)
+        self.seed_existing_code()
+        return len(entries)
+
+    def save(self, filename):
+        """Write the profile to the file.  Raises StreamError/OSError."""
+        lines = []
+        for key, count in self.counts.items():
+            codefilename, name, firstlineno, offset = key
+            lines.append("%d\t%d\t%d\t%s\t%s\n" % (
+                count, firstlineno, offset, name, codefilename))
+        stream = open_file_as_stream(filename, "wb")
+        try:
+            stream.write("".join(lines))
+        finally:
+            stream.close()
+
+
+def _parse_int(s):
+    try:
+        return string_to_int(s)
+    except (ParseStringError, ParseStringOverflowError):
+        raise ValueError
+
+def _trace_next_iteration(pycode, next_instr):
+    if not we_are_translated():
+        return      # no JIT here
+    ll_pycode = cast_instance_to_gcref(pycode)
+    jit_hooks.trace_next_iteration(
+        'pypyjit', r_uint(next_instr), 0, ll_pycode)
+
+def record_compiled_loop(space, debug_info):
+    """Called by the JIT hooks for every loop (but not bridge) compiled."""
+    profile = space.fromcache(WarmupProfile)
+    if not profile.recording:
+        return
+    if debug_info.get_jitdriver().name != 'pypyjit':
+        return
+    greenkey = debug_info.greenkey
+    next_instr = greenkey[0].getint()
+    ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
+                                     greenkey[2].getref_base())
+    pycode = cast_base_ptr_to_instance(PyCode, ll_code)
+    profile.record_loop(pycode, next_instr)
+
+
+def startup(space):
+    filename = os.environ.get('PYPY_JIT_PROFILE')
+    if not filename:
+        return
+    profile = space.fromcache(WarmupProfile)
+    profile.filename = filename
+    profile.recording = True
+    try:
+        profile.load(filename)
+    except StreamErrors + (ValueError,):
+        pass    # no profile yet, or a broken one that we will overwrite
+
+def shutdown(space):
+    profile = space.fromcache(WarmupProfile)
+    if profile.filename is None:
+        return
+    try:
+        profile.save(profile.filename)
+    except StreamErrors:
+        pass
+
+
+@unwrap_spec(enabled=bool)
+def record_warmup_profile(space, enabled=True):
+    """Start (or stop) recording the loops compiled by the JIT in the
+    warmup profile."""
+    space.fromcache(WarmupProfile).recording = enabled
+
+def get_warmup_profile(space):
+    """Return the warmup profile as a list of tuples (filename, name,
+    firstlineno, offset, count): where loops were compiled, identified by
+    the code object and the bytecode offset, and how many."""
+    profile = space.fromcache(WarmupProfile)
+    entries_w = []
+    for key, count in profile.counts.items():
+        filename, name, firstlineno, offset = key
+        entries_w.append(space.newtuple([space.newtext(filename),
+                                         space.newtext(name),
+                                         space.newint(firstlineno),
+                                         space.newint(offset),
+                                         space.newint(count)]))
+    return space.newlist(entries_w)
+
+@unwrap_spec(filename='fsencode')
+def save_warmup_profile(space, filename):
+    """Save the warmup profile to a file."""
+    try:
+        space.fromcache(WarmupProfile).save(filename)
+    except StreamErrors as e:
+        raise wrap_streamerror(space, e, space.newfilename(filename))
+
+@unwrap_spec(filename='fsencode')
+def load_warmup_profile(space, filename):
+    """Add the entries of a saved warmup profile to the current one.
+    Loops of the functions that are in the profile, in the modules already
+    imported or created from now on, are traced the first time they run,
+    without warmup.  Return the number of entries read."""
+    try:
+        num_entries = space.fromcache(WarmupProfile).load(filename)
+    except StreamErrors as e:
+        raise wrap_streamerror(space, e, space.newfilename(filename))
+    except ValueError:
+        raise oefmt(space.w_ValueError, "invalid JIT warmup profile file")
+    return space.newint(num_entries)
@@ -397,6 +397,22 @@ def get_stats_asmmemmgr(space):
     m2 = jit_hooks.stats_asmmemmgr_used(None)
     return space.newtuple2(space.newint(m1), space.newint(m2))
 
+def get_stats_jitmemory(space):
+    """Returns the memory currently used by the compiled loops and
+    bridges that are not freed yet, in bytes, as a dict with the keys
+    'machine_code', 'resume_data' and 'guard_descrs' (the last two are
+    estimates), and the 'memory_budget' (0 if there is no limit)."""
+    w_result = space.newdict()
+    space.setitem_str(w_result, 'machine_code',
+                      space.newint(jit_hooks.stats_memory_asm(None)))
+    space.setitem_str(w_result, 'resume_data',
+                      space.newint(jit_hooks.stats_memory_resume(None)))
+    space.setitem_str(w_result, 'guard_descrs',
+                      space.newint(jit_hooks.stats_memory_descrs(None)))
+    space.setitem_str(w_result, 'memory_budget',
+                      space.newint(jit_hooks.stats_memmgr_memory_budget(None)))
+    return w_result
+
 def enable_debug(space):
     """ Set the jit debugging - completely necessary for some stats to work,
     most notably assembler counters.
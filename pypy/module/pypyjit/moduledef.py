@@ -14,11 +14,16 @@ class Module(MixedModule):
         'trace_next_iteration': 'interp_jit.trace_next_iteration',
         'trace_next_iteration_hash': 'interp_jit.trace_next_iteration_hash',
         'releaseall': 'interp_jit.releaseall',
+        'record_warmup_profile': 'interp_profile.record_warmup_profile',
+        'get_warmup_profile': 'interp_profile.get_warmup_profile',
+        'save_warmup_profile': 'interp_profile.save_warmup_profile',
+        'load_warmup_profile': 'interp_profile.load_warmup_profile',
         'set_compile_hook': 'interp_resop.set_compile_hook',
         'set_abort_hook': 'interp_resop.set_abort_hook',
         'set_trace_too_long_hook': 'interp_resop.set_trace_too_long_hook',
         'get_stats_snapshot': 'interp_resop.get_stats_snapshot',
         'get_stats_asmmemmgr': 'interp_resop.get_stats_asmmemmgr',
+        'get_stats_jitmemory': 'interp_resop.get_stats_jitmemory',
         # those things are disabled because they have bugs, but if
         # they're found to be useful, fix test_ztranslation_jit_stats
         # in the backend first. get_stats_snapshot still produces
@@ -43,3 +48,11 @@ class Module(MixedModule):
         w_obj = space.wrap(PARAMETERS)
         space.setattr(self, space.newtext('defaults'), w_obj)
         pypy_hooks.space = space
+
+    def startup(self, space):
+        from pypy.module.pypyjit import interp_profile
+        interp_profile.startup(space)
+
+    def shutdown(self, space):
+        from pypy.module.pypyjit import interp_profile
+        interp_profile.shutdown(space)
@@ -0,0 +1,169 @@
+
+import py
+from pypy.interpreter.gateway import interp2app
+from rpython.jit.metainterp.history import JitCellToken, ConstInt, ConstPtr
+from rpython.jit.metainterp.logger import Logger
+from rpython.rtyper.annlowlevel import cast_instance_to_base_ptr
+from rpython.rtyper.lltypesystem import lltype, llmemory
+from pypy.module.pypyjit import interp_profile
+from pypy.module.pypyjit.hooks import pypy_hooks
+from pypy.module.pypyjit.test.test_jit_hook import MockJitDriverSD, MockSD
+from rpython.rlib.jit import JitDebugInfo, AsmInfo
+
+
+class AppTestWarmupProfile(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("Can't run this test with -A")
+        space = cls.space
+        w_f = space.appexec([], """():
+        def function():
+            pass
+        return function
+        """)
+        cls.w_f = w_f
+        ll_code = cast_instance_to_base_ptr(w_f.code)
+        code_gcref = lltype.cast_opaque_ptr(llmemory.GCREF, ll_code)
+        logger = Logger(MockSD())
+
+        def interp_on_compile(offset):
+            greenkey = [ConstInt(offset), ConstInt(0), ConstPtr(code_gcref)]
+            di_loop = JitDebugInfo(MockJitDriverSD, logger, JitCellToken(),
+                                   [], 'loop', greenkey)
+            di_loop.asminfo = AsmInfo({}, 0x42, 12)
+            if pypy_hooks.are_hooks_enabled():
+                pypy_hooks.after_compile(di_loop)
+
+        seeded = []
+        def trace_next_iteration(pycode, next_instr):
+            seeded.append((pycode.co_name, next_instr))
+        cls.orig_trace_next_iteration = interp_profile._trace_next_iteration
+        interp_profile._trace_next_iteration = trace_next_iteration
+
+        def interp_get_seeded():
+            res = space.wrap(seeded[:])
+            del seeded[:]
+            return res
+
+        cls.w_on_compile = space.wrap(interp2app(interp_on_compile,
+                                                 unwrap_spec=[int]))
+        cls.w_get_seeded = space.wrap(interp2app(interp_get_seeded))
+        cls.w_tmpdir = space.wrap(str(py.test.ensuretemp('warmup_profile')))
+
+    def teardown_class(cls):
+        interp_profile._trace_next_iteration = cls.orig_trace_next_iteration
+
+    def test_record(self):
+        import pypyjit
+        self.on_compile(6)
+        assert pypyjit.get_warmup_profile() == []
+        pypyjit.record_warmup_profile()
+        try:
+            self.on_compile(6)
+            self.on_compile(6)
+            self.on_compile(10)
+        finally:
+            pypyjit.record_warmup_profile(False)
+        self.on_compile(10)
+        code = self.f.__code__
+        key = (code.co_filename, 'function', code.co_firstlineno)
+        assert sorted(pypyjit.get_warmup_profile()) == [key + (6, 2),
+                                                        key + (10, 1)]
+
+    def test_save_load_and_seed(self):
+        import pypyjit, os
+        fn = os.path.join(self.tmpdir, 'profile')
+        src = "def g():\n    pass\n"
+        with open(fn, 'w') as f:
+            f.write("5\t1\t0\tg\t<seeded>\n"
+                    "1\t1\t9999\tg\t<seeded>\n"
+                    "3\t1\t0\tother\t<seeded>\n")
+        assert pypyjit.load_warmup_profile(fn) == 3
+        assert ('<seeded>', 'g', 1, 0, 5) in pypyjit.get_warmup_profile()
+        self.get_seeded()
+        exec compile(src, '<not seeded>', 'exec')
+        assert self.get_seeded() == []
+        exec compile(src, '<seeded>', 'exec')
+        # offsets outside of the bytecode are ignored
+        assert self.get_seeded() == [('g', 0)]
+        fn2 = os.path.join(self.tmpdir, 'profile2')
+        pypyjit.save_warmup_profile(fn2)
+        with open(fn2) as f:
+            lines = f.read().splitlines()
+        assert "5\t1\t0\tg\t<seeded>" in lines
+        assert "3\t1\t0\tother\t<seeded>" in lines
+
+    def test_seed_existing_code(self):
+        import pypyjit, os, sys, types
+        src = ("def f():\n"
+               "    def nested():\n"
+               "        pass\n"
+               "class C(object):\n"
+               "    def meth(self):\n"
+               "        pass\n"
+               "    @staticmethod\n"
+               "    def smeth():\n"
+               "        pass\n")
+        mod = types.ModuleType('seedmod')
+        exec compile(src, '<existing>', 'exec') in mod.__dict__
+        sys.modules['seedmod'] = mod
+        try:
+            fn = os.path.join(self.tmpdir, 'profile_existing')
+            with open(fn, 'w') as f:
+                f.write("1\t2\t0\tnested\t<existing>\n"
+                        "1\t5\t0\tmeth\t<existing>\n"
+                        "1\t7\t0\tsmeth\t<existing>\n"
+                        "1\t1\t0\tf\t<other>\n")
+            self.get_seeded()
+            pypyjit.load_warmup_profile(fn)
+            seeded = sorted(self.get_seeded())
+            assert seeded == [('meth', 0), ('nested', 0), ('smeth', 0)]
+        finally:
+            del sys.modules['seedmod']
+
+    def test_load_errors(self):
+        import pypyjit, os
+        profile = pypyjit.get_warmup_profile()
+        raises(IOError, pypyjit.load_warmup_profile,
+               os.path.join(self.tmpdir, 'does_not_exist'))
+        fn = os.path.join(self.tmpdir, 'invalid')
+        for content in ["5\t1\t0\tbad\n", "x\t1\t0\tbad\t<bad>\n"]:
+            with open(fn, 'w') as f:
+                f.write("1\t1\t0\tgood\t<good>\n" + content)
+            raises(ValueError, pypyjit.load_warmup_profile, fn)
+        assert pypyjit.get_warmup_profile() == profile
+
+
+class TestWarmupProfileStartup(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def test_environment_variable(self, monkeypatch, tmpdir):
+        space = self.space
+        profile = space.fromcache(interp_profile.WarmupProfile)
+        for name in ['recording', 'filename', 'counts', 'seeds']:
+            monkeypatch.setattr(profile, name, getattr(profile, name))
+        monkeypatch.setattr(profile, 'counts', {})
+        monkeypatch.setattr(profile, 'seeds', {})
+        cache = space.fromcache(interp_profile.CodeHookCache)
+        monkeypatch.setattr(cache, '_warmup_profile', cache._warmup_profile)
+        seeded = []
+        def trace_next_iteration(pycode, next_instr):
+            seeded.append((pycode.co_name, next_instr))
+        monkeypatch.setattr(interp_profile, '_trace_next_iteration',
+                            trace_next_iteration)
+        fn = tmpdir.join('profile')
+        fn.write("2\t1\t0\tg\t<env>\n")
+        monkeypatch.setenv('PYPY_JIT_PROFILE', str(fn))
+
+        interp_profile.startup(space)
+        assert profile.recording
+        space.appexec([], """():
+            exec compile("def g():\\n    pass\\n", '<env>', 'exec')
+        """)
+        assert seeded == [('g', 0)]
+        profile.add_entry('<env>', 'h', 3, 12, 1)
+        interp_profile.shutdown(space)
+        assert sorted(fn.read().splitlines()) == ["1\t3\t12\th\t<env>",
+                                                  "2\t1\t0\tg\t<env>"]
@@ -157,6 +157,8 @@ def report_signal(space, n):
     # invoke the app-level handler
     ec = space.getexecutioncontext()
     w_frame = ec.gettopframe_nohidden()
+    if w_frame is not None:
+        w_frame.mark_as_escaped()
     space.call_function(w_handler, space.newint(n), w_frame)
 
 
@@ -22,6 +22,7 @@ def _current_frames(space):
         w_topframe = ec.gettopframe_nohidden()
         if w_topframe is None:
             continue
+        w_topframe.mark_as_escaped()
         space.setitem(w_result,
                       space.newint(thread_ident),
                       w_topframe)
@@ -77,6 +77,9 @@ class W_AbstractBytesObject(W_Root):
     def descr_ge(self, space, w_other):
         """x.__ge__(y) <==> x>=y"""
 
+    def descr_getbuffer(self, space, w_flags):
+        ""
+
     def descr_getitem(self, space, w_index):
         """x.__getitem__(y) <==> x[y]"""
 
@@ -204,6 +207,12 @@ class W_AbstractBytesObject(W_Root):
         kwargs.  The substitutions are identified by braces ('{' and '}').
         """
 
+    def descr_formatter_parser(self, space):
+        ""
+
+    def descr_formatter_field_name_split(self, space):
+        ""
+
     def descr_index(self, space, w_sub, w_start=None, w_end=None):
         """S.index(sub[, start[, end]]) -> int
 
@@ -502,7 +511,7 @@ class W_BytesObject(W_AbstractBytesObject):
     @staticmethod
     def _use_rstr_ops(space, w_other):
         from pypy.objspace.std.unicodeobject import W_UnicodeObject
-        return (isinstance(w_other, W_BytesObject) or
+        return (isinstance(w_other, W_AbstractBytesObject) or
                 isinstance(w_other, W_UnicodeObject))
 
     @staticmethod
@@ -615,32 +624,38 @@ class W_BytesObject(W_AbstractBytesObject):
         return mod_format(space, w_values, self, do_unicode=False)
 
     def descr_eq(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        w_other = _as_bytes_object(space, w_other)
+        if w_other is None:
             return space.w_NotImplemented
         return space.newbool(self._value == w_other._value)
 
     def descr_ne(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        w_other = _as_bytes_object(space, w_other)
+        if w_other is None:
             return space.w_NotImplemented
         return space.newbool(self._value != w_other._value)
 
     def descr_lt(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        w_other = _as_bytes_object(space, w_other)
+        if w_other is None:
             return space.w_NotImplemented
         return space.newbool(self._value < w_other._value)
 
     def descr_le(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        w_other = _as_bytes_object(space, w_other)
+        if w_other is None:
             return space.w_NotImplemented
         return space.newbool(self._value <= w_other._value)
 
     def descr_gt(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        w_other = _as_bytes_object(space, w_other)
+        if w_other is None:
             return space.w_NotImplemented
         return space.newbool(self._value > w_other._value)
 
     def descr_ge(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        w_other = _as_bytes_object(space, w_other)
+        if w_other is None:
             return space.w_NotImplemented
         return space.newbool(self._value >= w_other._value)
 
@@ -657,6 +672,13 @@ class W_BytesObject(W_AbstractBytesObject):
             from .bytearrayobject import W_BytearrayObject, _make_data
             self_as_bytearray = W_BytearrayObject(_make_data(self._value))
             return space.add(self_as_bytearray, w_other)
+        elif (space.config.objspace.std.withstrbuf and
+                isinstance(w_other, W_AbstractBytesObject)):
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            builder = StringBuilder()
+            builder.append(self._value)
+            builder.append(space.bytes_w(w_other))
+            return W_StringBufferObject(builder)
         return self._StringMethods_descr_add(space, w_other)
 
     _StringMethods__startswith = _startswith
@@ -856,6 +878,16 @@ def _create_list_from_bytes(value):
 W_BytesObject.EMPTY = W_BytesObject('')
 
 
+def _as_bytes_object(space, w_obj):
+    if isinstance(w_obj, W_BytesObject):
+        return w_obj
+    if space.config.objspace.std.withstrbuf:
+        from pypy.objspace.std.strbufobject import W_StringBufferObject
+        if isinstance(w_obj, W_StringBufferObject):
+            return w_obj.force_w()
+    return None
+
+
 W_BytesObject.typedef = TypeDef(
     "str", basestring_typedef, None, "read",
     __new__ = interp2app(W_BytesObject.descr_new),
@@ -923,17 +955,18 @@ W_BytesObject.typedef = TypeDef(
     translate = interpindirect2app(W_AbstractBytesObject.descr_translate),
     upper = interpindirect2app(W_AbstractBytesObject.descr_upper),
     zfill = interpindirect2app(W_AbstractBytesObject.descr_zfill),
-    __buffer__ = interp2app(W_BytesObject.descr_getbuffer),
+    __buffer__ = interpindirect2app(W_AbstractBytesObject.descr_getbuffer),
 
-    format = interpindirect2app(W_BytesObject.descr_format),
-    __format__ = interpindirect2app(W_BytesObject.descr__format__),
-    __mod__ = interpindirect2app(W_BytesObject.descr_mod),
-    __rmod__ = interpindirect2app(W_BytesObject.descr_rmod),
+    format = interpindirect2app(W_AbstractBytesObject.descr_format),
+    __format__ = interpindirect2app(W_AbstractBytesObject.descr__format__),
+    __mod__ = interpindirect2app(W_AbstractBytesObject.descr_mod),
+    __rmod__ = interpindirect2app(W_AbstractBytesObject.descr_rmod),
     __getnewargs__ = interpindirect2app(
         W_AbstractBytesObject.descr_getnewargs),
-    _formatter_parser = interp2app(W_BytesObject.descr_formatter_parser),
-    _formatter_field_name_split =
-        interp2app(W_BytesObject.descr_formatter_field_name_split),
+    _formatter_parser = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_parser),
+    _formatter_field_name_split = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_field_name_split),
 )
 W_BytesObject.typedef.flag_sequence_bug_compat = True
 
@@ -14,6 +14,9 @@ from pypy.interpreter import function
 from rpython.rlib import jit
 from pypy.objspace.std.mapdict import LOOKUP_METHOD_mapdict, \
     LOOKUP_METHOD_mapdict_fill_cache_method
+from pypy.objspace.std.celldict import LOAD_ATTR_module_cached, \
+    LOAD_ATTR_module_fill_cache
+from pypy.objspace.std.kwcall import frame_for_valuestack_kw
 
 
 # This module exports two extra methods for StdObjSpaceFrame implementing
@@ -38,6 +41,12 @@ def LOOKUP_METHOD(f, nameindex, *ignored):
         # mapdict has an extra-fast version of this function
         if LOOKUP_METHOD_mapdict(f, nameindex, w_obj):
             return
+        # and so do modules
+        w_value = LOAD_ATTR_module_cached(f.getcode(), w_obj, nameindex)
+        if w_value is not None:
+            f.pushvalue(w_value)
+            f.pushvalue_none()
+            return
 
     w_name = f.getname_w(nameindex)
     w_value = None
@@ -61,7 +70,8 @@ def LOOKUP_METHOD(f, nameindex, *ignored):
             # this handles directly the common case
             #   module.function(args..)
             w_value = w_obj.getdictvalue(space, name)
-            # xxx we could also use the mapdict cache in that case, probably
+            if w_value is not None and not jit.we_are_jitted():
+                LOAD_ATTR_module_fill_cache(f.getcode(), w_obj, nameindex)
         else:
             typ = type(w_descr)
             if typ is function.Function or typ is function.FunctionWithFixedCode:
@@ -83,7 +93,7 @@ def LOOKUP_METHOD(f, nameindex, *ignored):
     f.pushvalue_none()
 
 @jit.unroll_safe
-def CALL_METHOD(f, oparg, *ignored):
+def CALL_METHOD(f, oparg, next_instr, *ignored):
     # opargs contains the arg, and kwarg count, excluding the implicit 'self'
     n_args = oparg & 0xff
     n_kwargs = (oparg >> 8) & 0xff
@@ -98,6 +108,14 @@ def CALL_METHOD(f, oparg, *ignored):
         finally:
             f.dropvalues(n_args + 2)
     else:
+        if not jit.we_are_jitted():
+            w_callable = f.peekvalue(n_args + (2 * n_kwargs) + 1)
+            new_frame = frame_for_valuestack_kw(f, w_callable, n, n_kwargs,
+                                                next_instr)
+            if new_frame is not None:
+                f.dropvalues(n_args + (2 * n_kwargs) + 2)
+                f.pushvalue(new_frame.run())
+                return
         keywords = [None] * n_kwargs
         keywords_w = [None] * n_kwargs
         while True:
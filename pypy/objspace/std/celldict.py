@@ -7,6 +7,7 @@ import weakref
 from rpython.rlib import jit, rerased, objectmodel
 
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.module import Module
 from pypy.objspace.std.dictmultiobject import (
     DictStrategy, ObjectDictStrategy, _never_equal_to_string,
     create_iterator_classes, BytesDictStrategy,
@@ -205,7 +206,7 @@ class ModuleDictStrategy(DictStrategy):
             cache = self.caches.get(key, None)
         if cache is None:
             cell = self.getdictvalue_no_unwrapping(w_dict, key)
-            cache = GlobalCache(cell)
+            cache = GlobalCache(cell, w_dict)
             if (not space.config.objspace.honor__builtins__ and
                     cell is None and
                     w_dict is not space.builtin.w_dict):
@@ -233,7 +234,7 @@ create_iterator_classes(ModuleDictStrategy)
 # global caching
 
 class GlobalCache(object):
-    def __init__(self, cell):
+    def __init__(self, cell, w_dict):
         # works like this: self.cell is always the result of
         # getdictvalue_no_unwrapping on the equivalent key.
         # this means it is None if the key doesn't exist, a w_value if there is
@@ -245,6 +246,7 @@ class GlobalCache(object):
         self.valid = True
         self.ref = weakref.ref(self)
         self.builtincache = None
+        self.w_dict = w_dict
 
     @objectmodel.always_inline
     def getvalue(self, space):
@@ -298,6 +300,50 @@ def _LOAD_GLOBAL_cached(self, nameindex, next_instr):
 def _load_global_fallback(self, varname):
     return self._load_global(varname)
 
+# ____________________________________________________________
+# attribute caching for modules
+#
+# module.attr and module.function(args..) read the same cells as the
+# LOAD_GLOBALs in that module.  the caches are stored per code object,
+# like _globals_caches, but the module is only known at runtime, so they
+# also check that the cache belongs to the dict of the module at hand
+
+@objectmodel.always_inline
+def LOAD_ATTR_module_cached(pycode, w_obj, nameindex):
+    # returns None if there is no valid cache, or the global doesn't exist
+    caches = pycode._module_attr_caches
+    if caches is None or not isinstance(w_obj, Module):
+        return None
+    cache_wref = caches[nameindex]
+    if cache_wref is not None:
+        cache = cache_wref()
+        if cache and cache.w_dict is w_obj.w_dict:
+            return cache.getvalue(pycode.space)
+    return None
+
+@objectmodel.dont_inline
+def LOAD_ATTR_module_fill_cache(pycode, w_obj, nameindex):
+    space = pycode.space
+    if (not isinstance(w_obj, Module) or w_obj.user_overridden_class or
+            not space._side_effects_ok()):
+        return
+    w_dict = w_obj.w_dict
+    if not isinstance(w_dict, W_ModuleDictObject):
+        return
+    name = space.text_w(pycode.co_names_w[nameindex])
+    # the type of non-subclassed modules is immutable.  if it has a data
+    # descriptor of that name, it wins over the module dict, don't cache
+    w_descr = space.lookup(w_obj, name)
+    if w_descr is not None and space.is_data_descr(w_descr):
+        return
+    cache = w_dict.get_global_cache(name)
+    if cache is None:
+        return
+    assert cache.valid and cache.ref is not None
+    if pycode._module_attr_caches is None:
+        pycode._module_attr_caches = [None] * len(pycode.co_names_w)
+    pycode._module_attr_caches[nameindex] = cache.ref
+
 def STORE_GLOBAL_cached(self, nameindex, next_instr):
     w_newvalue = self.popvalue()
     if jit.we_are_jitted() or self.getdebug() is not None:
@@ -2,6 +2,7 @@
 
 from rpython.rlib import jit, rerased, objectmodel, rutf8
 from rpython.rlib.debug import mark_dict_non_null
+from rpython.rlib.longlong2float import float2longlong
 from rpython.rlib.objectmodel import newlist_hint, r_dict, specialize
 from rpython.tool.sourcetools import func_renamer, func_with_new_name
 
@@ -302,6 +303,27 @@ class W_DictMultiObject(W_Root):
         strategy = self.get_strategy()
         strategy.move_to_end(self, w_key, last_flag)
 
+    def nondescr_sorted_items(self, space, by_value, reverse):
+        """Not exposed directly to app-level, but via __pypy__.sorted_items().
+        """
+        from pypy.objspace.std.listobject import (
+            W_ListObject, sorted_list_order)
+        w_keys = self.w_keys()
+        assert isinstance(w_keys, W_ListObject)
+        values_w = self.values()
+        if by_value:
+            # the list strategy unboxes the values if it can
+            w_values = space.newlist(values_w)
+            assert isinstance(w_values, W_ListObject)
+            order = sorted_list_order(space, w_values, reverse)
+        else:
+            order = sorted_list_order(space, w_keys, reverse)
+        items_w = [None] * len(order)
+        for i in range(len(order)):
+            index = order[i]
+            items_w[i] = space.newtuple2(w_keys.getitem(index), values_w[index])
+        return space.newlist(items_w)
+
     def nondescr_popitem_first(self, space):
         """Not exposed directly to app-level, but via __pypy__.popitem_first().
         """
@@ -412,7 +434,7 @@ def _add_indirections():
                     length w_keys values items \
                     iterkeys itervalues iteritems \
                     listview_bytes listview_ascii listview_int \
-                    view_as_kwargs".split()
+                    listview_float view_as_kwargs".split()
 
     def make_method(method):
         def f(self, *args):
@@ -617,6 +639,9 @@ class DictStrategy(object):
     def listview_int(self, w_dict):
         return None
 
+    def listview_float(self, w_dict):
+        return None
+
     def view_as_kwargs(self, w_dict):
         return (None, None)
 
@@ -712,12 +737,18 @@ class EmptyDictStrategy(DictStrategy):
         return self.erase(None)
 
     def switch_to_correct_strategy(self, w_dict, w_key):
+        if self.space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import unwrap_strbuf
+            w_key = unwrap_strbuf(w_key)
         if type(w_key) is self.space.StringObjectCls:
             self.switch_to_bytes_strategy(w_dict)
             return
         elif type(w_key) is self.space.UnicodeObjectCls:
             self.switch_to_unicode_strategy(w_dict)
             return
+        elif type(w_key) is self.space.FloatObjectCls:
+            self.switch_to_float_strategy(w_dict)
+            return
         w_type = self.space.type(w_key)
         if self.space.is_w(w_type, self.space.w_int):
             self.switch_to_int_strategy(w_dict)
@@ -744,6 +775,12 @@ class EmptyDictStrategy(DictStrategy):
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
+    def switch_to_float_strategy(self, w_dict):
+        strategy = self.space.fromcache(FloatDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
     def switch_to_identity_strategy(self, w_dict):
         from pypy.objspace.std.identitydict import IdentityDictStrategy
         strategy = self.space.fromcache(IdentityDictStrategy)
@@ -1247,6 +1284,9 @@ class BytesDictStrategy(AbstractTypedStrategy, DictStrategy):
     def getitem(self, w_dict, w_key):
         space = self.space
         # -- This is called extremely often.  Hack for performance --
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import unwrap_strbuf
+            w_key = unwrap_strbuf(w_key)
         if type(w_key) is space.StringObjectCls:
             return self.getitem_str(w_dict, w_key.unwrap(space))
         # -- End of performance hack --
@@ -1391,6 +1431,75 @@ class IntDictStrategy(AbstractTypedStrategy, DictStrategy):
 create_iterator_classes(IntDictStrategy)
 
 
+# floats that fit into this range are converted from ints exactly
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
+class FloatDictStrategy(AbstractTypedStrategy, DictStrategy):
+    """ Stores the keys as unboxed floats.  Two keys are the same if they
+    compare equal (so that -0.0 and 0.0 are the same key), or if they are
+    identical: on PyPy floats are identical if they have the same bit
+    pattern, which makes a NaN key findable again, just like when the key
+    is stored boxed. """
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return self.space.newfloat(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.float_w(wrapped)
+
+    def get_empty_storage(self):
+        new_dict = r_dict(self._key_eq, self._key_hash,
+                          simple_hash_eq=True)
+        return self.erase(new_dict)
+
+    def _key_eq(self, f1, f2):
+        return f1 == f2 or float2longlong(f1) == float2longlong(f2)
+
+    def _key_hash(self, f):
+        from pypy.objspace.std.floatobject import _hash_float
+        return _hash_float(self.space, f)
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is self.space.FloatObjectCls
+
+    def _never_equal_to(self, w_lookup_type):
+        space = self.space
+        # XXX there are many more types
+        return (space.is_w(w_lookup_type, space.w_NoneType) or
+                space.is_w(w_lookup_type, space.w_bytes) or
+                space.is_w(w_lookup_type, space.w_unicode)
+                )
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        # -- Hack for performance: look up floats directly and ints that
+        # are exactly representable as floats without devolving --
+        if type(w_key) is space.FloatObjectCls:
+            return self.unerase(w_dict.dstorage).get(
+                space.float_w(w_key), None)
+        w_type = space.type(w_key)
+        if space.is_w(w_type, space.w_int) or space.is_w(w_type, space.w_bool):
+            intval = space.int_w(w_key)
+            if -MAX_EXACT_FLOAT_INT <= intval <= MAX_EXACT_FLOAT_INT:
+                return self.unerase(w_dict.dstorage).get(float(intval), None)
+        # -- End of performance hack --
+        return AbstractTypedStrategy.getitem(self, w_dict, w_key)
+
+    def listview_float(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def wrapkey(space, key):
+        return space.newfloat(key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_float(self.listview_float(w_dict))
+
+create_iterator_classes(FloatDictStrategy)
+
+
 def update1(space, w_dict, w_data):
     if isinstance(w_data, W_DictMultiObject):    # optimization case only
         update1_dict_dict(space, w_dict, w_data)
@@ -74,6 +74,63 @@ def list_BINARY_SUBSCR(self, oparg, next_instr):
     self.pushvalue(w_result)
 
 
+def _int_compare(testnum, x, y):
+    if testnum == 0:
+        return x < y
+    elif testnum == 1:
+        return x <= y
+    elif testnum == 2:
+        return x == y
+    elif testnum == 3:
+        return x != y
+    elif testnum == 4:
+        return x > y
+    else:
+        return x >= y
+
+def _int_compare_and_jump(jump_if_true):
+    if jump_if_true:
+        name = 'COMPARE_OP_POP_JUMP_IF_TRUE'
+    else:
+        name = 'COMPARE_OP_POP_JUMP_IF_FALSE'
+    generic = getattr(PyFrame, name)
+
+    @func_renamer('int_' + name)
+    def opimpl(self, testnum, next_instr, ec):
+        w_2 = self.peekvalue(0)
+        w_1 = self.peekvalue(1)
+        if (testnum <= 5 and type(w_1) is W_IntObject and
+                type(w_2) is W_IntObject and
+                not self._must_trace_each_opcode(ec)):
+            # no bool is ever allocated
+            self.dropvalues(2)
+            if _int_compare(testnum, w_1.intval, w_2.intval) == jump_if_true:
+                return self._quickened_oparg(next_instr)
+            return next_instr + 3
+        return generic(self, testnum, next_instr, ec)
+
+    return opimpl
+
+int_COMPARE_OP_POP_JUMP_IF_FALSE = _int_compare_and_jump(False)
+int_COMPARE_OP_POP_JUMP_IF_TRUE = _int_compare_and_jump(True)
+
+
+def int_LOAD_FAST_LOAD_CONST_BINARY_ADD(self, varindex, next_instr, ec):
+    w_1 = self.locals_cells_stack_w[varindex]
+    if type(w_1) is W_IntObject and not self._must_trace_each_opcode(ec):
+        w_2 = self.getconstant_w(self._quickened_oparg(next_instr))
+        if type(w_2) is W_IntObject:
+            try:
+                z = ovfcheck(w_1.intval + w_2.intval)
+            except OverflowError:
+                pass
+            else:
+                self.pushvalue(self.space.newint(z))
+                return next_instr + 4
+    return PyFrame.LOAD_FAST_LOAD_CONST_BINARY_ADD(
+        self, varindex, next_instr, ec)
+
+
 def build_frame(space):
     """Consider the objspace config and return a patched frame object."""
     class StdObjSpaceFrame(BaseFrame):
@@ -85,7 +142,18 @@ def build_frame(space):
         StdObjSpaceFrame.INPLACE_SUBTRACT = int_INPLACE_SUBTRACT
     if space.config.objspace.std.optimized_list_getitem:
         StdObjSpaceFrame.BINARY_SUBSCR = list_BINARY_SUBSCR
+    if space.config.objspace.quickening:
+        StdObjSpaceFrame.COMPARE_OP_POP_JUMP_IF_FALSE = \
+            int_COMPARE_OP_POP_JUMP_IF_FALSE
+        StdObjSpaceFrame.COMPARE_OP_POP_JUMP_IF_TRUE = \
+            int_COMPARE_OP_POP_JUMP_IF_TRUE
+        StdObjSpaceFrame.LOAD_FAST_LOAD_CONST_BINARY_ADD = \
+            int_LOAD_FAST_LOAD_CONST_BINARY_ADD
     from pypy.objspace.std.callmethod import LOOKUP_METHOD, CALL_METHOD
     StdObjSpaceFrame.LOOKUP_METHOD = LOOKUP_METHOD
     StdObjSpaceFrame.CALL_METHOD = CALL_METHOD
+    from pypy.objspace.std import kwcall
+    StdObjSpaceFrame.CALL_FUNCTION = kwcall.CALL_FUNCTION
+    StdObjSpaceFrame.CALL_FUNCTION_KW = kwcall.CALL_FUNCTION_KW
+    StdObjSpaceFrame.CALL_FUNCTION_VAR_KW = kwcall.CALL_FUNCTION_VAR_KW
     return StdObjSpaceFrame
@@ -0,0 +1,269 @@
+"""
+Fast paths for calls with keyword arguments, used by the interpreter (the
+JIT removes the Arguments objects anyway).
+
+A call site like 'f(a, b=1, c=2)' normally builds two lists for the
+keywords, a list for the positional arguments and an Arguments object,
+and then matches the keyword names against the signature of f at every
+call.  Instead, each such call site remembers, for the last code object it
+called, in which slot of the new frame each keyword goes.  The values are
+then copied directly from the value stack into the new frame.
+
+Calls that forward '*args, **kwargs' to a Python function are also routed
+directly into the new frame, reading the lists of a keyword-arguments dict
+in place instead of copying them.
+
+Whenever anything is unusual (wrong argument count, unknown or duplicate
+keywords, missing arguments, non-dict **kwargs...) these fast paths give up
+before having any visible effect, and the general code path is used, which
+raises the proper error.
+"""
+
+from rpython.rlib import jit
+from rpython.rlib.rarithmetic import intmask
+
+from pypy.interpreter.function import Function
+from pypy.interpreter.pycode import PyCode
+from pypy.interpreter.pyframe import PyFrame
+from pypy.objspace.std.dictmultiobject import EmptyDictStrategy, W_DictObject
+from pypy.objspace.std.kwargsdict import KwargsDictStrategy
+from pypy.objspace.std.tupleobject import W_AbstractTupleObject
+
+
+class KwCallCache(object):
+    """Where the keywords of one call site go in the frame of 'code'."""
+    code = None
+    nargs = -1
+    w_keys = None           # the keyword name objects of the call site
+    keys = None             # the same names, unwrapped
+    positions = None        # frame slot of each keyword, -1 for **kwargs;
+                            # None if the call site needs the general path
+    default_positions = None  # frame slots filled from the defaults
+
+    def matches(self, f, code, nargs, nkwargs):
+        if self.code is not code or self.nargs != nargs:
+            return False
+        for k in range(nkwargs):
+            if f.peekvalue(2 * (nkwargs - k) - 1) is not self.w_keys[k]:
+                return False
+        return True
+
+    def update(self, f, code, nargs, nkwargs):
+        space = f.space
+        self.code = code
+        self.nargs = nargs
+        self.w_keys = [f.peekvalue(2 * (nkwargs - k) - 1)
+                       for k in range(nkwargs)]
+        self.keys = None
+        self.positions = None
+        self.default_positions = None
+        signature = code._signature
+        argcount = signature.num_argnames()
+        if nargs > argcount and not signature.has_vararg():
+            return
+        filled = [False] * argcount
+        for i in range(min(nargs, argcount)):
+            filled[i] = True
+        keys = [None] * nkwargs
+        positions = [-1] * nkwargs
+        for k in range(nkwargs):
+            w_key = self.w_keys[k]
+            if not space.is_w(space.type(w_key), space.w_text):
+                return
+            key = space.text_w(w_key)
+            keys[k] = key
+            j = signature.find_argname(key)
+            if j < 0:
+                if not signature.has_kwarg():
+                    return
+                for k1 in range(k):
+                    if keys[k1] == key:
+                        return
+            else:
+                if filled[j]:
+                    return
+                filled[j] = True
+            positions[k] = j
+        self.keys = keys
+        self.positions = positions
+        self.default_positions = [i for i in range(argcount) if not filled[i]]
+
+
+def _get_kwcall_cache(pycode, next_instr):
+    caches = pycode._kwcall_caches
+    if caches is None:
+        caches = pycode._kwcall_caches = {}
+    callsite = intmask(next_instr)
+    try:
+        return caches[callsite]
+    except KeyError:
+        cache = caches[callsite] = KwCallCache()
+        return cache
+
+def _fill_defaults(scope_w, positions, argcount, defs_w):
+    def_first = argcount - len(defs_w)
+    for i in positions:
+        if i < def_first:
+            return False
+        scope_w[i] = defs_w[i - def_first]
+    return True
+
+
+def frame_for_valuestack_kw(f, w_callable, nargs, nkwargs, next_instr):
+    """The value stack of 'f' ends with 'nargs' positional arguments
+    followed by 'nkwargs' (name, value) pairs.  Return a new frame ready to
+    run the call, or None if the general path must be used."""
+    if not isinstance(w_callable, Function):
+        return None
+    code = w_callable.getcode()
+    if not isinstance(code, PyCode):
+        return None
+    cache = _get_kwcall_cache(f.getcode(), next_instr)
+    if not cache.matches(f, code, nargs, nkwargs):
+        cache.update(f, code, nargs, nkwargs)
+    positions = cache.positions
+    if positions is None:
+        return None
+    space = f.space
+    new_frame = space.createframe(code, w_callable.w_func_globals,
+                                  w_callable)
+    scope_w = new_frame.locals_cells_stack_w
+    signature = code._signature
+    argcount = signature.num_argnames()
+    if not _fill_defaults(scope_w, cache.default_positions, argcount,
+                          w_callable.defs_w):
+        return None
+    base = 2 * nkwargs + nargs - 1
+    npos = min(nargs, argcount)
+    for i in range(npos):
+        scope_w[i] = f.peekvalue(base - i)
+    if signature.has_vararg():
+        extra_w = [f.peekvalue(base - i) for i in range(npos, nargs)]
+        scope_w[argcount] = space.newtuple(extra_w)
+    w_kwds = None
+    if signature.has_kwarg():
+        w_kwds = space.newdict(kwargs=True)
+        scope_w[argcount + signature.has_vararg()] = w_kwds
+    for k in range(nkwargs):
+        w_value = f.peekvalue(2 * (nkwargs - k) - 2)
+        j = positions[k]
+        if j >= 0:
+            scope_w[j] = w_value
+        else:
+            space.setitem_str(w_kwds, cache.keys[k], w_value)
+    new_frame.init_cells()
+    return new_frame
+
+
+def frame_for_forwarded_args(f, w_callable, nargs, w_star, w_starstar):
+    """The value stack of 'f' ends with 'nargs' positional arguments, and
+    the call has the extra '*w_star' (if not None) and '**w_starstar'.
+    Return a new frame ready to run the call, or None if the general path
+    must be used."""
+    if not isinstance(w_callable, Function):
+        return None
+    code = w_callable.getcode()
+    if not isinstance(code, PyCode):
+        return None
+    space = f.space
+    if w_star is None:
+        star_w = None
+    elif (isinstance(w_star, W_AbstractTupleObject) and
+            space._uses_tuple_iter(w_star)):
+        star_w = w_star.tolist()
+    else:
+        return None
+    if type(w_starstar) is not W_DictObject:
+        return None
+    strategy = w_starstar.get_strategy()
+    if isinstance(strategy, KwargsDictStrategy):
+        keys, values_w = strategy.unerase(w_starstar.dstorage)
+    elif isinstance(strategy, EmptyDictStrategy):
+        keys = None
+        values_w = None
+    else:
+        return None
+    signature = code._signature
+    argcount = signature.num_argnames()
+    nstar = 0
+    if star_w is not None:
+        nstar = len(star_w)
+    total = nargs + nstar
+    if total > argcount and not signature.has_vararg():
+        return None
+    new_frame = space.createframe(code, w_callable.w_func_globals,
+                                  w_callable)
+    scope_w = new_frame.locals_cells_stack_w
+    extra_w = None
+    if signature.has_vararg():
+        extra_w = [None] * max(total - argcount, 0)
+    for i in range(total):
+        if i < nargs:
+            w_arg = f.peekvalue(nargs - 1 - i)
+        else:
+            w_arg = star_w[i - nargs]
+        if i < argcount:
+            scope_w[i] = w_arg
+        else:
+            extra_w[i - argcount] = w_arg
+    if extra_w is not None:
+        scope_w[argcount] = space.newtuple(extra_w)
+    w_kwds = None
+    if signature.has_kwarg():
+        w_kwds = space.newdict(kwargs=True)
+        scope_w[argcount + signature.has_vararg()] = w_kwds
+    if keys is not None:
+        for k in range(len(keys)):
+            j = signature.find_argname(keys[k])
+            if j < 0:
+                if w_kwds is None:
+                    return None
+                space.setitem_str(w_kwds, keys[k], values_w[k])
+            elif scope_w[j] is not None:
+                return None
+            else:
+                scope_w[j] = values_w[k]
+    defs_w = w_callable.defs_w
+    def_first = argcount - len(defs_w)
+    for i in range(min(total, argcount), argcount):
+        if scope_w[i] is None:
+            if i < def_first:
+                return None
+            scope_w[i] = defs_w[i - def_first]
+    new_frame.init_cells()
+    return new_frame
+
+
+def CALL_FUNCTION(f, oparg, next_instr):
+    nkwargs = (oparg >> 8) & 0xff
+    if nkwargs and not jit.we_are_jitted():
+        nargs = oparg & 0xff
+        w_callable = f.peekvalue(nargs + 2 * nkwargs)
+        new_frame = frame_for_valuestack_kw(f, w_callable, nargs, nkwargs,
+                                            next_instr)
+        if new_frame is not None:
+            f.dropvalues(nargs + 2 * nkwargs + 1)
+            f.pushvalue(new_frame.run())
+            return
+    PyFrame.CALL_FUNCTION(f, oparg, next_instr)
+
+def _call_forwarded(f, oparg, w_star, w_starstar):
+    if (oparg >> 8) & 0xff == 0 and not jit.we_are_jitted():
+        nargs = oparg & 0xff
+        w_callable = f.peekvalue(nargs)
+        new_frame = frame_for_forwarded_args(f, w_callable, nargs, w_star,
+                                             w_starstar)
+        if new_frame is not None:
+            f.dropvalues(nargs + 1)
+            f.pushvalue(new_frame.run())
+            return
+    f.call_function(oparg, w_star, w_starstar)
+
+def CALL_FUNCTION_KW(f, oparg, next_instr):
+    w_varkw = f.popvalue()
+    _call_forwarded(f, oparg, None, w_varkw)
+
+def CALL_FUNCTION_VAR_KW(f, oparg, next_instr):
+    w_varkw = f.popvalue()
+    w_varargs = f.popvalue()
+    _call_forwarded(f, oparg, w_varargs, w_varkw)
@@ -12,10 +12,12 @@ import operator
 import sys
 
 from rpython.rlib import debug, jit, rerased, rutf8
-from rpython.rlib.listsort import make_timsort_class
+from rpython.rlib.listsort import (
+    int_radix_sort, make_timsort_class, string_radix_sort)
 from rpython.rlib.objectmodel import (
     import_from_mixin, instantiate, newlist_hint, resizelist_hint, specialize)
 from rpython.rlib.rarithmetic import ovfcheck
+from rpython.rlib.rbigint import rbigint
 from rpython.rlib import longlong2float
 from rpython.tool.sourcetools import func_with_new_name
 from rpython.rlib.rstring import StringBuilder
@@ -34,6 +36,7 @@ from pypy.objspace.std.iterobject import (
     W_FastListIterObject, W_ReverseSeqIterObject)
 from pypy.objspace.std.sliceobject import (
     W_SliceObject, normalize_simple_slice, unwrap_start_stop)
+from pypy.objspace.std.strbufobject import unwrap_strbuf
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import get_positive_index, negate
@@ -78,6 +81,8 @@ def get_strategy_from_list_objects(space, list_w, sizehint):
         return space.fromcache(EmptyListStrategy)
 
     w_firstobj = list_w[0]
+    if space.config.objspace.std.withstrbuf:
+        w_firstobj = unwrap_strbuf(w_firstobj)
     check_int_or_float = False
 
     if type(w_firstobj) is W_IntObject:
@@ -93,7 +98,10 @@ def get_strategy_from_list_objects(space, list_w, sizehint):
     elif type(w_firstobj) is W_BytesObject:
         # check for all-strings
         for i in range(1, len(list_w)):
-            if type(list_w[i]) is not W_BytesObject:
+            w_obj = list_w[i]
+            if space.config.objspace.std.withstrbuf:
+                w_obj = unwrap_strbuf(w_obj)
+            if type(w_obj) is not W_BytesObject:
                 break
         else:
             return space.fromcache(BytesListStrategy)
@@ -117,6 +125,17 @@ def get_strategy_from_list_objects(space, list_w, sizehint):
         else:
             return space.fromcache(FloatListStrategy)
 
+    elif (isinstance(w_firstobj, W_AbstractTupleObject) and
+            space.config.objspace.std.withtuplelist):
+        # check for tuples of the same shape
+        shape = _tuple_row_shape(w_firstobj)
+        if shape is not None:
+            for i in range(1, len(list_w)):
+                if _tuple_row_items(shape, list_w[i]) is None:
+                    break
+            else:
+                return space.fromcache(TupleListStrategy)
+
     if check_int_or_float:
         for w_obj in list_w:
             if type(w_obj) is W_IntObject:
@@ -393,6 +412,21 @@ class W_ListObject(W_Root):
         """Return the items in the list as unwrapped floats. If the list does not
         use the list strategy, return None."""
         return self.strategy.getitems_float(self)
+
+    def reduce_sum(self, w_start):
+        """Return sum(self, w_start) computed on the unwrapped items, or None
+        if the strategy cannot do that."""
+        return self.strategy.reduce_sum(self, w_start)
+
+    def reduce_min_max(self, is_max):
+        """Return max(self) or min(self) computed on the unwrapped items, or
+        None if the strategy cannot do that or the list is empty."""
+        return self.strategy.reduce_min_max(self, is_max)
+
+    def reduce_any_all(self, is_any):
+        """Return any(self) or all(self) computed on the unwrapped items, or
+        None if the strategy cannot do that."""
+        return self.strategy.reduce_any_all(self, is_any)
     # ___________________________________________________
 
     def mul(self, times):
@@ -427,6 +461,7 @@ class W_ListObject(W_Root):
         """Sets the slice of the list from start to start+step*slicelength to
         the sequence sequence_w.
         Used by setslice and setitem."""
+        sequence_w.strategy.unshare(sequence_w)
         self.strategy.setslice(self, start, step, slicelength, sequence_w)
 
     def insert(self, index, w_item):
@@ -757,6 +792,8 @@ class W_ListObject(W_Root):
                 sorterclass = CustomCompareSort
         else:
             if has_key:
+                if self.strategy.sort_by_key(self, w_key, reverse):
+                    return
                 sorterclass = CustomKeySort
             else:
                 if self.strategy is space.fromcache(ObjectListStrategy):
@@ -917,6 +954,43 @@ class ListStrategy(object):
     def getitems_float(self, w_list):
         return None
 
+    def reduce_sum(self, w_list, w_start):
+        intlist = self.getitems_int(w_list)
+        if intlist is not None:
+            return sum_int_items(self.space, intlist, 0, len(intlist),
+                                 w_start)
+        floatlist = self.getitems_float(w_list)
+        if floatlist is not None:
+            return sum_float_items(self.space, floatlist, 0, len(floatlist),
+                                   w_start)
+        return None
+
+    def reduce_min_max(self, w_list, is_max):
+        intlist = self.getitems_int(w_list)
+        if intlist is not None:
+            if not intlist:
+                return None
+            return self.space.newint(
+                min_max_int_items(intlist, 0, len(intlist), is_max))
+        floatlist = self.getitems_float(w_list)
+        if floatlist is not None:
+            if not floatlist:
+                return None
+            return self.space.newfloat(
+                min_max_float_items(floatlist, 0, len(floatlist), is_max))
+        return None
+
+    def reduce_any_all(self, w_list, is_any):
+        intlist = self.getitems_int(w_list)
+        if intlist is not None:
+            return self.space.newbool(
+                any_all_int_items(intlist, 0, len(intlist), is_any))
+        floatlist = self.getitems_float(w_list)
+        if floatlist is not None:
+            return self.space.newbool(
+                any_all_float_items(floatlist, 0, len(floatlist), is_any))
+        return None
+
     def getstorage_copy(self, w_list):
         raise NotImplementedError
 
@@ -954,6 +1028,8 @@ class ListStrategy(object):
         space = self.space
         if type(w_any) is W_ListObject or (isinstance(w_any, W_ListObject) and
                                            space._uses_list_iter(w_any)):
+            if not self.is_empty_strategy():
+                w_any.strategy.unshare(w_any)
             self._extend_from_list(w_list, w_any)
         elif (isinstance(w_any, W_AbstractTupleObject) and
                 not w_any.user_overridden_class and
@@ -1003,6 +1079,17 @@ class ListStrategy(object):
     def sort(self, w_list, reverse):
         raise NotImplementedError
 
+    def unshare(self, w_list):
+        """Stop sharing the storage with other lists, see
+        AbstractSliceStrategy."""
+        pass
+
+    def sort_by_key(self, w_list, w_key, reverse):
+        """Sort the list by the key function w_key without calling it, if
+        the strategy knows how to. Returns False if the generic sort has to
+        be used."""
+        return False
+
     def is_empty_strategy(self):
         return False
 
@@ -1085,6 +1172,8 @@ class EmptyListStrategy(ListStrategy):
         return self.erase(None)
 
     def switch_to_correct_strategy(self, w_list, w_item):
+        if self.space.config.objspace.std.withstrbuf:
+            w_item = unwrap_strbuf(w_item)
         if type(w_item) is W_IntObject:
             strategy = self.space.fromcache(IntegerListStrategy)
         elif type(w_item) is W_BytesObject:
@@ -1093,6 +1182,10 @@ class EmptyListStrategy(ListStrategy):
             strategy = self.space.fromcache(AsciiListStrategy)
         elif type(w_item) is W_FloatObject:
             strategy = self.space.fromcache(FloatListStrategy)
+        elif (isinstance(w_item, W_AbstractTupleObject) and
+                self.space.config.objspace.std.withtuplelist):
+            self.switch_to_tuple_strategy(w_list, w_item)
+            return
         else:
             strategy = self.space.fromcache(ObjectListStrategy)
 
@@ -1100,6 +1193,17 @@ class EmptyListStrategy(ListStrategy):
         w_list.strategy = strategy
         w_list.lstorage = storage
 
+    def switch_to_tuple_strategy(self, w_list, w_item):
+        shape = _tuple_row_shape(w_item)
+        if shape is None:
+            strategy = self.space.fromcache(ObjectListStrategy)
+            storage = strategy.get_empty_storage(self.get_sizehint())
+        else:
+            strategy = self.space.fromcache(TupleListStrategy)
+            storage = strategy.erase(TupleColumns.empty(shape))
+        w_list.strategy = strategy
+        w_list.lstorage = storage
+
     def append(self, w_list, w_item):
         self.switch_to_correct_strategy(w_list, w_item)
         w_list.append(w_item)
@@ -1146,7 +1250,8 @@ class EmptyListStrategy(ListStrategy):
         space = self.space
         if (isinstance(w_iterable, W_AbstractTupleObject)
                 and space._uses_tuple_iter(w_iterable)):
-            w_list.__init__(space, w_iterable.getitems_copy())
+            if not self._init_from_unboxed_tuple(w_list, w_iterable):
+                w_list.__init__(space, w_iterable.getitems_copy())
             return
 
         intlist = space.unpackiterable_int(w_iterable)
@@ -1177,6 +1282,25 @@ class EmptyListStrategy(ListStrategy):
 
         ListStrategy._extend_from_iterable(self, w_list, w_iterable)
 
+    def _init_from_unboxed_tuple(self, w_list, w_tuple):
+        space = self.space
+        intlist = w_tuple.getitems_int_copy()
+        if intlist is not None:
+            w_list.strategy = strategy = space.fromcache(IntegerListStrategy)
+            w_list.lstorage = strategy.erase(intlist)
+            return True
+        floatlist = w_tuple.getitems_float_copy()
+        if floatlist is not None:
+            w_list.strategy = strategy = space.fromcache(FloatListStrategy)
+            w_list.lstorage = strategy.erase(floatlist)
+            return True
+        byteslist = w_tuple.getitems_bytes_copy()
+        if byteslist is not None:
+            w_list.strategy = strategy = space.fromcache(BytesListStrategy)
+            w_list.lstorage = strategy.erase(byteslist)
+            return True
+        return False
+
     def reverse(self, w_list):
         pass
 
@@ -1246,6 +1370,39 @@ class BaseRangeListStrategy(ListStrategy):
     def getitems_copy(self, w_list):
         return self._getitems_range(w_list, True)
 
+    def unerase_range(self, w_list):
+        """Return (start, step, length)."""
+        raise NotImplementedError
+
+    # the reductions use closed forms instead of materializing the items
+
+    def reduce_sum(self, w_list, w_start):
+        if type(w_start) is not W_IntObject:
+            return None
+        start, step, length = self.unerase_range(w_list)
+        return sum_int_range(self.space, w_start.intval, start, step, length)
+
+    def reduce_min_max(self, w_list, is_max):
+        start, step, length = self.unerase_range(w_list)
+        if length == 0:
+            return None
+        last = start + (length - 1) * step
+        if (step > 0) == is_max:
+            return self.wrap(last)
+        return self.wrap(start)
+
+    def reduce_any_all(self, w_list, is_any):
+        start, step, length = self.unerase_range(w_list)
+        if length == 0:
+            return self.space.newbool(not is_any)
+        if is_any:
+            # at most one item is zero
+            return self.space.newbool(length > 1 or start != 0)
+        last = start + (length - 1) * step
+        has_zero = (min(start, last) <= 0 <= max(start, last) and
+                    start % step == 0)
+        return self.space.newbool(not has_zero)
+
     def getstorage_copy(self, w_list):
         # tuple is immutable
         return w_list.lstorage
@@ -1335,6 +1492,9 @@ class SimpleRangeListStrategy(BaseRangeListStrategy):
     def step(self, w_list):
         return 1
 
+    def unerase_range(self, w_list):
+        return 0, 1, self.unerase(w_list.lstorage)[0]
+
     def _getitem_unwrapped(self, w_list, i):
         length = self.unerase(w_list.lstorage)[0]
         if i < 0:
@@ -1420,6 +1580,9 @@ class RangeListStrategy(BaseRangeListStrategy):
     def step(self, w_list):
         return self.unerase(w_list.lstorage)[1]
 
+    def unerase_range(self, w_list):
+        return self.unerase(w_list.lstorage)
+
     def _getitem_unwrapped(self, w_list, i):
         v = self.unerase(w_list.lstorage)
         start = v[0]
@@ -1543,9 +1706,15 @@ class AbstractUnwrappedStrategy(object):
 
     def _safe_find_or_count(self, w_list, obj, start, stop, count):
         l = self.unerase(w_list.lstorage)
+        return self._find_or_count_in(l, 0, obj, start, min(stop, len(l)),
+                                      count)
+
+    def _find_or_count_in(self, l, first, obj, start, stop, count):
+        # search l[first + start:first + stop]; the index returned is
+        # relative to first
         result = 0
-        for i in range(start, min(stop, len(l))):
-            val = l[i]
+        for i in range(start, stop):
+            val = l[first + i]
             if val == obj:
                 if count:
                     result += 1
@@ -1886,8 +2055,9 @@ class IntegerListStrategy(ListStrategy):
 
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
-        sorter = IntSort(l, len(l))
-        sorter.sort()
+        if not int_radix_sort(l):
+            sorter = IntSort(l, len(l))
+            sorter.sort()
         if reverse:
             l.reverse()
 
@@ -1895,6 +2065,16 @@ class IntegerListStrategy(ListStrategy):
         return self.unerase(w_list.lstorage)
 
 
+    _base_getslice = getslice
+
+    def getslice(self, w_list, start, stop, step, length):
+        l = self.unerase(w_list.lstorage)
+        if step == 1 and _can_share_slice(length, len(l)):
+            strategy = self.space.fromcache(IntegerSliceListStrategy)
+            return strategy.share_slice(w_list, l, start, length)
+        return self._base_getslice(w_list, start, stop, step, length)
+
+
     _base_extend_from_list = _extend_from_list
 
     def _extend_from_list(self, w_list, w_other):
@@ -1999,6 +2179,16 @@ class FloatListStrategy(ListStrategy):
         return self.unerase(w_list.lstorage)
 
 
+    _base_getslice = getslice
+
+    def getslice(self, w_list, start, stop, step, length):
+        l = self.unerase(w_list.lstorage)
+        if step == 1 and _can_share_slice(length, len(l)):
+            strategy = self.space.fromcache(FloatSliceListStrategy)
+            return strategy.share_slice(w_list, l, start, length)
+        return self._base_getslice(w_list, start, stop, step, length)
+
+
     _base_extend_from_list = _extend_from_list
 
     def _extend_from_list(self, w_list, w_other):
@@ -2024,13 +2214,11 @@ class FloatListStrategy(ListStrategy):
         return self._base_setslice(w_list, start, step, slicelength, w_other)
 
 
-    def _safe_find_or_count(self, w_list, obj, start, stop, count):
-        l = self.unerase(w_list.lstorage)
-        stop = min(stop, len(l))
+    def _find_or_count_in(self, l, first, obj, start, stop, count):
         result = 0
         if not math.isnan(obj):
             for i in range(start, stop):
-                val = l[i]
+                val = l[first + i]
                 if val == obj:
                     if count:
                         result += 1
@@ -2039,7 +2227,7 @@ class FloatListStrategy(ListStrategy):
         else:
             search = longlong2float.float2longlong(obj)
             for i in range(start, stop):
-                val = l[i]
+                val = l[first + i]
                 if longlong2float.float2longlong(val) == search:
                     if count:
                         result += 1
@@ -2097,6 +2285,234 @@ class FloatListStrategy(ListStrategy):
         return self.space.newtext(b.build())
 
 
+# Slices of int and float lists that share the storage of the sliced list
+# until one of them is modified.  Slices are only shared when they are big
+# enough for the copy to matter and cover at least 1/SHARED_SLICE_RATIO of
+# the storage, so that a small slice cannot keep a huge list alive and
+# copying the whole storage on the first mutation costs at most
+# SHARED_SLICE_RATIO times the copy that sharing avoided.
+
+SHARED_SLICE_MIN_LENGTH = 64
+SHARED_SLICE_RATIO = 4
+
+
+def _can_share_slice(length, storage_length):
+    return (length >= SHARED_SLICE_MIN_LENGTH and
+            length * SHARED_SLICE_RATIO >= storage_length)
+
+
+class AbstractSliceStrategy(object):
+    """The storage is a tuple (items, start, length) describing
+    items[start:start + length].  Once shared, items is never modified: the
+    list that was sliced switches to this strategy as well, and every
+    operation that modifies a list first copies its part of items and
+    switches to the unshared strategy."""
+
+    def unshared_strategy(self):
+        raise NotImplementedError("abstract base class")
+
+    def share_slice(self, w_list, items, start, length):
+        w_list.strategy = self
+        w_list.lstorage = self.erase((items, 0, len(items)))
+        return W_ListObject.from_storage_and_strategy(
+                self.space, self.erase((items, start, length)), self)
+
+    def unshare(self, w_list):
+        items, start, length = self.unerase(w_list.lstorage)
+        assert start >= 0 and length >= 0
+        strategy = self.unshared_strategy()
+        w_list.strategy = strategy
+        w_list.lstorage = strategy.erase(items[start:start + length])
+
+    def wrap(self, item):
+        return self.unshared_strategy().wrap(item)
+
+    def init_from_list_w(self, w_list, list_w):
+        raise NotImplementedError
+
+    def clone(self, w_list):
+        # the tuple is immutable and so are the items
+        return W_ListObject.from_storage_and_strategy(
+                self.space, w_list.lstorage, self)
+
+    def copy_into(self, w_list, w_other):
+        w_other.strategy = self
+        w_other.lstorage = w_list.lstorage
+
+    def getstorage_copy(self, w_list):
+        return w_list.lstorage
+
+    def _resize_hint(self, w_list, hint):
+        assert hint >= 0
+
+    def length(self, w_list):
+        return self.unerase(w_list.lstorage)[2]
+
+    def getitem(self, w_list, index):
+        items, start, length = self.unerase(w_list.lstorage)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        return self.wrap(items[start + index])
+
+    def getitems_copy(self, w_list):
+        items, start, length = self.unerase(w_list.lstorage)
+        return [self.wrap(items[start + i]) for i in range(length)]
+
+    @jit.look_inside_iff(lambda self, w_list:
+            w_list._unrolling_heuristic())
+    def getitems_fixedsize(self, w_list):
+        return self.getitems_unroll(w_list)
+
+    @jit.unroll_safe
+    def getitems_unroll(self, w_list):
+        items, start, length = self.unerase(w_list.lstorage)
+        items_w = [None] * length
+        for i in range(length):
+            items_w[i] = self.wrap(items[start + i])
+        return items_w
+
+    def getitems_unwrapped(self, w_list):
+        items, start, length = self.unerase(w_list.lstorage)
+        assert start >= 0 and length >= 0
+        return items[start:start + length]
+
+    def getslice(self, w_list, start, stop, step, length):
+        items, first, _ = self.unerase(w_list.lstorage)
+        if step == 1 and _can_share_slice(length, len(items)):
+            return W_ListObject.from_storage_and_strategy(
+                    self.space, self.erase((items, first + start, length)),
+                    self)
+        strategy = self.unshared_strategy()
+        sliced = [strategy._none_value] * length
+        for i in range(length):
+            sliced[i] = items[first + start]
+            start += step
+        return W_ListObject.from_storage_and_strategy(
+                self.space, strategy.erase(sliced), strategy)
+
+    def find_or_count(self, w_list, w_item, start, stop, count):
+        strategy = self.unshared_strategy()
+        if not strategy.is_correct_type(w_item):
+            return ListStrategy.find_or_count(
+                self, w_list, w_item, start, stop, count)
+        items, first, length = self.unerase(w_list.lstorage)
+        return strategy._find_or_count_in(items, first,
+                                          strategy.unwrap(w_item), start,
+                                          min(stop, length), count)
+
+    def append(self, w_list, w_item):
+        self.unshare(w_list)
+        w_list.append(w_item)
+
+    def inplace_mul(self, w_list, times):
+        self.unshare(w_list)
+        w_list.inplace_mul(times)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        self.unshare(w_list)
+        w_list.deleteslice(start, step, slicelength)
+
+    def pop(self, w_list, index):
+        self.unshare(w_list)
+        return w_list.pop(index)
+
+    def pop_end(self, w_list):
+        self.unshare(w_list)
+        return w_list.pop_end()
+
+    def setitem(self, w_list, index, w_item):
+        self.unshare(w_list)
+        w_list.setitem(index, w_item)
+
+    def setslice(self, w_list, start, step, slicelength, w_other):
+        self.unshare(w_list)
+        w_list.setslice(start, step, slicelength, w_other)
+
+    def insert(self, w_list, index, w_item):
+        self.unshare(w_list)
+        w_list.insert(index, w_item)
+
+    def extend(self, w_list, w_any):
+        self.unshare(w_list)
+        w_list.extend(w_any)
+
+    def reverse(self, w_list):
+        self.unshare(w_list)
+        w_list.reverse()
+
+    def sort(self, w_list, reverse):
+        self.unshare(w_list)
+        w_list.sort(reverse)
+
+    # default _unrolling_heuristic is fine
+
+
+class IntegerSliceListStrategy(ListStrategy):
+    import_from_mixin(AbstractSliceStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("integer_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def unshared_strategy(self):
+        return self.space.fromcache(IntegerListStrategy)
+
+    def getitems_int(self, w_list):
+        return self.getitems_unwrapped(w_list)
+
+    # the reductions read the shared items in place
+
+    def reduce_sum(self, w_list, w_start):
+        items, first, length = self.unerase(w_list.lstorage)
+        return sum_int_items(self.space, items, first, first + length,
+                             w_start)
+
+    def reduce_min_max(self, w_list, is_max):
+        items, first, length = self.unerase(w_list.lstorage)
+        if length == 0:
+            return None
+        return self.space.newint(
+            min_max_int_items(items, first, first + length, is_max))
+
+    def reduce_any_all(self, w_list, is_any):
+        items, first, length = self.unerase(w_list.lstorage)
+        return self.space.newbool(
+            any_all_int_items(items, first, first + length, is_any))
+
+
+class FloatSliceListStrategy(ListStrategy):
+    import_from_mixin(AbstractSliceStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("float_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def unshared_strategy(self):
+        return self.space.fromcache(FloatListStrategy)
+
+    def getitems_float(self, w_list):
+        return self.getitems_unwrapped(w_list)
+
+    def reduce_sum(self, w_list, w_start):
+        items, first, length = self.unerase(w_list.lstorage)
+        return sum_float_items(self.space, items, first, first + length,
+                               w_start)
+
+    def reduce_min_max(self, w_list, is_max):
+        items, first, length = self.unerase(w_list.lstorage)
+        if length == 0:
+            return None
+        return self.space.newfloat(
+            min_max_float_items(items, first, first + length, is_max))
+
+    def reduce_any_all(self, w_list, is_any):
+        items, first, length = self.unerase(w_list.lstorage)
+        return self.space.newbool(
+            any_all_float_items(items, first, first + length, is_any))
+
+
 class IntOrFloatListStrategy(ListStrategy):
     import_from_mixin(AbstractUnwrappedStrategy)
 
@@ -2259,6 +2675,8 @@ class BytesListStrategy(ListStrategy):
     unerase = staticmethod(unerase)
 
     def is_correct_type(self, w_obj):
+        if self.space.config.objspace.std.withstrbuf:
+            w_obj = unwrap_strbuf(w_obj)
         return type(w_obj) is W_BytesObject
 
     def list_is_correct_type(self, w_list):
@@ -2266,8 +2684,9 @@ class BytesListStrategy(ListStrategy):
 
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
-        sorter = StringSort(l, len(l))
-        sorter.sort()
+        if not string_radix_sort(l):
+            sorter = StringSort(l, len(l))
+            sorter.sort()
         if reverse:
             l.reverse()
 
@@ -2310,6 +2729,462 @@ class AsciiListStrategy(ListStrategy):
     def getitems_ascii(self, w_list):
         return self.unerase(w_list.lstorage)
 
+# _______________________________________________________
+# Lists of tuples, stored column-wise
+
+MAX_TUPLE_LIST_WIDTH = 8
+
+
+def _tuple_item_kind(w_item):
+    if type(w_item) is W_IntObject:
+        return 'i'
+    elif type(w_item) is W_FloatObject:
+        return 'f'
+    elif type(w_item) is W_BytesObject:
+        return 'b'
+    return 'o'
+
+
+@jit.unroll_safe
+def _tuple_row_shape(w_obj):
+    """Return the shape of w_obj if it is a tuple that TupleListStrategy can
+    store, otherwise None. The shape has one character per item of the
+    tuple: 'i' for ints, 'f' for floats, 'b' for bytes and 'o' for
+    everything else."""
+    if not isinstance(w_obj, W_AbstractTupleObject):
+        return None
+    if w_obj.user_overridden_class:
+        return None
+    length = w_obj.length()
+    if length < 2 or length > MAX_TUPLE_LIST_WIDTH:
+        return None
+    items_w = w_obj.tolist()
+    shape = ['o'] * length
+    unboxed = False
+    for i in range(length):
+        kind = _tuple_item_kind(items_w[i])
+        if kind != 'o':
+            unboxed = True
+        shape[i] = kind
+    if not unboxed:
+        return None
+    return ''.join(shape)
+
+
+@jit.unroll_safe
+def _tuple_row_items(shape, w_obj):
+    """Return the items of w_obj if it is a tuple of the given shape,
+    otherwise None."""
+    if not isinstance(w_obj, W_AbstractTupleObject):
+        return None
+    if w_obj.user_overridden_class or w_obj.length() != len(shape):
+        return None
+    items_w = w_obj.tolist()
+    for i in range(len(shape)):
+        kind = shape[i]
+        if kind != 'o' and _tuple_item_kind(items_w[i]) != kind:
+            return None
+    return items_w
+
+
+@specialize.call_location()
+def _copy_columns(columns):
+    return [column[:] for column in columns]
+
+
+@specialize.call_location()
+def _slice_columns(columns, start, step, length):
+    result = []
+    for column in columns:
+        sliced = newlist_hint(length)
+        i = start
+        for j in range(length):
+            sliced.append(column[i])
+            i += step
+        result.append(sliced)
+    return result
+
+
+@specialize.call_location()
+def _permute_columns(columns, order):
+    for i in range(len(columns)):
+        column = columns[i]
+        columns[i] = [column[j] for j in order]
+
+
+class TupleColumns(object):
+    """The storage of TupleListStrategy. Every position of the tuples gets
+    its own column: an unboxed list of ints, floats or strings, or a list of
+    wrapped objects. shape[i] is the kind of the i-th item of the tuples
+    and positions[i] the index of its column among the columns of that
+    kind."""
+    _immutable_fields_ = ['shape', 'positions[*]']
+
+    def __init__(self, shape, positions, int_columns, float_columns,
+                 bytes_columns, object_columns):
+        self.shape = shape
+        self.positions = positions
+        self.int_columns = int_columns
+        self.float_columns = float_columns
+        self.bytes_columns = bytes_columns
+        self.object_columns = object_columns
+
+    @staticmethod
+    def empty(shape):
+        positions = [0] * len(shape)
+        int_columns = []
+        float_columns = []
+        bytes_columns = []
+        object_columns = []
+        for i in range(len(shape)):
+            kind = shape[i]
+            if kind == 'i':
+                positions[i] = len(int_columns)
+                int_columns.append([])
+            elif kind == 'f':
+                positions[i] = len(float_columns)
+                float_columns.append([])
+            elif kind == 'b':
+                positions[i] = len(bytes_columns)
+                bytes_columns.append([])
+            else:
+                positions[i] = len(object_columns)
+                object_columns.append([])
+        return TupleColumns(shape, positions, int_columns, float_columns,
+                            bytes_columns, object_columns)
+
+    def _with_columns(self, int_columns, float_columns, bytes_columns,
+                      object_columns):
+        return TupleColumns(self.shape, self.positions, int_columns,
+                            float_columns, bytes_columns, object_columns)
+
+    def length(self):
+        # there is always at least one unboxed column
+        if self.int_columns:
+            return len(self.int_columns[0])
+        if self.float_columns:
+            return len(self.float_columns[0])
+        return len(self.bytes_columns[0])
+
+    def check_index(self, index):
+        length = self.length()
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        return index
+
+    @jit.unroll_safe
+    def get_row(self, space, index):
+        shape = self.shape
+        items_w = [None] * len(shape)
+        for i in range(len(shape)):
+            kind = shape[i]
+            pos = self.positions[i]
+            if kind == 'i':
+                items_w[i] = space.newint(self.int_columns[pos][index])
+            elif kind == 'f':
+                items_w[i] = space.newfloat(self.float_columns[pos][index])
+            elif kind == 'b':
+                items_w[i] = space.newbytes(self.bytes_columns[pos][index])
+            else:
+                items_w[i] = self.object_columns[pos][index]
+        return items_w
+
+    @jit.unroll_safe
+    def append_row(self, space, items_w):
+        shape = self.shape
+        for i in range(len(shape)):
+            kind = shape[i]
+            pos = self.positions[i]
+            w_item = items_w[i]
+            if kind == 'i':
+                self.int_columns[pos].append(space.int_w(w_item))
+            elif kind == 'f':
+                self.float_columns[pos].append(space.float_w(w_item))
+            elif kind == 'b':
+                self.bytes_columns[pos].append(space.bytes_w(w_item))
+            else:
+                self.object_columns[pos].append(w_item)
+
+    @jit.unroll_safe
+    def insert_row(self, space, index, items_w):
+        shape = self.shape
+        for i in range(len(shape)):
+            kind = shape[i]
+            pos = self.positions[i]
+            w_item = items_w[i]
+            if kind == 'i':
+                self.int_columns[pos].insert(index, space.int_w(w_item))
+            elif kind == 'f':
+                self.float_columns[pos].insert(index, space.float_w(w_item))
+            elif kind == 'b':
+                self.bytes_columns[pos].insert(index, space.bytes_w(w_item))
+            else:
+                self.object_columns[pos].insert(index, w_item)
+
+    @jit.unroll_safe
+    def set_row(self, space, index, items_w):
+        shape = self.shape
+        for i in range(len(shape)):
+            kind = shape[i]
+            pos = self.positions[i]
+            w_item = items_w[i]
+            if kind == 'i':
+                self.int_columns[pos][index] = space.int_w(w_item)
+            elif kind == 'f':
+                self.float_columns[pos][index] = space.float_w(w_item)
+            elif kind == 'b':
+                self.bytes_columns[pos][index] = space.bytes_w(w_item)
+            else:
+                self.object_columns[pos][index] = w_item
+
+    def delete_row(self, index):
+        for column in self.int_columns:
+            del column[index]
+        for column in self.float_columns:
+            del column[index]
+        for column in self.bytes_columns:
+            del column[index]
+        for column in self.object_columns:
+            del column[index]
+
+    def copy(self):
+        return self._with_columns(_copy_columns(self.int_columns),
+                                  _copy_columns(self.float_columns),
+                                  _copy_columns(self.bytes_columns),
+                                  _copy_columns(self.object_columns))
+
+    def getslice(self, start, step, length):
+        return self._with_columns(
+            _slice_columns(self.int_columns, start, step, length),
+            _slice_columns(self.float_columns, start, step, length),
+            _slice_columns(self.bytes_columns, start, step, length),
+            _slice_columns(self.object_columns, start, step, length))
+
+    def extend(self, other):
+        assert other.shape == self.shape
+        if other is self:
+            other = self.copy()
+        for i in range(len(self.int_columns)):
+            self.int_columns[i].extend(other.int_columns[i])
+        for i in range(len(self.float_columns)):
+            self.float_columns[i].extend(other.float_columns[i])
+        for i in range(len(self.bytes_columns)):
+            self.bytes_columns[i].extend(other.bytes_columns[i])
+        for i in range(len(self.object_columns)):
+            self.object_columns[i].extend(other.object_columns[i])
+
+    def inplace_mul(self, times):
+        for column in self.int_columns:
+            column *= times
+        for column in self.float_columns:
+            column *= times
+        for column in self.bytes_columns:
+            column *= times
+        for column in self.object_columns:
+            column *= times
+
+    def reverse(self):
+        for column in self.int_columns:
+            column.reverse()
+        for column in self.float_columns:
+            column.reverse()
+        for column in self.bytes_columns:
+            column.reverse()
+        for column in self.object_columns:
+            column.reverse()
+
+    def sort_by_column(self, index, reverse):
+        """Stable sort of the rows by the unboxed column at the given
+        position of the tuples."""
+        kind = self.shape[index]
+        pos = self.positions[index]
+        if kind == 'i':
+            order = sorted_column_order(IntColumnSort, None,
+                                        self.int_columns[pos], reverse)
+        elif kind == 'f':
+            order = sorted_column_order(FloatColumnSort, None,
+                                        self.float_columns[pos], reverse)
+        else:
+            assert kind == 'b'
+            order = sorted_column_order(BytesColumnSort, None,
+                                        self.bytes_columns[pos], reverse)
+        _permute_columns(self.int_columns, order)
+        _permute_columns(self.float_columns, order)
+        _permute_columns(self.bytes_columns, order)
+        _permute_columns(self.object_columns, order)
+
+
+def _single_itemgetter_index(space, w_key):
+    """If w_key is an operator.itemgetter() of a single item, return the
+    wrapped item, otherwise return None."""
+    if not space.config.objspace.usemodules.operator:
+        return None
+    w_itemgetter = space.getattr(space.builtin_modules['operator'],
+                                 space.newtext('itemgetter'))
+    if not space.is_w(space.type(w_key), w_itemgetter):
+        return None
+    w_single = space.findattr(w_key, space.newtext('_single'))
+    if w_single is None or not space.is_w(w_single, space.w_True):
+        return None
+    return space.findattr(w_key, space.newtext('_idx'))
+
+
+class TupleListStrategy(ListStrategy):
+    """TupleListStrategy is used for lists of tuples that all have the same
+    length and the same item types in each position, as built by zip(),
+    enumerate() or record-building list comprehensions. The storage is a
+    TupleColumns instance keeping the int, float and bytes positions
+    unboxed in columns; the tuples are only rebuilt when an item is read.
+    Operations that do not keep that shape switch to ObjectListStrategy.
+    """
+
+    erase, unerase = rerased.new_erasing_pair("tuple")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def init_from_list_w(self, w_list, list_w):
+        shape = _tuple_row_shape(list_w[0])
+        assert shape is not None
+        storage = TupleColumns.empty(shape)
+        for w_item in list_w:
+            items_w = _tuple_row_items(shape, w_item)
+            assert items_w is not None
+            storage.append_row(self.space, items_w)
+        w_list.lstorage = self.erase(storage)
+
+    def clone(self, w_list):
+        return W_ListObject.from_storage_and_strategy(
+                self.space, self.getstorage_copy(w_list), self)
+
+    def copy_into(self, w_list, w_other):
+        w_other.strategy = self
+        w_other.lstorage = self.getstorage_copy(w_list)
+
+    def _resize_hint(self, w_list, hint):
+        assert hint >= 0
+
+    def length(self, w_list):
+        return self.unerase(w_list.lstorage).length()
+
+    def getitem(self, w_list, index):
+        storage = self.unerase(w_list.lstorage)
+        index = storage.check_index(index)
+        return self.space.newtuple(storage.get_row(self.space, index))
+
+    def getitems_copy(self, w_list):
+        storage = self.unerase(w_list.lstorage)
+        space = self.space
+        return [space.newtuple(storage.get_row(space, i))
+                for i in range(storage.length())]
+
+    @jit.look_inside_iff(lambda self, w_list:
+            w_list._unrolling_heuristic())
+    def getitems_fixedsize(self, w_list):
+        return self.getitems_unroll(w_list)
+
+    @jit.unroll_safe
+    def getitems_unroll(self, w_list):
+        storage = self.unerase(w_list.lstorage)
+        space = self.space
+        items_w = [None] * storage.length()
+        for i in range(len(items_w)):
+            items_w[i] = space.newtuple(storage.get_row(space, i))
+        return items_w
+
+    def getstorage_copy(self, w_list):
+        return self.erase(self.unerase(w_list.lstorage).copy())
+
+    def getslice(self, w_list, start, stop, step, length):
+        storage = self.unerase(w_list.lstorage)
+        return W_ListObject.from_storage_and_strategy(
+                self.space, self.erase(storage.getslice(start, step, length)),
+                self)
+
+    def append(self, w_list, w_item):
+        storage = self.unerase(w_list.lstorage)
+        items_w = _tuple_row_items(storage.shape, w_item)
+        if items_w is not None:
+            storage.append_row(self.space, items_w)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.append(w_item)
+
+    def insert(self, w_list, index, w_item):
+        storage = self.unerase(w_list.lstorage)
+        items_w = _tuple_row_items(storage.shape, w_item)
+        if items_w is not None:
+            storage.insert_row(self.space, index, items_w)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.insert(index, w_item)
+
+    def setitem(self, w_list, index, w_item):
+        storage = self.unerase(w_list.lstorage)
+        index = storage.check_index(index)
+        items_w = _tuple_row_items(storage.shape, w_item)
+        if items_w is not None:
+            storage.set_row(self.space, index, items_w)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.setitem(index, w_item)
+
+    def pop(self, w_list, index):
+        storage = self.unerase(w_list.lstorage)
+        index = storage.check_index(index)
+        w_item = self.space.newtuple(storage.get_row(self.space, index))
+        storage.delete_row(index)
+        return w_item
+
+    def inplace_mul(self, w_list, times):
+        self.unerase(w_list.lstorage).inplace_mul(times)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        w_list.switch_to_object_strategy()
+        w_list.deleteslice(start, step, slicelength)
+
+    def setslice(self, w_list, start, step, slicelength, w_other):
+        w_list.switch_to_object_strategy()
+        w_list.setslice(start, step, slicelength, w_other)
+
+    def _extend_from_list(self, w_list, w_other):
+        storage = self.unerase(w_list.lstorage)
+        if w_other.strategy is self:
+            other = self.unerase(w_other.lstorage)
+            if other.shape == storage.shape:
+                storage.extend(other)
+                return
+        elif w_other.strategy.is_empty_strategy():
+            return
+        w_other = w_other._temporarily_as_objects()
+        w_list.switch_to_object_strategy()
+        w_list.extend(w_other)
+
+    def reverse(self, w_list):
+        self.unerase(w_list.lstorage).reverse()
+
+    def sort(self, w_list, reverse):
+        # comparing whole tuples needs the wrapped items; the sorted items
+        # are turned back into columns by W_ListObject.descr_sort()
+        w_list.switch_to_object_strategy()
+        w_list.descr_sort(self.space, reverse=reverse)
+
+    def sort_by_key(self, w_list, w_key, reverse):
+        space = self.space
+        w_index = _single_itemgetter_index(space, w_key)
+        if w_index is None or type(w_index) is not W_IntObject:
+            return False
+        storage = self.unerase(w_list.lstorage)
+        width = len(storage.shape)
+        index = space.int_w(w_index)
+        if index < 0:
+            index += width
+        if not 0 <= index < width or storage.shape[index] == 'o':
+            return False
+        storage.sort_by_column(index, reverse)
+        return True
+
 # _______________________________________________________
 
 init_signature = Signature(['sequence'], None, None)
@@ -2326,6 +3201,10 @@ TimSort = make_timsort_class()
 IntBaseTimSort = make_timsort_class()
 FloatBaseTimSort = make_timsort_class()
 IntOrFloatBaseTimSort = make_timsort_class()
+IntColumnBaseTimSort = make_timsort_class()
+FloatColumnBaseTimSort = make_timsort_class()
+BytesColumnBaseTimSort = make_timsort_class()
+ObjectColumnBaseTimSort = make_timsort_class()
 
 
 class KeyContainer(W_Root):
@@ -2361,6 +3240,62 @@ class IntOrFloatSort(IntOrFloatBaseTimSort):
         return fa < fb
 
 
+class IntColumnSort(IntColumnBaseTimSort):
+    # sorts row indices of a TupleColumns by one of its int columns
+    def lt(self, a, b):
+        return self.column[a] < self.column[b]
+
+
+class FloatColumnSort(FloatColumnBaseTimSort):
+    def lt(self, a, b):
+        return self.column[a] < self.column[b]
+
+
+class BytesColumnSort(BytesColumnBaseTimSort):
+    def lt(self, a, b):
+        return self.column[a] < self.column[b]
+
+
+class ObjectColumnSort(ObjectColumnBaseTimSort):
+    def lt(self, a, b):
+        space = self.space
+        return space.is_true(space.lt(self.column[a], self.column[b]))
+
+
+@specialize.arg(0)
+def sorted_column_order(sorterclass, space, column, reverse):
+    """Return the list of indices of column in the order that stably sorts
+    it, using one of the *ColumnSort classes. space is only needed by
+    ObjectColumnSort."""
+    order = range(len(column))
+    # see W_ListObject.descr_sort() for how reverse stays stable
+    if reverse:
+        order.reverse()
+    sorter = sorterclass(order, len(order))
+    sorter.space = space
+    sorter.column = column
+    sorter.sort()
+    if reverse:
+        order.reverse()
+    return order
+
+
+def sorted_list_order(space, w_list, reverse):
+    """Return the list of indices of w_list in the order that stably sorts
+    it. The items of int, float and bytes lists are compared unboxed."""
+    intlist = w_list.getitems_int()
+    if intlist is not None:
+        return sorted_column_order(IntColumnSort, None, intlist, reverse)
+    floatlist = w_list.getitems_float()
+    if floatlist is not None:
+        return sorted_column_order(FloatColumnSort, None, floatlist, reverse)
+    byteslist = w_list.getitems_bytes()
+    if byteslist is not None:
+        return sorted_column_order(BytesColumnSort, None, byteslist, reverse)
+    return sorted_column_order(ObjectColumnSort, space, w_list.getitems(),
+                               reverse)
+
+
 class CustomCompareSort(SimpleSort):
     def lt(self, a, b):
         space = self.space
@@ -2435,3 +3370,112 @@ list(iterable) -> new list initialized from iterable's items""",
     remove = interp2app(W_ListObject.descr_remove),
 )
 W_ListObject.typedef.flag_sequence_bug_compat = True
+
+
+# ____________________________________________________________
+# reductions used by sum(), min(), max(), any() and all().  They work on
+# items[start:stop], so that slices sharing their storage need no copy.
+
+def sum_int_items(space, intlist, start, stop, w_start):
+    if start >= stop:
+        return w_start      # like sum([], start), even for a float start
+    if type(w_start) is W_FloatObject:
+        floatval = w_start.floatval
+        for i in range(start, stop):
+            floatval += float(intlist[i])
+        return space.newfloat(floatval)
+    if type(w_start) is not W_IntObject:
+        return None
+    total = w_start.intval
+    i = start
+    try:
+        while i < stop:
+            total = ovfcheck(total + intlist[i])
+            i += 1
+    except OverflowError:
+        # like int addition, go on with longs from here
+        bigtotal = rbigint.fromint(total)
+        while i < stop:
+            bigtotal = bigtotal.int_add(intlist[i])
+            i += 1
+        return space.newlong_from_rbigint(bigtotal)
+    return space.newint(total)
+
+def sum_float_items(space, floatlist, start, stop, w_start):
+    if start >= stop:
+        return w_start      # not 0.0: an emptied float list sums to start
+    if type(w_start) is W_FloatObject:
+        total = w_start.floatval
+    elif type(w_start) is W_IntObject:
+        total = float(w_start.intval)
+    else:
+        return None
+    for i in range(start, stop):
+        total += floatlist[i]
+    return space.newfloat(total)
+
+def _range_partial_sum(total, start, step, k):
+    """Return total plus the sum of the first k items of the range, as an
+    rbigint."""
+    bigk = rbigint.fromint(k)
+    # 0 + 1 + ... + (k - 1), times step
+    steps = bigk.int_mul(k - 1).rshift(1).int_mul(step)
+    return bigk.int_mul(start).add(steps).int_add(total)
+
+def sum_int_range(space, total, start, step, length):
+    """Return total + sum(range) where the range has the given start, step
+    and length.  Like a loop of int additions, the result is a long if any
+    of the partial sums does not fit in an int."""
+    bigresult = _range_partial_sum(total, start, step, length)
+    # The partial sums decrease as long as the items are negative, then
+    # increase (or the other way around if step < 0).  They are all
+    # between 'total' and the last one, except possibly the one after the
+    # last item of the initial run of items of the same sign.
+    if step > 0:
+        if start >= 0:
+            run = 0
+        else:
+            run = (-(start + 1)) // step + 1
+    else:
+        if start <= 0:
+            run = 0
+        elif step == -sys.maxint - 1:
+            run = 1
+        else:
+            run = (start - 1) // (-step) + 1
+    try:
+        result = bigresult.toint()
+        if 0 < run < length:
+            _range_partial_sum(total, start, step, run).toint()
+    except OverflowError:
+        return space.newlong_from_rbigint(bigresult)
+    return space.newint(result)
+
+def min_max_int_items(intlist, start, stop, is_max):
+    result = intlist[start]
+    for i in range(start + 1, stop):
+        x = intlist[i]
+        if (x > result) if is_max else (x < result):
+            result = x
+    return result
+
+def min_max_float_items(floatlist, start, stop, is_max):
+    # same comparisons as min_max_sequence(), for the same result with nans
+    result = floatlist[start]
+    for i in range(start + 1, stop):
+        x = floatlist[i]
+        if (x > result) if is_max else (x < result):
+            result = x
+    return result
+
+def any_all_int_items(intlist, start, stop, is_any):
+    for i in range(start, stop):
+        if (intlist[i] != 0) == is_any:
+            return is_any
+    return not is_any
+
+def any_all_float_items(floatlist, start, stop, is_any):
+    for i in range(start, stop):
+        if (floatlist[i] != 0.0) == is_any:
+            return is_any
+    return not is_any
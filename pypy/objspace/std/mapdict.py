@@ -1,10 +1,11 @@
 import weakref, sys
 
 from rpython.rlib import jit, objectmodel, debug, rerased
-from rpython.rlib.rarithmetic import intmask, r_uint, LONG_BIT
+from rpython.rlib.rarithmetic import intmask, r_uint, r_longlong, LONG_BIT
 from rpython.rlib.longlong2float import longlong2float, float2longlong
 
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.module import Module
 from pypy.interpreter.typedef import _share_methods
 from pypy.objspace.std.dictmultiobject import (
     W_DictMultiObject, DictStrategy, ObjectDictStrategy, BaseKeyIterator,
@@ -22,6 +23,21 @@ erase_unboxed, unerase_unboxed = rerased.new_erasing_pair("mapdict unwrapped sto
 
 ALLOW_UNBOXING_INTS = LONG_BIT == 64
 
+# the kinds of values an UnboxedPlainAttribute stores.  0 means boxed
+UNBOXED_INT = 1
+UNBOXED_FLOAT = 2
+UNBOXED_BOOL = 3
+UNBOXED_NUMBER = 4    # any of the above, tagged with its kind
+
+def unbox_type_of(space, w_value):
+    if ALLOW_UNBOXING_INTS and type(w_value) is space.IntObjectCls:
+        return UNBOXED_INT
+    elif type(w_value) is space.FloatObjectCls:
+        return UNBOXED_FLOAT
+    elif type(w_value) is space.BoolObjectCls:
+        return UNBOXED_BOOL
+    return 0
+
 # ____________________________________________________________
 # attribute shapes
 
@@ -34,10 +50,18 @@ NUM_DIGITS_POW2 = 1 << NUM_DIGITS
 # dict)
 LIMIT_MAP_ATTRIBUTES = 80
 
+# the size estimates of maps are fixed-point numbers with this many bits
+# after the point; they decrease by 1/2**SIZE_ESTIMATE_DECAY of the
+# difference at a time
+SIZE_ESTIMATE_SHIFT = 4
+SIZE_ESTIMATE_SCALE = 1 << SIZE_ESTIMATE_SHIFT
+SIZE_ESTIMATE_DECAY = 4
+
 
 class AbstractAttribute(object):
     _immutable_fields_ = ['terminator']
     cache_attrs = None
+    _size_estimate = 0
 
     def __init__(self, space, terminator):
         self.space = space
@@ -135,6 +159,21 @@ class AbstractAttribute(object):
     def search(self, attrtype):
         return None
 
+    def size_estimate(self):
+        """ the storage size that objects reaching this map end up needing,
+        learned from the maps they move on to """
+        return self._size_estimate >> SIZE_ESTIMATE_SHIFT
+
+    def storage_size_to_allocate(self):
+        """ the storage size to allocate when the storage of an object
+        grows to reach this map.  Only the interpreter overallocates: the
+        estimate changes all the time, so in JITted code the size would not
+        be a constant and the storage of new objects could not be virtual """
+        storage_needed = self.storage_needed()
+        if jit.we_are_jitted():
+            return storage_needed
+        return max(storage_needed, self.size_estimate())
+
     @jit.elidable
     def _get_new_attr(self, name, attrkind, unbox_type):
         cache = self.cache_attrs
@@ -147,8 +186,17 @@ class AbstractAttribute(object):
         return holder
 
     def add_attr(self, obj, name, attrkind, w_value):
-        space = self.space
         self._reorder_and_add(obj, name, attrkind, w_value)
+        if not jit.we_are_jitted():
+            # move the estimate towards the one of the map the object moved
+            # on to: quickly if it is larger, slowly if it is smaller, as
+            # overallocating a bit is cheaper than reallocating the storage
+            attr = obj._get_mapdict_map()
+            diff = attr._size_estimate - self._size_estimate
+            if diff > 0:
+                self._size_estimate += (diff + 1) >> 1
+            else:
+                self._size_estimate += diff >> SIZE_ESTIMATE_DECAY
 
     @jit.elidable
     def _find_branch_to_move_into(self, name, attrkind, unbox_type):
@@ -203,12 +251,9 @@ class AbstractAttribute(object):
         stack_index = 0
         while True:
             current = self
-            unbox_type = None
+            unbox_type = 0
             if self.terminator.allow_unboxing:
-                if ALLOW_UNBOXING_INTS and type(w_value) is self.space.IntObjectCls:
-                    unbox_type = self.space.IntObjectCls
-                elif type(w_value) is self.space.FloatObjectCls:
-                    unbox_type = self.space.FloatObjectCls
+                unbox_type = unbox_type_of(self.space, w_value)
             number_to_readd, holder = self._find_branch_to_move_into(name, attrkind, unbox_type)
             attr = holder.pick_attr(unbox_type)
             # we found the attributes further up, need to save the
@@ -254,12 +299,15 @@ class AbstractAttribute(object):
 
 
 class Terminator(AbstractAttribute):
-    _immutable_fields_ = ['w_cls', 'allow_unboxing?']
+    _immutable_fields_ = ['w_cls', 'allow_unboxing?', 'inline_unboxed']
 
     def __init__(self, space, w_cls):
         AbstractAttribute.__init__(self, space, self)
         self.w_cls = w_cls
         self.allow_unboxing = True
+        # number of unboxed values that the instances store in raw fields
+        # of their own instead of a list, see _make_storage_mixin_size_n
+        self.inline_unboxed = 0
 
     def _read_terminator(self, obj, name, attrkind):
         return None
@@ -299,11 +347,30 @@ class Terminator(AbstractAttribute):
     def repr(self):
         return "<%s w_cls=%s>" % (self.__class__.__name__, self.w_cls)
 
+    def tree_stats(self):
+        """ return (number of maps, depth, largest fan-out) of the tree of
+        maps below this terminator """
+        num_maps = 1
+        depth = 0
+        fanout = 0
+        pending = [self]
+        while pending:
+            map = pending.pop()
+            depth = max(depth, map.num_attributes())
+            if map.cache_attrs is None:
+                continue
+            fanout = max(fanout, len(map.cache_attrs))
+            for holder in map.cache_attrs.itervalues():
+                num_maps += 1
+                pending.append(holder.attr)
+        return num_maps, depth, fanout
+
 class DictTerminator(Terminator):
     _immutable_fields_ = ['devolved_dict_terminator']
     def __init__(self, space, w_cls):
         Terminator.__init__(self, space, w_cls)
         self.devolved_dict_terminator = DevolvedDictTerminator(space, w_cls)
+        self.num_devolved = 0
 
     def materialize_r_dict(self, space, obj, dict_w):
         return self._make_devolved(space)
@@ -312,6 +379,7 @@ class DictTerminator(Terminator):
         return self._make_devolved(space)
 
     def _make_devolved(self, space):
+        self.num_devolved += 1
         result = Object()
         result.space = space
         result._mapdict_init_empty(self.devolved_dict_terminator)
@@ -375,6 +443,7 @@ class PlainAttribute(AbstractAttribute):
         self.back = back
         self.ever_mutated = False
         self.order = order
+        self._size_estimate = self.storage_needed() * SIZE_ESTIMATE_SCALE
 
     def _copy_attr(self, obj, new_obj):
         w_value = self._prim_direct_read(obj)
@@ -465,7 +534,8 @@ class PlainAttribute(AbstractAttribute):
 
 
 class UnboxedPlainAttribute(PlainAttribute):
-    _immutable_fields_ = ["listindex", "firstunwrapped", "typ"]
+    _immutable_fields_ = ["listindex", "valueindex", "firstunwrapped", "typ",
+                          "valid?"]
     def __init__(self, name, attrkind, back, order, typ):
         AbstractAttribute.__init__(self, back.space, back.terminator)
         # don't call PlainAttribute.__init__, that runs into weird problems
@@ -474,116 +544,203 @@ class UnboxedPlainAttribute(PlainAttribute):
         self.back = back
         self.ever_mutated = False
         self.order = order
-        # here, storageindex is where the list of floats is stored
-        # and listindex is where in the list the actual value goes
+        # listindex is the position of the value among the unboxed values
+        # of the object.  attributes of kind UNBOXED_NUMBER use two
+        # positions: the kind of the current value, followed by the value
+        # itself at valueindex.  the first terminator.inline_unboxed
+        # positions are stored in raw fields of the object, the others in a
+        # list that is stored at storageindex
+        self.typ = typ
         self.firstunwrapped = False
+        self.valid = True
         self._compute_storageindex_listindex()
         self._num_attributes = back.num_attributes() + 1
-        self.typ = typ
+        self._size_estimate = self.storage_needed() * SIZE_ESTIMATE_SCALE
 
     def _compute_storageindex_listindex(self):
         attr = self.back
         storageindex = -1
+        listindex = 0
         while isinstance(attr, PlainAttribute):
             if isinstance(attr, UnboxedPlainAttribute):
                 storageindex = attr.storageindex
-                listindex = attr.listindex + 1
+                listindex = attr.valueindex + 1
+                # maps added below an invalidated map are stale as well
+                self.valid = attr.valid
                 break
             attr = attr.back
+        self.listindex = listindex
+        if self.typ == UNBOXED_NUMBER:
+            self.valueindex = listindex + 1
         else:
+            self.valueindex = listindex
+        if storageindex < 0 and self.valueindex >= self.terminator.inline_unboxed:
+            # the first value that does not fit into the raw fields
             storageindex = self.back.storage_needed()
-            listindex = 0
             self.firstunwrapped = True
         self.storageindex = storageindex
-        self.listindex = listindex
+
+    def _read_entry(self, obj, index):
+        inline_unboxed = self.terminator.inline_unboxed
+        if index < inline_unboxed:
+            return obj._mapdict_read_unboxed(index)
+        unboxed = unerase_unboxed(obj._mapdict_read_storage(self.storageindex))
+        return unboxed[index - inline_unboxed]
+
+    def _write_entry(self, obj, index, value):
+        inline_unboxed = self.terminator.inline_unboxed
+        if index < inline_unboxed:
+            obj._mapdict_write_unboxed(index, value)
+            return
+        unboxed = unerase_unboxed(obj._mapdict_read_storage(self.storageindex))
+        unboxed[index - inline_unboxed] = value
 
     def storage_needed(self):
         if self.firstunwrapped:
             return self.storageindex + 1
         return self.back.storage_needed()
 
+    def _accepts(self, unbox_type):
+        if self.typ == UNBOXED_NUMBER:
+            return unbox_type != 0
+        return unbox_type == self.typ
 
     def _unbox(self, w_value):
         space = self.space
-        assert type(w_value) is self.typ
         if type(w_value) is space.IntObjectCls:
             return space.int_w(w_value)
+        elif type(w_value) is space.BoolObjectCls:
+            if space.is_true(w_value):
+                return r_longlong(1)
+            return r_longlong(0)
         else:
+            assert type(w_value) is space.FloatObjectCls
             return float2longlong(space.float_w(w_value))
 
-    def _box(self, val):
+    def _box(self, kind, val):
         space = self.space
-        if self.typ is space.IntObjectCls:
+        if kind == UNBOXED_INT:
             return space.newint(val)
+        elif kind == UNBOXED_BOOL:
+            return space.newbool(val != 0)
         else:
             return space.newfloat(longlong2float(val))
 
-    def _convert_to_boxed(self, obj):
+    def _write_unboxed(self, obj, w_value):
+        if self.typ == UNBOXED_NUMBER:
+            kind = unbox_type_of(self.space, w_value)
+            self._write_entry(obj, self.listindex, r_longlong(kind))
+        self._write_entry(obj, self.valueindex, self._unbox(w_value))
+
+    def _read_kind(self, obj):
+        if self.typ == UNBOXED_NUMBER:
+            return int(self._read_entry(obj, self.listindex))
+        return self.typ
+
+    def _convert_to_current_maps(self, obj):
         new_obj = obj._get_mapdict_map().copy(obj)
-        map = new_obj.map
-        obj._set_mapdict_storage_and_map(new_obj.storage, map)
-        return map
+        _switch_storage(obj, new_obj)
+        return new_obj.map
+
+    def _invalidate(self):
+        # called when the holder of this map switched to a more general
+        # layout.  mark this map and all unboxed maps below it as stale, so
+        # that the objects still using them move over to the current maps
+        # the next time they are read
+        if not self.valid:
+            return
+        self.valid = False
+        todo = [self]
+        while todo:
+            attr = todo.pop()
+            if attr.cache_attrs is None:
+                continue
+            for holder in attr.cache_attrs.values():
+                child = holder.attr
+                if isinstance(child, UnboxedPlainAttribute):
+                    child.valid = False
+                todo.append(child)
+
+    def _generalize(self, unbox_type):
+        # a value of a type that this map cannot store was written: update
+        # the type feedback of the holder this map came from
+        cache = self.back.cache_attrs
+        if cache is not None:
+            holder = cache.get((self.name, self.attrkind), None)
+            if holder is not None:
+                holder.pick_attr(unbox_type)
+        self._invalidate()
 
     def _direct_read(self, obj):
         w_res = self._prim_direct_read(obj)
-        if self.terminator.allow_unboxing == False:
-            # oops, some other object using the same class isn't type stable!
-            # stop using unboxing altogether to not get too many variants of maps
-            self._convert_to_boxed(obj)
+        if not self.valid:
+            # oops, some other object with this map wasn't type stable and
+            # the holder moved on to a more general layout.  follow it, to
+            # not get too many variants of maps
+            self._convert_to_current_maps(obj)
         return w_res
 
     def _prim_direct_read(self, obj):
-        return self._box(unerase_unboxed(obj._mapdict_read_storage(self.storageindex))[self.listindex])
+        return self._box(self._read_kind(obj),
+                         self._read_entry(obj, self.valueindex))
 
     def _pure_direct_read(self, obj):
         # somewhat tricky! note that _direct_read isn't really elidable (it has
         # potential side effects, and the boxes aren't always the same)
         # but _pure_unboxed_read is elidable, and we can let the jit see the
         # boxing
-        return self._box(self._pure_unboxed_read(obj))
+        if self.typ == UNBOXED_NUMBER:
+            kind = int(self._pure_unboxed_read_kind(obj))
+        else:
+            kind = self.typ
+        return self._box(kind, self._pure_unboxed_read(obj))
 
     @jit.elidable
     def _pure_unboxed_read(self, obj):
-        return unerase_unboxed(obj._mapdict_read_storage(self.storageindex))[self.listindex]
+        return self._read_entry(obj, self.valueindex)
+
+    @jit.elidable
+    def _pure_unboxed_read_kind(self, obj):
+        return self._read_entry(obj, self.listindex)
 
     def _direct_write(self, obj, w_value):
-        if type(w_value) is self.typ:
-            val = self._unbox(w_value)
-            unboxed = unerase_unboxed(obj._mapdict_read_storage(self.storageindex))
-            unboxed[self.listindex] = val
+        unbox_type = unbox_type_of(self.space, w_value)
+        if self._accepts(unbox_type):
+            self._write_unboxed(obj, w_value)
             return
-        # type change not supposed to happen. according to the principle
-        # of type freezing, we just give up, and will never unbox anything
-        # from that class again
-        self.terminator.allow_unboxing = False
-        map = self._convert_to_boxed(obj)
-        # now obj won't have any UnboxedPlainAttribute in its chain any
-        # more, because allow_unboxing is False
+        # type change. instead of giving up on unboxing for the whole class,
+        # only this attribute moves on to a more general layout: from a
+        # single type to a tagged number, and from there to boxed W_Roots
+        self._generalize(unbox_type)
+        map = self._convert_to_current_maps(obj)
         map.write(obj, self.name, self.attrkind, w_value)
 
     def _switch_map_and_write_storage(self, obj, w_value):
         from rpython.rlib.debug import make_sure_not_resized
-        val = self._unbox(w_value)
+        # the length of the list that the values up to this one need
+        length = self.valueindex + 1 - self.terminator.inline_unboxed
         if self.firstunwrapped:
-            unboxed = erase_unboxed(make_sure_not_resized([val]))
+            unboxed = erase_unboxed(make_sure_not_resized(
+                [r_longlong(0)] * length))
             if self.storage_needed() > obj._mapdict_storage_length():
                 obj._set_mapdict_increase_storage(self, unboxed)
-                return
-
+            else:
+                obj._set_mapdict_map(self)
+                obj._mapdict_write_storage(self.storageindex, unboxed)
+        elif self.storageindex < 0:
+            # all the values so far are stored in raw fields
             obj._set_mapdict_map(self)
-            obj._mapdict_write_storage(self.storageindex, unboxed)
         else:
             unboxed = unerase_unboxed(obj._mapdict_read_storage(self.storageindex))
 
             obj._set_mapdict_map(self)
-            if len(unboxed) <= self.listindex:
-                # size can only increase by 1
-                assert len(unboxed) == self.listindex
-                unboxed = unboxed + [val]
+            if len(unboxed) < length:
+                # size can only increase by the entries of one attribute,
+                # otherwise the unboxed list is already large enough, due
+                # to reordering
+                unboxed = unboxed + [r_longlong(0)] * (length - len(unboxed))
                 obj._mapdict_write_storage(self.storageindex, erase_unboxed(unboxed))
-            else:
-                # the unboxed list is already large enough, due to reordering
-                unboxed[self.listindex] = val
+        self._write_unboxed(obj, w_value)
 
     def repr(self):
         return "<UnboxedPlainAttribute %s %s %s %s%s %s>" % (
@@ -598,7 +755,7 @@ class CachedAttributeHolder(object):
 
     def __init__(self, name, attrkind, back, unbox_type):
         self.order = len(back.cache_attrs) if back.cache_attrs else 0
-        if unbox_type is None:
+        if unbox_type == 0:
             attr = PlainAttribute(name, attrkind, back, self.order)
         else:
             attr = UnboxedPlainAttribute(name, attrkind, back, self.order, unbox_type)
@@ -606,16 +763,32 @@ class CachedAttributeHolder(object):
         self.typ = unbox_type
 
     def pick_attr(self, unbox_type):
-        if self.typ is None or self.typ is unbox_type:
+        typ = self.typ
+        if typ == 0 or typ == unbox_type:
+            return self.attr
+        if typ == UNBOXED_NUMBER and unbox_type != 0:
             return self.attr
-        self.typ = None
-        # this will never be traced, because the previous assignment
-        # invalidates a quasi-immutable field
-        self.attr.terminator.allow_unboxing = False
-        name = self.attr.name
-        attrkind = self.attr.attrkind
-        back = self.attr.back
-        attr = self.attr = PlainAttribute(name, attrkind, back, self.order)
+        # this will never be traced, because the following assignments
+        # invalidate quasi-immutable fields.
+        # the type feedback only ever gets more general: a single type, then
+        # a tagged number, then boxed W_Roots.  this bounds the number of map
+        # variants a class can get
+        if unbox_type != 0:
+            typ = UNBOXED_NUMBER
+        else:
+            typ = 0
+        old_attr = self.attr
+        assert isinstance(old_attr, UnboxedPlainAttribute)
+        name = old_attr.name
+        attrkind = old_attr.attrkind
+        back = old_attr.back
+        if typ == 0:
+            attr = PlainAttribute(name, attrkind, back, self.order)
+        else:
+            attr = UnboxedPlainAttribute(name, attrkind, back, self.order, typ)
+        self.attr = attr
+        self.typ = typ
+        old_attr._invalidate()
         return attr
 
 
@@ -681,7 +854,7 @@ class BaseUserClassMapdict:
 
     def setclass(self, space, w_cls):
         new_obj = self._get_mapdict_map().set_terminator(self, w_cls.terminator)
-        self._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+        _switch_storage(self, new_obj)
 
     def user_setup(self, space, w_subtype):
         from pypy.module.__builtin__.interp_classobj import W_InstanceObject
@@ -706,7 +879,7 @@ class BaseUserClassMapdict:
         new_obj = self._get_mapdict_map().delete(self, "slot", attrkind)
         if new_obj is None:
             return False
-        self._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+        _switch_storage(self, new_obj)
         return True
 
 
@@ -747,7 +920,7 @@ class MapdictDictSupport(object):
         new_obj = self._get_mapdict_map().delete(self, attrname, DICT)
         if new_obj is None:
             return False
-        self._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+        _switch_storage(self, new_obj)
         return True
 
     def getdict(self, space):
@@ -821,7 +994,8 @@ class MapdictStorageMixin(object):
     def _set_mapdict_increase_storage(self, map, value):
         """ increase storage size, adding value """
         len_storage = len(self.storage)
-        new_storage = self.storage + [erase_item(None)] * (map.storage_needed() - len_storage)
+        new_size = map.storage_size_to_allocate()
+        new_storage = self.storage + [erase_item(None)] * (new_size - len_storage)
         new_storage[len_storage] = value
         self._set_mapdict_map(map)
         self.storage = new_storage
@@ -848,6 +1022,19 @@ class Object(W_Root):
     # instance dictionaries
     objectmodel.import_from_mixin(MapdictStorageMixin)
 
+    # the values that a real instance stores in raw fields, when Object is
+    # used to build up the new storage for it, see _switch_storage
+    inline_unboxed = None
+
+    def _mapdict_read_unboxed(self, index):
+        return self.inline_unboxed[index]
+
+    def _mapdict_write_unboxed(self, index, value):
+        if self.inline_unboxed is None:
+            size = self._get_mapdict_map().terminator.inline_unboxed
+            self.inline_unboxed = [r_longlong(0)] * size
+        self.inline_unboxed[index] = value
+
 _share_methods(BaseUserClassMapdict, Object)
 _share_methods(MapdictWeakrefSupport, Object)
 _share_methods(MapdictDictSupport, Object)
@@ -857,12 +1044,21 @@ assert Object.getclass.im_func is BaseUserClassMapdict.getclass.im_func
 
 SUBCLASSES_NUM_FIELDS = 5
 
-def _make_storage_mixin_size_n(n=SUBCLASSES_NUM_FIELDS):
+# the layout of instances of classes with __slots__ and without a __dict__:
+# a few unboxed ints, floats and bools are stored in raw fields of the
+# instance itself, instead of a separately allocated list
+SLOTS_SUBCLASSES_NUM_FIELDS = 4
+SLOTS_SUBCLASSES_NUM_UNBOXED = 4
+
+def _make_storage_mixin_size_n(n=SUBCLASSES_NUM_FIELDS, nunboxed=0):
     from rpython.rlib import unroll
     rangen = unroll.unrolling_iterable(range(n))
     nmin1 = n - 1
     rangenmin1 = unroll.unrolling_iterable(range(nmin1))
     valnmin1 = "_value%s" % nmin1
+    rangeunboxed = unroll.unrolling_iterable(range(nunboxed))
+    rangeunboxedmin1 = unroll.unrolling_iterable(range(nunboxed - 1))
+    unboxednmin1 = "_unboxed%s" % (nunboxed - 1)
     class subcls(object):
         def _get_mapdict_map(self):
             return jit.promote(self.map)
@@ -876,6 +1072,8 @@ def _make_storage_mixin_size_n(n=SUBCLASSES_NUM_FIELDS):
             self.map = map
             for i in rangen:
                 setattr(self, "_value%s" % i, erase_item(None))
+            for i in rangeunboxed:
+                setattr(self, "_unboxed%s" % i, r_longlong(0))
 
         def _has_storage_list(self):
             return self.map.storage_needed() > n
@@ -942,18 +1140,44 @@ def _make_storage_mixin_size_n(n=SUBCLASSES_NUM_FIELDS):
 
         def _set_mapdict_increase_storage(self, map, value):
             storage_needed = map.storage_needed()
+            # overallocate up to the size that objects reaching 'map'
+            # are expected to end up with
+            new_size = map.storage_size_to_allocate()
             if self.map.storage_needed() == n:
                 erased = getattr(self, "_value%s" % nmin1)
                 new_storage = [erased, value]
+                if new_size > n + 1:
+                    new_storage = new_storage + (
+                        [erase_item(None)] * (new_size - n - 1))
             else:
-                new_storage = [erase_item(None)] * (storage_needed - self._mapdict_storage_length())
+                new_storage = [erase_item(None)] * (new_size - self._mapdict_storage_length())
                 new_storage = self._mapdict_get_storage_list() + new_storage
                 new_storage[storage_needed - n] = value
             self._set_mapdict_map(map)
             erased = erase_list(new_storage)
             setattr(self, "_value%s" % nmin1, erased)
 
-    subcls.__name__ = "Size%s" % n
+    if nunboxed:
+        def _mapdict_read_unboxed(self, index):
+            for i in rangeunboxedmin1:
+                if index == i:
+                    return getattr(self, "_unboxed%s" % i)
+            assert index == nunboxed - 1
+            return getattr(self, unboxednmin1)
+
+        def _mapdict_write_unboxed(self, index, value):
+            for i in rangeunboxedmin1:
+                if index == i:
+                    setattr(self, "_unboxed%s" % i, value)
+                    return
+            assert index == nunboxed - 1
+            setattr(self, unboxednmin1, value)
+
+        subcls._mapdict_read_unboxed = _mapdict_read_unboxed
+        subcls._mapdict_write_unboxed = _mapdict_write_unboxed
+        subcls.__name__ = "Size%sUnboxed%s" % (n, nunboxed)
+    else:
+        subcls.__name__ = "Size%s" % n
     return subcls
 
 # ____________________________________________________________
@@ -1064,7 +1288,7 @@ class MapDictStrategy(DictStrategy):
     def clear(self, w_dict):
         w_obj = self.unerase(w_dict.dstorage)
         new_obj = w_obj._get_mapdict_map().remove_dict_entries(w_obj)
-        w_obj._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+        _switch_storage(w_obj, new_obj)
 
     def popitem(self, w_dict):
         curr = self.unerase(w_dict.dstorage)._get_mapdict_map().search(DICT)
@@ -1110,15 +1334,23 @@ def make_instance_dict(space):
     w_fake_object._mapdict_init_empty(terminator)
     return w_fake_object.getdict(space)
 
+def _switch_storage(obj, new_obj):
+    # make obj use the storage and the map that were built up in new_obj
+    obj._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+    inline_unboxed = new_obj.inline_unboxed
+    if inline_unboxed is not None:
+        for i in range(len(inline_unboxed)):
+            obj._mapdict_write_unboxed(i, inline_unboxed[i])
+
 def materialize_r_dict(space, obj, dict_w):
     map = obj._get_mapdict_map()
     new_obj = map.materialize_r_dict(space, obj, dict_w)
-    obj._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+    _switch_storage(obj, new_obj)
 
 def materialize_str_dict(space, obj, dict_w):
     map = obj._get_mapdict_map()
     new_obj = map.materialize_str_dict(space, obj, dict_w)
-    obj._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+    _switch_storage(obj, new_obj)
 
 
 class IteratorMixin(object):
@@ -1305,6 +1537,15 @@ def LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map):
                     # map.find_map_attr will always return None if attrkind==DICT.
                     _fill_cache(pycode, nameindex, map, version_tag, attr)
                     return attr._direct_read(w_obj)
+    elif isinstance(w_obj, Module):
+        from pypy.objspace.std.celldict import (LOAD_ATTR_module_cached,
+            LOAD_ATTR_module_fill_cache)
+        w_value = LOAD_ATTR_module_cached(pycode, w_obj, nameindex)
+        if w_value is not None:
+            return w_value
+        w_value = space.getattr(w_obj, w_name)
+        LOAD_ATTR_module_fill_cache(pycode, w_obj, nameindex)
+        return w_value
     if space.config.objspace.std.withmethodcachecounter:
         INVALID_CACHE_ENTRY.failure_counter += 1
     return space.getattr(w_obj, w_name)
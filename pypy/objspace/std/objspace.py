@@ -2,7 +2,8 @@ import __builtin__
 from pypy.interpreter import special
 from pypy.interpreter.baseobjspace import ObjSpace, W_Root
 from pypy.interpreter.error import OperationError, oefmt
-from pypy.interpreter.typedef import get_unique_interplevel_subclass
+from pypy.interpreter.typedef import (
+    get_unique_interplevel_subclass, get_compact_slots_subclass)
 from pypy.objspace.descroperation import DescrOperation, raiseattrerror
 from pypy.objspace.std import frame, transparent, callmethod
 from rpython.rlib.objectmodel import instantiate, specialize, is_annotation_constant
@@ -53,6 +54,7 @@ class StdObjSpace(ObjSpace):
         self.UnicodeObjectCls = W_UnicodeObject
         self.IntObjectCls = W_IntObject
         self.FloatObjectCls = W_FloatObject
+        self.BoolObjectCls = W_BoolObject
 
         # singletons
         self.w_None = W_NoneObject.w_None
@@ -435,7 +437,11 @@ class StdObjSpace(ObjSpace):
             if cls.typedef.applevel_subclasses_base is not None:
                 cls = cls.typedef.applevel_subclasses_base
             #
-            subcls = get_unique_interplevel_subclass(self, cls)
+            if (cls is W_ObjectObject and
+                    w_subtype.terminator.inline_unboxed):
+                subcls = get_compact_slots_subclass(self, cls)
+            else:
+                subcls = get_unique_interplevel_subclass(self, cls)
             instance = instantiate(subcls)
             assert isinstance(instance, cls)
             instance.user_setup(self, w_subtype)
@@ -562,8 +568,10 @@ class StdObjSpace(ObjSpace):
     def listview_float(self, w_obj):
         if type(w_obj) is W_ListObject:
             return w_obj.getitems_float()
-        # dict and set don't have FloatStrategy, so we can just ignore them
-        # for now
+        if type(w_obj) is W_DictObject:
+            return w_obj.listview_float()
+        if type(w_obj) is W_SetObject or type(w_obj) is W_FrozensetObject:
+            return w_obj.listview_float()
         if isinstance(w_obj, W_ListObject) and self._uses_list_iter(w_obj):
             return w_obj.getitems_float()
         return None
@@ -4,7 +4,9 @@ from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.objspace.std.bytesobject import W_BytesObject
-from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.floatobject import W_FloatObject, _hash_float
+from pypy.objspace.std.intobject import W_IntObject, _hash_int
+from pypy.objspace.std.strbufobject import unwrap_strbuf
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
 
@@ -12,7 +14,7 @@ from rpython.rlib.objectmodel import r_dict
 from rpython.rlib.objectmodel import iterkeys_with_hash, contains_with_hash
 from rpython.rlib.objectmodel import setitem_with_hash, delitem_with_hash
 from rpython.rlib.rarithmetic import intmask, r_uint
-from rpython.rlib import rerased, jit, rutf8
+from rpython.rlib import rerased, jit, rutf8, longlong2float
 
 
 UNROLL_CUTOFF = 5
@@ -94,6 +96,10 @@ class W_BaseSetObject(W_Root):
         """ If this is an int set return its contents as a list of uwnrapped ints. Otherwise return None. """
         return self.strategy.listview_int(self)
 
+    def listview_float(self):
+        """ If this is a float set return its contents as a list of uwnrapped floats. Otherwise return None. """
+        return self.strategy.listview_float(self)
+
     def get_storage_copy(self):
         """ Returns a copy of the storage. Needed when we want to clone all elements from one set and
         put them into another. """
@@ -730,6 +736,9 @@ class SetStrategy(object):
     def listview_int(self, w_set):
         return None
 
+    def listview_float(self, w_set):
+        return None
+
     #def erase(self, storage):
     #    raise NotImplementedError
 
@@ -825,8 +834,12 @@ class EmptySetStrategy(SetStrategy):
         return clone
 
     def add(self, w_set, w_key):
+        if self.space.config.objspace.std.withstrbuf:
+            w_key = unwrap_strbuf(w_key)
         if type(w_key) is W_IntObject:
             strategy = self.space.fromcache(IntegerSetStrategy)
+        elif type(w_key) is W_FloatObject:
+            strategy = self.space.fromcache(FloatSetStrategy)
         elif type(w_key) is W_BytesObject:
             strategy = self.space.fromcache(BytesSetStrategy)
         elif type(w_key) is W_UnicodeObject and w_key.is_ascii():
@@ -1273,11 +1286,17 @@ class BytesSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
         return self.unerase(w_set.sstorage).keys()
 
     def is_correct_type(self, w_key):
+        if self.space.config.objspace.std.withstrbuf:
+            w_key = unwrap_strbuf(w_key)
         return type(w_key) is W_BytesObject
 
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IntOrFloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1317,6 +1336,10 @@ class AsciiSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IntOrFloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1373,6 +1396,274 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def iter(self, w_set):
         return IntegerIteratorImplementation(self.space, self, w_set)
 
+    def add(self, w_set, w_key):
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_set.sstorage)
+            d[self.unwrap(w_key)] = None
+        else:
+            _switch_to_int_or_float_or_object(self.space, w_set, w_key)
+            w_set.add(w_key)
+
+    def update(self, w_set, w_other):
+        if self is w_other.strategy:
+            d_set = self.unerase(w_set.sstorage)
+            d_set.update(self.unerase(w_other.sstorage))
+            return
+        if w_other.length() == 0:
+            return
+        _switch_for_numeric_update(self.space, w_set, w_other)
+        w_set.update(w_other)
+
+
+# ints in this range are converted to floats exactly
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
+def _float_key_eq(f1, f2):
+    # equal floats are the same key, and so are identical floats (which
+    # on PyPy means floats with the same bit pattern, e.g. the same NaN)
+    return (f1 == f2 or
+            longlong2float.float2longlong(f1) ==
+            longlong2float.float2longlong(f2))
+
+
+class FloatSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(float).intersect')
+
+    def get_empty_storage(self):
+        return self.erase(self.get_empty_dict())
+
+    def get_empty_dict(self):
+        return r_dict(_float_key_eq, self._key_hash, simple_hash_eq=True)
+
+    def _key_hash(self, floatval):
+        return _hash_float(self.space, floatval)
+
+    def listview_float(self, w_set):
+        return self.unerase(w_set.sstorage).keys()
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_FloatObject
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(AsciiSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def unwrap(self, w_item):
+        return self.space.float_w(w_item)
+
+    def wrap(self, item):
+        return self.space.newfloat(item)
+
+    def iter(self, w_set):
+        return FloatIteratorImplementation(self.space, self, w_set)
+
+    def has_key(self, w_set, w_key):
+        space = self.space
+        d = self.unerase(w_set.sstorage)
+        if type(w_key) is W_FloatObject:
+            return space.float_w(w_key) in d
+        if type(w_key) is W_IntObject:
+            intval = space.int_w(w_key)
+            if -MAX_EXACT_FLOAT_INT <= intval <= MAX_EXACT_FLOAT_INT:
+                return float(intval) in d
+        if space.config.objspace.std.withstrbuf:
+            w_key = unwrap_strbuf(w_key)
+        if type(w_key) is W_BytesObject or type(w_key) is W_UnicodeObject:
+            return False
+        w_set.switch_to_object_strategy(space)
+        return w_set.has_key(w_key)
+
+    def add(self, w_set, w_key):
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_set.sstorage)
+            d[self.unwrap(w_key)] = None
+        else:
+            _switch_to_int_or_float_or_object(self.space, w_set, w_key)
+            w_set.add(w_key)
+
+    def update(self, w_set, w_other):
+        if self is w_other.strategy:
+            d_set = self.unerase(w_set.sstorage)
+            d_set.update(self.unerase(w_other.sstorage))
+            return
+        if w_other.length() == 0:
+            return
+        _switch_for_numeric_update(self.space, w_set, w_other)
+        w_set.update(w_other)
+
+
+class IntOrFloatSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
+    """ A set of ints and floats.  Like IntOrFloatListStrategy, the
+    elements are stored as longlongs: floats as their bit pattern, and
+    32-bit ints encoded as a NaN.  Equality and hashing work on the
+    numerical value, so that 1 and 1.0 are the same element, and the
+    first one added is kept, as for any other set. """
+    erase, unerase = rerased.new_erasing_pair("intorfloat")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(intorfloat).intersect')
+
+    def get_empty_storage(self):
+        return self.erase(self.get_empty_dict())
+
+    def get_empty_dict(self):
+        return r_dict(_int_or_float_key_eq, self._key_hash,
+                      simple_hash_eq=True)
+
+    def _key_hash(self, llval):
+        if longlong2float.is_int32_from_longlong_nan(llval):
+            intval = longlong2float.decode_int32_from_longlong_nan(llval)
+            return _hash_int(intval)
+        floatval = longlong2float.longlong2float(llval)
+        return _hash_float(self.space, floatval)
+
+    def is_correct_type(self, w_key):
+        if type(w_key) is W_IntObject:
+            intval = self.space.int_w(w_key)
+            return longlong2float.can_encode_int32(intval)
+        elif type(w_key) is W_FloatObject:
+            floatval = self.space.float_w(w_key)
+            return longlong2float.can_encode_float(floatval)
+        else:
+            return False
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(AsciiSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def unwrap(self, w_item):
+        if type(w_item) is W_IntObject:
+            intval = self.space.int_w(w_item)
+            return longlong2float.encode_int32_into_longlong_nan(intval)
+        else:
+            floatval = self.space.float_w(w_item)
+            return longlong2float.float2longlong(floatval)
+
+    def wrap(self, item):
+        if longlong2float.is_int32_from_longlong_nan(item):
+            intval = longlong2float.decode_int32_from_longlong_nan(item)
+            return self.space.newint(intval)
+        else:
+            floatval = longlong2float.longlong2float(item)
+            return self.space.newfloat(floatval)
+
+    def iter(self, w_set):
+        return IntOrFloatIteratorImplementation(self.space, self, w_set)
+
+    def has_key(self, w_set, w_key):
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_set.sstorage)
+            return self.unwrap(w_key) in d
+        if self.space.config.objspace.std.withstrbuf:
+            w_key = unwrap_strbuf(w_key)
+        if type(w_key) is W_BytesObject or type(w_key) is W_UnicodeObject:
+            return False
+        w_set.switch_to_object_strategy(self.space)
+        return w_set.has_key(w_key)
+
+    def get_storage_from_numeric_set(self, w_set):
+        """ Returns a storage containing the elements of the int or float
+        set w_set, or None if some of its elements cannot be encoded. """
+        setdata = self.get_empty_dict()
+        intlist = w_set.listview_int()
+        if intlist is not None:
+            for intval in intlist:
+                if not longlong2float.can_encode_int32(intval):
+                    return None
+                setdata[longlong2float.encode_int32_into_longlong_nan(
+                    intval)] = None
+            return self.erase(setdata)
+        floatlist = w_set.listview_float()
+        assert floatlist is not None
+        for floatval in floatlist:
+            if not longlong2float.can_encode_float(floatval):
+                return None
+            setdata[longlong2float.float2longlong(floatval)] = None
+        return self.erase(setdata)
+
+    def update(self, w_set, w_other):
+        d_set = self.unerase(w_set.sstorage)
+        if self is w_other.strategy:
+            d_set.update(self.unerase(w_other.sstorage))
+            return
+        if w_other.length() == 0:
+            return
+        if _is_int_or_float_strategy(self.space, w_other.strategy):
+            storage = self.get_storage_from_numeric_set(w_other)
+            if storage is not None:
+                d_set.update(self.unerase(storage))
+                return
+        w_set.switch_to_object_strategy(self.space)
+        w_set.update(w_other)
+
+
+def _int_or_float_key_eq(ll1, ll2):
+    if ll1 == ll2:
+        return True
+    # compare numerically: an encoded int32 converts to float exactly
+    if longlong2float.is_int32_from_longlong_nan(ll1):
+        f1 = float(longlong2float.decode_int32_from_longlong_nan(ll1))
+    else:
+        f1 = longlong2float.longlong2float(ll1)
+    if longlong2float.is_int32_from_longlong_nan(ll2):
+        f2 = float(longlong2float.decode_int32_from_longlong_nan(ll2))
+    else:
+        f2 = longlong2float.longlong2float(ll2)
+    return f1 == f2
+
+def _is_int_or_float_strategy(space, strategy):
+    return (strategy is space.fromcache(IntegerSetStrategy) or
+            strategy is space.fromcache(FloatSetStrategy))
+
+def _switch_to_int_or_float(space, w_set):
+    """ Switches the int or float set w_set to IntOrFloatSetStrategy.
+    Returns False, leaving the set unchanged, if that is not possible. """
+    strategy = space.fromcache(IntOrFloatSetStrategy)
+    storage = strategy.get_storage_from_numeric_set(w_set)
+    if storage is None:
+        return False
+    w_set.strategy = strategy
+    w_set.sstorage = storage
+    return True
+
+def _switch_to_int_or_float_or_object(space, w_set, w_key):
+    # w_set is an int or a float set, and w_key does not fit its strategy
+    strategy = space.fromcache(IntOrFloatSetStrategy)
+    if strategy.is_correct_type(w_key) and _switch_to_int_or_float(space, w_set):
+        return
+    w_set.switch_to_object_strategy(space)
+
+def _switch_for_numeric_update(space, w_set, w_other):
+    # w_set is an int or a float set that is updated from the non-empty set
+    # w_other with a different strategy
+    w_strategy = w_other.strategy
+    if (w_strategy is space.fromcache(IntOrFloatSetStrategy) or
+            _is_int_or_float_strategy(space, w_strategy)):
+        if _switch_to_int_or_float(space, w_set):
+            return
+    w_set.switch_to_object_strategy(space)
+
 
 class ObjectSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     erase, unerase = rerased.new_erasing_pair("object")
@@ -1445,6 +1736,10 @@ class IdentitySetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
             return False
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        if strategy is self.space.fromcache(FloatSetStrategy):
+            return False
+        if strategy is self.space.fromcache(IntOrFloatSetStrategy):
+            return False
         if strategy is self.space.fromcache(BytesSetStrategy):
             return False
         if strategy is self.space.fromcache(AsciiSetStrategy):
@@ -1550,6 +1845,36 @@ class IntegerIteratorImplementation(IteratorImplementation):
         else:
             return None
 
+class FloatIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        d = strategy.unerase(w_set.sstorage)
+        self.iterator = d.iterkeys()
+
+    def next_entry(self):
+        # note that this 'for' loop only runs once, at most
+        for key in self.iterator:
+            return self.space.newfloat(key)
+        else:
+            return None
+
+class IntOrFloatIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        d = strategy.unerase(w_set.sstorage)
+        self.iterator = d.iterkeys()
+
+    def next_entry(self):
+        # note that this 'for' loop only runs once, at most
+        for key in self.iterator:
+            if longlong2float.is_int32_from_longlong_nan(key):
+                intval = longlong2float.decode_int32_from_longlong_nan(key)
+                return self.space.newint(intval)
+            floatval = longlong2float.longlong2float(key)
+            return self.space.newfloat(floatval)
+        else:
+            return None
+
 class IdentityIteratorImplementation(IteratorImplementation):
     def __init__(self, space, strategy, w_set):
         IteratorImplementation.__init__(self, space, strategy, w_set)
@@ -1641,6 +1966,13 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
         w_set.sstorage = strategy.get_storage_from_unwrapped_list(intlist)
         return
 
+    floatlist = space.listview_float(w_iterable)
+    if floatlist is not None:
+        strategy = space.fromcache(FloatSetStrategy)
+        w_set.strategy = strategy
+        w_set.sstorage = strategy.get_storage_from_unwrapped_list(floatlist)
+        return
+
     length_hint = space.length_hint(w_iterable, 0)
 
     if jit.isconstant(length_hint) and length_hint:
@@ -1664,8 +1996,19 @@ def _pick_correct_strategy_unroll(space, w_set, w_iterable):
         w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
         return
 
+    # check for floats
+    for w_item in iterable_w:
+        if type(w_item) is not W_FloatObject:
+            break
+    else:
+        w_set.strategy = space.fromcache(FloatSetStrategy)
+        w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
+        return
+
     # check for strings
     for w_item in iterable_w:
+        if space.config.objspace.std.withstrbuf:
+            w_item = unwrap_strbuf(w_item)
         if type(w_item) is not W_BytesObject:
             break
     else:
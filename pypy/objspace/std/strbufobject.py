@@ -0,0 +1,139 @@
+"""A lazy representation of the result of a chain of str additions
+
+With objspace.std.withstrbuf enabled, ``a + b`` on two byte strings returns
+a W_StringBufferObject that keeps the pieces in a StringBuilder.  Adding
+more bytes to the most recent result appends in place, so the classical
+``s += piece`` loop is amortized linear instead of quadratic.  Everything
+else forces the builder into a regular W_BytesObject and delegates to it.
+"""
+
+import inspect
+
+import py
+
+from rpython.rlib.buffer import StringBuffer
+from rpython.rlib.rstring import StringBuilder
+
+from pypy.interpreter.buffer import SimpleView
+from pypy.interpreter.error import OperationError
+from pypy.objspace.std.bytesobject import (
+    W_AbstractBytesObject, W_BytesObject)
+
+
+class W_StringBufferObject(W_AbstractBytesObject):
+    w_str = None
+
+    def __init__(self, builder):
+        self.builder = builder             # StringBuilder
+        self.length = builder.getlength()
+
+    def force(self):
+        if self.w_str is None:
+            s = self.builder.build()
+            if self.length < len(s):
+                # the builder was extended by a later addition
+                s = s[:self.length]
+            self.w_str = W_BytesObject(s)
+            return s
+        else:
+            return self.w_str._value
+
+    def force_w(self):
+        self.force()
+        return self.w_str
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def unwrap(self, space):
+        return self.force()
+
+    def str_w(self, space):
+        return self.force()
+
+    def utf8_w(self, space):
+        return self.force()
+
+    charbuf_w = str_w
+
+    def buffer_w(self, space, flags):
+        space.check_buf_flags(flags, True)
+        return SimpleView(StringBuffer(self.force()))
+
+    def readbuf_w(self, space):
+        return StringBuffer(self.force())
+
+    def writebuf_w(self, space):
+        return self.force_w().writebuf_w(space)
+
+    def listview_bytes(self):
+        return self.force_w().listview_bytes()
+
+    def ord(self, space):
+        return self.force_w().ord(space)
+
+    def descr_len(self, space):
+        return space.newint(self.length)
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_AbstractBytesObject):
+            return self.force_w().descr_add(space, w_other)
+        try:
+            other = W_BytesObject._op_val(space, w_other)
+        except OperationError as e:
+            if e.match(space, space.w_TypeError):
+                return space.w_NotImplemented
+            raise
+        if self.builder.getlength() != self.length:
+            # somebody else already appended to our builder: start afresh
+            builder = StringBuilder()
+            builder.append(self.force())
+        else:
+            builder = self.builder
+        builder.append(other)
+        return W_StringBufferObject(builder)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_StringBufferObject here
+        assert type(self) is W_StringBufferObject
+        return self
+
+
+def unwrap_strbuf(w_obj):
+    if isinstance(w_obj, W_StringBufferObject):
+        return w_obj.force_w()
+    return w_obj
+
+
+def _make_delegate(name, func):
+    # the app-level arguments are already unwrapped by interpindirect2app
+    # according to the W_AbstractBytesObject signature; forward them to the
+    # forced W_BytesObject, forcing other string buffers as well so that
+    # the isinstance(w_other, W_BytesObject) checks keep working
+    args = inspect.getargs(func.func_code)
+    if args.varargs or args.keywords:
+        raise TypeError("Varargs and keywords not supported in %s" % name)
+    argnames = args.args[1:]
+    callargs = ', '.join([arg if not arg.startswith('w_')
+                          else 'unwrap_strbuf(%s)' % arg
+                          for arg in argnames])
+    func_code = py.code.Source("""
+    def %(name)s(self, %(args)s):
+        return self.force_w().%(name)s(%(callargs)s)
+    """ % {'name': name, 'args': ', '.join(argnames), 'callargs': callargs})
+    d = {'unwrap_strbuf': unwrap_strbuf}
+    exec func_code.compile() in d
+    f = d[name]
+    f.func_defaults = func.func_defaults
+    f.__module__ = __name__
+    return f
+
+for _name, _func in W_AbstractBytesObject.__dict__.items():
+    if (_name.startswith('descr_') and inspect.isfunction(_func) and
+            _name not in W_StringBufferObject.__dict__):
+        setattr(W_StringBufferObject, _name, _make_delegate(_name, _func))
+del _name, _func
+
+W_StringBufferObject.typedef = W_BytesObject.typedef
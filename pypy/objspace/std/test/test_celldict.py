@@ -356,3 +356,76 @@ class TestCellCache(object):
         frame.w_top_of_stack = 9
         STORE_GLOBAL_cached(frame, 0, None)
         assert d.getitem(w_key) == 9
+
+
+class TestModuleAttrCache(object):
+    def test_load_attr_and_lookup_method(self):
+        space = self.space
+        w_m, w_f = space.fixedview(space.appexec([], """():
+            import types
+            m = types.ModuleType('m')
+            m.x = 1
+            m.g = lambda: 2
+            def f(mod):
+                return mod.x + mod.g()
+            return m, f
+        """))
+        code = w_f.code
+        assert code._module_attr_caches is None
+        assert space.int_w(space.call_function(w_f, w_m)) == 3
+        caches = code._module_attr_caches
+        assert [ref() is not None for ref in caches] == [True, True]
+        assert caches[0]().w_dict is w_m.w_dict
+        assert space.int_w(space.call_function(w_f, w_m)) == 3
+        space.setattr(w_m, space.newtext("x"), space.newint(5))
+        assert space.int_w(space.call_function(w_f, w_m)) == 7
+        assert code._module_attr_caches[0] is caches[0]
+
+    def test_data_descriptor_not_cached(self):
+        space = self.space
+        w_m, w_f = space.fixedview(space.appexec([], """():
+            import types
+            m = types.ModuleType('m')
+            def f(mod):
+                return mod.__dict__
+            return m, f
+        """))
+        code = w_f.code
+        assert space.call_function(w_f, w_m) is w_m.w_dict
+        assert code._module_attr_caches is None
+
+
+class AppTestModuleAttrCache(object):
+    def test_module_attributes(self):
+        import types
+        m = types.ModuleType('m')
+        m2 = types.ModuleType('m2')
+        m.x = 1
+        m2.x = 2
+        def f(mod):
+            return mod.x
+        def g(mod):
+            return mod.x()
+        assert f(m) == 1
+        assert f(m2) == 2
+        assert f(m) == 1
+        m.x = 3
+        assert f(m) == 3
+        del m.x
+        raises(AttributeError, f, m)
+        m.x = lambda: 4
+        assert g(m) == 4
+        assert g(m) == 4
+        m.__dict__[5] = 6    # devolves the module dict
+        assert g(m) == 4
+        m.x = lambda: 7
+        assert g(m) == 7
+
+        class MyModule(types.ModuleType):
+            @property
+            def x(self):
+                return 8
+        m3 = MyModule('m3')
+        m3.__dict__['x'] = 9
+        assert f(m3) == 8
+        assert f(m2) == 2
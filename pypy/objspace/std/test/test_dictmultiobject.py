@@ -156,6 +156,12 @@ class TestW_DictObject(object):
         w_d.initialize_content([(w(1), w("a")), (w(2), w("b"))])
         assert self.space.listview_int(w_d) == [1, 2]
 
+    def test_listview_float_dict(self):
+        w = self.space.wrap
+        w_d = self.space.newdict()
+        w_d.initialize_content([(w(1.5), w("a")), (w(2.5), w("b"))])
+        assert self.space.listview_float(w_d) == [1.5, 2.5]
+
     def test_keys_on_string_unicode_int_dict(self, monkeypatch):
         w = self.space.wrap
         wb = self.space.newbytes
@@ -369,6 +375,29 @@ class AppTest_DictObject:
                     assert list(d) == [key] + other_keys
                 raises(KeyError, __pypy__.move_to_end, d, key * 3, last=last)
 
+    def test_sorted_items(self):
+        import __pypy__
+        class Key(object):
+            def __init__(self, value):
+                self.value = value
+            def __lt__(self, other):
+                return self.value < other.value
+        for d in [{3: 'c', 1: 'b', 2: 'a', -5: 'a'},
+                  {3.5: 1.5, 1.0: -2.0, 2.25: 7.0},
+                  {b'x': 3, b'a': 1, b'c': 1, b'b': 2},
+                  {u'x': 3, u'a': [1], u'c': (1,)},
+                  {Key(2): 3, Key(1): 1, Key(3): 2}]:
+            for reverse in [False, True]:
+                expected = sorted(d.items(), key=lambda kv: kv[0],
+                                  reverse=reverse)
+                assert __pypy__.sorted_items(d, reverse=reverse) == expected
+                expected = sorted(d.items(), key=lambda kv: kv[1],
+                                  reverse=reverse)
+                assert __pypy__.sorted_items(d, by_value=True,
+                                             reverse=reverse) == expected
+        assert __pypy__.sorted_items({}) == []
+        raises(TypeError, __pypy__.sorted_items, [(1, 2)])
+
     def test_keys(self):
         d = {1: 2, 3: 4}
         kys = d.keys()
@@ -1194,6 +1223,61 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_sorted_keeps_unboxed_keys(self):
+        from __pypy__ import strategy
+        assert strategy(sorted({3: 1, 1: 2})) == "IntegerListStrategy"
+        assert strategy(sorted({3.5: 1, 1.5: 2})) == "FloatListStrategy"
+        assert strategy(sorted({b'b': 1, b'a': 2})) == "BytesListStrategy"
+        assert strategy(sorted({u'b': 1, u'a': 2})) == "AsciiListStrategy"
+        assert sorted({3: 1, 1: 2, 2: 3}, reverse=True) == [3, 2, 1]
+
+    def test_empty_to_float(self):
+        d = {}
+        d[1.5] = "hi"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1.5] == "hi"
+        d[2.0] = "two"
+        assert d[2] == "two"
+        assert d.get(True) is None
+        assert d.get(None) is None
+        assert d.get("2.0") is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[2L] == "two"
+        assert sorted(d.keys()) == [1.5, 2.0]
+        assert type(d.keys()[0]) is float
+        d[3] = "three"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert sorted(d.items()) == [(1.5, "hi"), (2.0, "two"), (3, "three")]
+
+    def test_float_dict_zero_and_nan(self):
+        d = {}
+        d[-0.0] = 1
+        d[0.0] = 2
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert len(d) == 1
+        assert d[0] == 2
+        assert str(d.keys()[0]) == "-0.0"
+        nan = float("nan")
+        d[nan] = 3
+        d[float("nan")] = 4
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[nan] == 4
+        assert len(d) == 2
+        del d[nan]
+        assert d == {0.0: 2}
+        inf = float("inf")
+        d[inf] = 5
+        assert d[inf] == 5
+        assert d.get(-inf) is None
+
+    def test_float_dict_subclass_key(self):
+        class F(float):
+            pass
+        d = {1.5: 1}
+        d[F(2.5)] = 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[2.5] == 2
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -1283,7 +1367,7 @@ class FakeSpace:
 
     def wrap(self, obj):
         return obj
-    newtext = newbytes = newint = newfloat = wrap
+    newtext = newbytes = newint = newfloat = newbool = wrap
 
     def isinstance_w(self, obj, klass):
         return isinstance(obj, klass)
@@ -1330,6 +1414,7 @@ class FakeSpace:
     UnicodeObjectCls = FakeUnicode
     IntObjectCls = int
     FloatObjectCls = float
+    BoolObjectCls = bool
     w_dict = W_DictObject
     iter = iter
     fixedview = list
@@ -1340,6 +1425,7 @@ class Config:
         class std:
             methodcachesizeexp = 11
             withmethodcachecounter = False
+            withstrbuf = False
         honor__builtins__ = False
 
 FakeSpace.config = Config()
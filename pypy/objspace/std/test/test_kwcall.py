@@ -0,0 +1,145 @@
+class TestKwCall:
+    def test_optimizations_enabled(self):
+        from pypy.objspace.std import kwcall
+        FrameClass = self.space.FrameClass
+        assert FrameClass.CALL_FUNCTION.im_func == kwcall.CALL_FUNCTION
+        assert FrameClass.CALL_FUNCTION_KW.im_func == kwcall.CALL_FUNCTION_KW
+        assert (FrameClass.CALL_FUNCTION_VAR_KW.im_func ==
+                kwcall.CALL_FUNCTION_VAR_KW)
+
+    def test_call_site_cache(self):
+        space = self.space
+        w_g = space.appexec([], """():
+            def f(a, b=2, c=3):
+                return a * 100 + b * 10 + c
+            def g(x):
+                return f(x, c=5)
+            return g""")
+        w_res = space.call_function(w_g, space.newint(1))
+        assert space.int_w(w_res) == 125
+        caches = w_g.code._kwcall_caches
+        assert len(caches) == 1
+        cache, = caches.values()
+        assert cache.code.co_name == 'f'
+        assert cache.positions == [2]
+        assert cache.default_positions == [1]
+        w_res = space.call_function(w_g, space.newint(2))
+        assert space.int_w(w_res) == 225
+        assert caches.values() == [cache]
+
+
+class AppTestKwCall:
+    def test_keywords(self):
+        def f(a, b, c=3, d=4):
+            return (a, b, c, d)
+        for i in range(3):
+            assert f(1, b=2) == (1, 2, 3, 4)
+            assert f(1, d=5, b=2) == (1, 2, 3, 5)
+            assert f(c=7, b=6, a=5) == (5, 6, 7, 4)
+
+    def test_method_keywords(self):
+        class A(object):
+            def m(self, a, b=2):
+                return (self, a, b)
+        x = A()
+        for i in range(3):
+            assert x.m(1, b=5) == (x, 1, 5)
+            assert x.m(b=6, a=7) == (x, 7, 6)
+            raises(TypeError, "x.m(1, self=2)")
+
+    def test_varargs_and_varkw(self):
+        def f(a, *args, **kwds):
+            return a, args, kwds
+        for i in range(3):
+            assert f(1, 2, 3, x=4) == (1, (2, 3), {'x': 4})
+            assert f(a=1, y=2) == (1, (), {'y': 2})
+            raises(TypeError, "f(1, a=2)")
+
+    def test_errors(self):
+        def f(a, b=2):
+            return a, b
+        for i in range(3):
+            exc = raises(TypeError, "f(1, a=2)")
+            assert "multiple values" in str(exc.value)
+            exc = raises(TypeError, "f(1, c=2)")
+            assert "unexpected keyword argument 'c'" in str(exc.value)
+            exc = raises(TypeError, "f(b=2)")
+            assert "f() takes" in str(exc.value)
+
+    def test_callee_changes(self):
+        def f1(a, b=0):
+            return ('f1', a, b)
+        def f2(b, a=0):
+            return ('f2', a, b)
+        def f3(**kwds):
+            return ('f3', kwds)
+        def call(f):
+            return f(a=1, b=2)
+        for f in [f1, f2, f3, f1, f3, f2]:
+            res = call(f)
+            if f is f3:
+                assert res == ('f3', {'a': 1, 'b': 2})
+            else:
+                assert res == (f.__name__, 1, 2)
+
+    def test_defaults_change(self):
+        def f(a, b=2, c=3):
+            return (a, b, c)
+        def call():
+            return f(c=4, a=1)
+        assert call() == (1, 2, 4)
+        f.func_defaults = (5, 6)
+        assert call() == (1, 5, 4)
+        f.func_defaults = ()
+        raises(TypeError, call)
+
+    def test_cellvar_arguments(self):
+        def f(a, b):
+            def g():
+                return a + b
+            return g
+        for i in range(3):
+            assert f(b=2, a=1)() == 3
+
+    def test_forwarding(self):
+        def target(a, b=2, *rest, **kwds):
+            return (a, b, rest, kwds)
+        def wrapper(*args, **kwds):
+            return target(*args, **kwds)
+        def wrapper_kw(x, **kwds):
+            return target(x, **kwds)
+        for i in range(3):
+            assert wrapper(1) == (1, 2, (), {})
+            assert wrapper(1, 3, 4) == (1, 3, (4,), {})
+            assert wrapper(1, b=5) == (1, 5, (), {})
+            assert wrapper(b=5, a=6, z=7) == (6, 5, (), {'z': 7})
+            assert wrapper_kw(1, b=5, y=0) == (1, 5, (), {'y': 0})
+            raises(TypeError, wrapper, 1, a=2)
+            raises(TypeError, wrapper)
+
+    def test_forwarding_kwds_is_a_copy(self):
+        def target(**kwds):
+            kwds['x'] = 1
+            return kwds
+        d = {'a': 5}
+        for i in range(3):
+            assert target(**d) == {'a': 5, 'x': 1}
+            assert d == {'a': 5}
+
+    def test_forwarding_dict_subclass_and_mappings(self):
+        class D(dict):
+            pass
+        class M(object):
+            def keys(self):
+                return ['a']
+            def __getitem__(self, key):
+                return 42
+        def f(a, b=2):
+            return (a, b)
+        for i in range(3):
+            assert f(**D(a=1)) == (1, 2)
+            assert f(**M()) == (42, 2)
+            assert f(*[1], **{'b': 3}) == (1, 3)
+            assert f(*(x for x in [4]), **{}) == (4, 2)
+            raises(TypeError, "f(**{'a': 1, 'c': 2})")
+            raises(TypeError, "f(**{1: 2})")
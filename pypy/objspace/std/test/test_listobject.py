@@ -788,6 +788,45 @@ class AppTestListObject(object):
         l.sort()
         assert l == [3, 6, 9]
 
+    def test_big_slices_are_independent(self):
+        for l in [range(300), [i * 0.5 for i in range(300)]]:
+            a = l[50:250]
+            b = a[10:190]
+            c = l[:]
+            a[0] = 'x'
+            assert l[50] == l[1] * 50
+            assert b[0] == l[60]
+            l.append(l[0])
+            del l[0]
+            assert c[0] == l[-1]
+            assert b == c[60:240]
+            b.reverse()
+            assert b[-1] == c[60]
+            assert c[60] == l[59]
+            b.extend(c)
+            assert len(b) == 480
+            c *= 2
+            assert len(c) == 600 and c[300] == c[0]
+
+    def test_sort_long_int_and_string_lists(self):
+        # long enough for the radix sorts in rpython.rlib.listsort
+        x = 12345
+        dense = []
+        for i in range(600):
+            x = (x * 1103515245 + 12345) % 2**31
+            dense.append(x % 1000 - 500)
+        spread = [i * 119 for i in dense]
+        strs = [str(i * 7919) for i in dense]
+        for l in [dense, spread, strs]:
+            expected = sorted(l, key=lambda a: a)
+            l.sort()
+            assert l == expected
+            l.reverse()
+            l.sort()
+            assert l == expected
+            l.sort(reverse=True)
+            assert l == expected[::-1]
+
     def test_getitem(self):
         l = [1, 2, 3, 4, 5, 6, 9]
         assert l[0] == 1
@@ -1965,3 +2004,35 @@ class AppTestListFastSubscr:
             assert l[i] == i
         assert l[3:] == [3, 4]
         raises(TypeError, operator.getitem, l, "str")
+
+
+class AppTestTupleList(AppTestListObject):
+    spaceconfig = {"objspace.std.withtuplelist": True}
+
+    def test_tuple_list_strategy(self):
+        from __pypy__ import strategy
+        l = [(i, str(i)) for i in range(5)]
+        assert strategy(l) == "TupleListStrategy"
+        assert strategy(zip(range(3), [1.5, 2.5, 3.5])) == "TupleListStrategy"
+        assert strategy(list(enumerate('abc'))) == "TupleListStrategy"
+        for i, s in l:
+            assert s == str(i)
+        l.append((5, 6))
+        assert strategy(l) == "ObjectListStrategy"
+        assert l[-1] == (5, 6)
+
+    def test_tuple_list_sort_by_itemgetter(self):
+        from __pypy__ import strategy
+        import operator
+        l = [(3, 'x', 1), (1, 'y', 2), (2, 'x', 3), (1, 'z', 4)]
+        l.sort(key=operator.itemgetter(0))
+        assert l == [(1, 'y', 2), (1, 'z', 4), (2, 'x', 3), (3, 'x', 1)]
+        l.sort(key=operator.itemgetter(1), reverse=True)
+        assert l == [(1, 'z', 4), (1, 'y', 2), (2, 'x', 3), (3, 'x', 1)]
+        assert strategy(l) == "TupleListStrategy"
+        l.sort()
+        assert l == [(1, 'y', 2), (1, 'z', 4), (2, 'x', 3), (3, 'x', 1)]
+        assert strategy(l) == "TupleListStrategy"
+        raises(IndexError, l.sort, key=operator.itemgetter(3))
+        l.sort(key=lambda x: -x[2])
+        assert l == [(1, 'z', 4), (2, 'x', 3), (1, 'y', 2), (3, 'x', 1)]
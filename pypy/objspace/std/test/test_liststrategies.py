@@ -4,7 +4,8 @@ from pypy.objspace.std.listobject import (
     W_ListObject, EmptyListStrategy, ObjectListStrategy, IntegerListStrategy,
     FloatListStrategy, BytesListStrategy, RangeListStrategy,
     SimpleRangeListStrategy, make_range_list, AsciiListStrategy,
-    IntOrFloatListStrategy)
+    IntOrFloatListStrategy, TupleListStrategy, IntegerSliceListStrategy,
+    FloatSliceListStrategy)
 from pypy.objspace.std import listobject
 from pypy.objspace.std.test.test_listobject import TestW_ListObject
 
@@ -414,6 +415,67 @@ class TestW_ListStrategies(TestW_ListObject):
         l.append(self.space.wrap(19))
         assert isinstance(l.strategy, IntegerListStrategy)
 
+    def test_range_reductions(self):
+        space = self.space
+        maxint = sys.maxint
+        cases = [(0, 1, 10), (5, 3, 7), (-10, 3, 9), (10, -4, 8),
+                 (7, 2, 1), (maxint - 5, 1, 5), (-maxint - 1, 1, 5),
+                 (-maxint // 2, maxint // 4, 4), (maxint, -maxint, 2),
+                 (-5, 2, 3), (0, -maxint - 1, 2), (-5, 2, 6), (5, -2, 6)]
+        for start, step, length in cases:
+            items = [start + i * step for i in range(length)]
+            for total in [0, 5, -maxint - 1, maxint, maxint // 2]:
+                # the reference: a loop of int additions
+                expected = total
+                overflowed = False
+                for x in items:
+                    expected += x
+                    if not -maxint - 1 <= expected <= maxint:
+                        overflowed = True
+                w_l = make_range_list(space, start, step, length)
+                w_res = w_l.reduce_sum(space.newint(total))
+                assert space.unwrap(w_res) == expected
+                assert space.isinstance_w(w_res, space.w_long) == overflowed
+                assert not isinstance(w_l.strategy, IntegerListStrategy)
+            w_l = make_range_list(space, start, step, length)
+            if items:
+                assert space.int_w(w_l.reduce_min_max(True)) == max(items)
+                assert space.int_w(w_l.reduce_min_max(False)) == min(items)
+            assert space.is_true(w_l.reduce_any_all(True)) == any(items)
+            assert space.is_true(w_l.reduce_any_all(False)) == all(items)
+        w_l = make_range_list(space, 1, 1, 3)
+        assert w_l.reduce_sum(space.newfloat(1.5)) is None
+        assert w_l.reduce_sum(space.newlong(1)) is None
+        w_l.pop(0)
+        w_l.pop(0)
+        w_l.pop_end()
+        assert isinstance(w_l.strategy, RangeListStrategy)
+        assert space.int_w(w_l.reduce_sum(space.newint(3))) == 3
+        assert w_l.reduce_min_max(True) is None
+        assert space.is_true(w_l.reduce_any_all(False))
+
+    def test_int_float_reductions(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.wrap(sys.maxint), space.wrap(1),
+                                   space.wrap(-5)])
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        w_res = w_l.reduce_sum(space.newint(0))
+        assert space.isinstance_w(w_res, space.w_long)
+        assert space.unwrap(w_res) == sys.maxint - 4
+        assert space.float_w(w_l.reduce_sum(space.newfloat(0.5))) == (
+            float(sys.maxint) - 3.5)
+        assert space.int_w(w_l.reduce_min_max(True)) == sys.maxint
+        assert space.int_w(w_l.reduce_min_max(False)) == -5
+        w_l = W_ListObject(space, [space.wrap(1.5), space.wrap(-0.0)])
+        assert isinstance(w_l.strategy, FloatListStrategy)
+        assert space.float_w(w_l.reduce_sum(space.newint(2))) == 3.5
+        assert space.is_true(w_l.reduce_any_all(True))
+        assert not space.is_true(w_l.reduce_any_all(False))
+        w_l = W_ListObject(space, [space.wrap("a")])
+        assert w_l.reduce_sum(space.newint(0)) is None
+        assert w_l.reduce_min_max(True) is None
+        assert w_l.reduce_any_all(True) is None
+
     def test_simplerangelist(self):
         l = make_range_list(self.space, 0, 1, 10)
         assert isinstance(l.strategy, SimpleRangeListStrategy)
@@ -1043,6 +1105,88 @@ class TestW_ListStrategies(TestW_ListObject):
         assert [(type(x), x) for x in space.unwrap(w_l)] == [
             (int, 5), (float, 1.2), (int, 1), (float, 1.0)]
 
+    def test_shared_int_slice(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(200)])
+        w_slice = w_l.getslice(10, 110, 1, 100)
+        assert isinstance(w_slice.strategy, IntegerSliceListStrategy)
+        assert isinstance(w_l.strategy, IntegerSliceListStrategy)
+        items, start, length = w_slice.strategy.unerase(w_slice.lstorage)
+        assert w_l.strategy.unerase(w_l.lstorage)[0] is items
+        assert (start, length) == (10, 100)
+        assert space.int_w(w_slice.getitem(0)) == 10
+        assert space.int_w(w_slice.getitem(-1)) == 109
+        py.test.raises(IndexError, w_slice.getitem, 100)
+        assert w_slice.getitems_int() == range(10, 110)
+        # a slice of the slice shares the same items
+        w_slice2 = w_slice.getslice(5, 95, 1, 90)
+        assert w_slice2.strategy.unerase(w_slice2.lstorage)[0] is items
+        # modifying any of them copies only its own items
+        w_slice.setitem(0, space.wrap(-1))
+        assert isinstance(w_slice.strategy, IntegerListStrategy)
+        assert space.unwrap(w_slice) == [-1] + range(11, 110)
+        w_l.append(space.wrap(200))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == range(201)
+        assert space.unwrap(w_slice2) == range(15, 105)
+        assert w_slice2.find_or_count(space.wrap(20)) == 5
+        assert isinstance(w_slice2.strategy, IntegerSliceListStrategy)
+
+    def test_shared_slice_read_only(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.wrap(i * 0.5) for i in range(200)])
+        w_slice = w_l.getslice(100, 200, 1, 100)
+        assert w_slice.find_or_count(space.wrap(60.0)) == 20
+        py.test.raises(ValueError, w_slice.find_or_count, space.wrap(1.0))
+        py.test.raises(ValueError, w_slice.find_or_count, space.wrap(60.0),
+                       0, 20)
+        assert w_slice.find_or_count(space.wrap(60.0), count=True) == 1
+        assert w_slice.find_or_count(space.wrap(60), count=True) == 1
+        assert w_l.find_or_count(space.wrap(60.0)) == 120
+        assert space.float_w(w_slice.reduce_sum(space.wrap(0))) == sum(
+            [i * 0.5 for i in range(100, 200)])
+        assert space.float_w(w_slice.reduce_min_max(False)) == 50.0
+        assert space.float_w(w_slice.reduce_min_max(True)) == 99.5
+        assert space.is_true(w_slice.reduce_any_all(False))
+        # none of this copied the items
+        assert isinstance(w_slice.strategy, FloatSliceListStrategy)
+        assert isinstance(w_l.strategy, FloatSliceListStrategy)
+
+    def test_shared_slice_ratio(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.wrap(i * 0.5) for i in range(1000)])
+        w_slice = w_l.getslice(0, 100, 1, 100)
+        assert isinstance(w_slice.strategy, FloatListStrategy)
+        assert isinstance(w_l.strategy, FloatListStrategy)
+        w_slice = w_l.getslice(0, 40, 1, 40)
+        assert isinstance(w_slice.strategy, FloatListStrategy)
+        w_slice = w_l.getslice(100, 500, 1, 400)
+        assert isinstance(w_slice.strategy, FloatSliceListStrategy)
+        w_small = w_slice.getslice(0, 100, 1, 100)
+        assert isinstance(w_small.strategy, FloatListStrategy)
+        assert space.unwrap(w_small) == [i * 0.5 for i in range(100, 200)]
+        w_stepped = w_slice.getslice(0, 400, 2, 200)
+        assert isinstance(w_stepped.strategy, FloatListStrategy)
+        assert space.unwrap(w_stepped) == [i * 0.5 for i in range(100, 500, 2)]
+
+    def test_shared_slice_as_other_list(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(100)])
+        w_slice = w_l.getslice(0, 100, 1, 100)
+        w_other = W_ListObject(space, [space.wrap(1), space.wrap(2)])
+        w_other.extend(w_slice)
+        assert isinstance(w_other.strategy, IntegerListStrategy)
+        assert space.unwrap(w_other) == [1, 2] + range(100)
+        w_empty = W_ListObject(space, [])
+        w_empty.extend(w_l)
+        assert isinstance(w_empty.strategy, IntegerSliceListStrategy)
+        w_other.setslice(0, 1, 2, w_empty)
+        assert isinstance(w_other.strategy, IntegerListStrategy)
+        assert space.unwrap(w_other) == range(100) + range(100)
+        w_l.sort(True)
+        assert space.unwrap(w_l) == range(99, -1, -1)
+        assert space.unwrap(w_empty) == range(100)
+
     def test_stringstrategy_wraps_bytes(self):
         space = self.space
         wb = space.newbytes
@@ -1059,3 +1203,94 @@ class TestW_ListStrategiesDisabled:
         assert isinstance(W_ListObject(self.space, [self.space.wrap(1),self.space.wrap('a')]).strategy, ObjectListStrategy)
         assert isinstance(W_ListObject(self.space, [self.space.wrap(1),self.space.wrap(2),self.space.wrap(3)]).strategy, ObjectListStrategy)
         assert isinstance(W_ListObject(self.space, [self.space.wrap('a'), self.space.wrap('b')]).strategy, ObjectListStrategy)
+
+
+class TestW_TupleListStrategy:
+    spaceconfig = {"objspace.std.withtuplelist": True}
+
+    def newtuplelist(self, rows):
+        space = self.space
+        return W_ListObject(space, [space.wrap(row) for row in rows])
+
+    def test_check_strategy(self):
+        space = self.space
+        w_l = self.newtuplelist([(1, 2.5, 'a'), (2, 3.5, 'b')])
+        assert isinstance(w_l.strategy, TupleListStrategy)
+        w_l = self.newtuplelist([(1, None), (2, [])])
+        assert isinstance(w_l.strategy, TupleListStrategy)
+        # all objects, too short, or mismatching shapes
+        w_l = self.newtuplelist([(None, None), (None, None)])
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        w_l = self.newtuplelist([(1,), (2,)])
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        w_l = self.newtuplelist([(1, 2), (1, 2.5)])
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        w_l = self.newtuplelist([(1, 2), (1, 2, 3)])
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        w_l = self.newtuplelist([(True, 2), (False, 3)])
+        assert isinstance(w_l.strategy, TupleListStrategy)
+        assert space.unwrap(w_l.getitem(0)) == (True, 2)
+
+    def test_storage_is_columns(self):
+        w_l = self.newtuplelist([(1, 2.5, 'a', None), (2, 3.5, 'b', 7)])
+        storage = w_l.strategy.unerase(w_l.lstorage)
+        assert storage.shape == 'ifbo'
+        assert storage.int_columns == [[1, 2]]
+        assert storage.float_columns == [[2.5, 3.5]]
+        assert storage.bytes_columns == [['a', 'b']]
+        assert len(storage.object_columns) == 1
+
+    def test_empty_to_tuple(self):
+        space = self.space
+        w_l = W_ListObject(space, [])
+        w_l.append(space.wrap((1, 'a')))
+        assert isinstance(w_l.strategy, TupleListStrategy)
+        w_l.append(space.wrap((2, 'b')))
+        assert isinstance(w_l.strategy, TupleListStrategy)
+        assert space.unwrap(w_l) == [(1, 'a'), (2, 'b')]
+        w_l.append(space.wrap((3, 4)))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        assert space.unwrap(w_l) == [(1, 'a'), (2, 'b'), (3, 4)]
+
+    def test_setitem_pop_insert(self):
+        space = self.space
+        w_l = self.newtuplelist([(1, 'a'), (2, 'b'), (3, 'c')])
+        w_l.setitem(-1, space.wrap((4, 'd')))
+        assert space.unwrap(w_l.pop(0)) == (1, 'a')
+        w_l.insert(0, space.wrap((0, 'z')))
+        assert isinstance(w_l.strategy, TupleListStrategy)
+        assert space.unwrap(w_l) == [(0, 'z'), (2, 'b'), (4, 'd')]
+        w_l.setitem(1, space.wrap((2, 2)))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        assert space.unwrap(w_l) == [(0, 'z'), (2, 2), (4, 'd')]
+
+    def test_getslice_extend_clone(self):
+        space = self.space
+        w_l = self.newtuplelist([(i, float(i)) for i in range(6)])
+        w_slice = w_l.getslice(1, 6, 2, 3)
+        assert isinstance(w_slice.strategy, TupleListStrategy)
+        assert space.unwrap(w_slice) == [(1, 1.0), (3, 3.0), (5, 5.0)]
+        w_clone = w_l.clone()
+        w_clone.extend(w_clone)
+        assert isinstance(w_clone.strategy, TupleListStrategy)
+        assert w_clone.length() == 12
+        assert w_l.length() == 6
+        w_clone.extend(self.newtuplelist([(1, 2), (3, 4)]))
+        assert isinstance(w_clone.strategy, ObjectListStrategy)
+        assert space.unwrap(w_clone)[-2:] == [(1, 2), (3, 4)]
+
+    def test_sort_by_itemgetter(self):
+        space = self.space
+        rows = [(3, 'c', 0.5), (1, 'a', 1.5), (3, 'b', -1.0), (2, 'a', 1.5)]
+        for index in [0, 1, 2, -1]:
+            for reverse in [False, True]:
+                w_l = self.newtuplelist(rows)
+                w_key = space.appexec([space.wrap(index)], """(index):
+                    import operator
+                    return operator.itemgetter(index)
+                """)
+                w_l.descr_sort(space, w_key=w_key, reverse=reverse)
+                assert isinstance(w_l.strategy, TupleListStrategy)
+                expected = sorted(rows, key=lambda row: row[index],
+                                  reverse=reverse)
+                assert space.unwrap(w_l) == expected
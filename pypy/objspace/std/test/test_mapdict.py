@@ -64,7 +64,11 @@ class Object(Object):
             if isinstance(curr, Terminator):
                 return
             curr = curr.back
-        assert len(unerase_unboxed(self._mapdict_read_storage(curr.storageindex))) == curr.listindex + 1
+        if curr.storageindex < 0:
+            assert curr.valueindex < curr.terminator.inline_unboxed
+            return
+        length = curr.valueindex + 1 - curr.terminator.inline_unboxed
+        assert len(unerase_unboxed(self._mapdict_read_storage(curr.storageindex))) == length
 
 
 def test_plain_attribute():
@@ -169,6 +173,82 @@ def test_add_attribute_limit():
     for i in range(1000):
         assert obj.getslotvalue(i) == i
 
+def test_size_estimate():
+    cls = Class()
+    for j in range(200):
+        obj = cls.instantiate()
+        for i in range(20):
+            obj.setdictvalue(space, str(i), i)
+    assert cls.terminator.size_estimate() >= 18
+    assert obj.map.size_estimate() == 20
+    # later objects allocate (almost) all the storage they need at once
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "0", 0)
+    storage = obj.storage
+    assert len(storage) >= 18
+    for i in range(1, 18):
+        obj.setdictvalue(space, str(i), i)
+        assert obj.storage is storage
+    for i in range(18):
+        assert obj.getdictvalue(space, str(i)) == i
+
+def test_size_estimate_not_used_by_jit(monkeypatch):
+    cls = Class()
+    for j in range(200):
+        obj = cls.instantiate()
+        for i in range(20):
+            obj.setdictvalue(space, str(i), i)
+    # in JITted code, the storage size must only depend on the map
+    monkeypatch.setattr(jit, "we_are_jitted", lambda: True)
+    obj = cls.instantiate()
+    for i in range(5):
+        obj.setdictvalue(space, str(i), i)
+        assert len(obj.storage) == i + 1
+    assert obj.map.size_estimate() == 20
+
+def test_size_estimate_specialized_class():
+    from pypy.objspace.std.mapdict import _make_storage_mixin_size_n
+    from pypy.objspace.std.objectobject import W_ObjectObject
+    class objectcls(W_ObjectObject):
+        objectmodel.import_from_mixin(BaseUserClassMapdict)
+        objectmodel.import_from_mixin(MapdictDictSupport)
+        objectmodel.import_from_mixin(_make_storage_mixin_size_n(5))
+    cls = Class()
+    objs = [W_Root() for i in range(20)]
+    for j in range(200):
+        obj = objectcls()
+        obj.user_setup(space, cls)
+        for i in range(20):
+            obj.setdictvalue(space, str(i), objs[i])
+    obj = objectcls()
+    obj.user_setup(space, cls)
+    for i in range(6):
+        obj.setdictvalue(space, str(i), objs[i])
+    storage = obj._mapdict_get_storage_list()
+    assert obj._mapdict_storage_length() >= 18
+    for i in range(6, 18):
+        obj.setdictvalue(space, str(i), objs[i])
+        assert obj._mapdict_get_storage_list() is storage
+    for i in range(18):
+        assert obj.getdictvalue(space, str(i)) is objs[i]
+
+def test_tree_stats():
+    cls = Class()
+    assert cls.terminator.tree_stats() == (1, 0, 0)
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "a", 1)
+    obj.setdictvalue(space, "b", 2)
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "c", 1)
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "d", 1)
+    assert cls.terminator.tree_stats() == (5, 2, 3)
+    assert cls.terminator.num_devolved == 0
+    obj.getdict(space)    # not devolved yet
+    assert cls.terminator.num_devolved == 0
+    materialize_r_dict(space, obj, {})
+    assert cls.terminator.num_devolved == 1
+
 def test_insert_different_orders():
     cls = Class()
     obj = cls.instantiate()
@@ -549,28 +629,34 @@ def test_unboxed_compute_indices():
     aa = UnboxedPlainAttribute("b", DICT,
                         PlainAttribute("a", DICT,
                                        Terminator(space, w_cls), 0), 0,
-                        int)
+                        UNBOXED_INT)
     assert aa.storageindex == 1
     assert aa.firstunwrapped
     assert aa.listindex == 0
     
-    c = UnboxedPlainAttribute("c", DICT, aa, 0, int)
+    c = UnboxedPlainAttribute("c", DICT, aa, 0, UNBOXED_INT)
     assert c.storageindex == 1
     assert c.listindex == 1
     assert not c.firstunwrapped
 
+    d = UnboxedPlainAttribute("d", DICT, c, 0, UNBOXED_NUMBER)
+    assert d.listindex == 2
+    assert d.valueindex == 3
+    e = UnboxedPlainAttribute("e", DICT, d, 0, UNBOXED_FLOAT)
+    assert e.listindex == e.valueindex == 4
+
 def test_unboxed_storage_needed():
     w_cls = "class"
     bb = UnboxedPlainAttribute("c", DICT,
              Terminator(space, w_cls), 0,
-         int)
+         UNBOXED_INT)
     assert bb.storage_needed() == 1
     aa = UnboxedPlainAttribute("b", DICT,
             PlainAttribute("a", DICT,
                UnboxedPlainAttribute("c", DICT,
                    Terminator(space, w_cls), 0,
-               int), 0), 0,
-         int)
+               UNBOXED_INT), 0), 0,
+         UNBOXED_INT)
     assert aa.storage_needed() == 2
 
 def unboxed_write_int(val1, val2):
@@ -649,16 +735,22 @@ def test_no_int_unboxing(monkeypatch):
 def test_unboxed_type_change():
     cls = Class(allow_unboxing=True)
     w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", 1.5)
     w_obj.setdictvalue(space, "b", 15.12)
     w_obj.setdictvalue(space, "b", "woopsie")
     assert w_obj.getdictvalue(space, "b") == "woopsie"
+    assert w_obj.getdictvalue(space, "a") == 1.5
     assert type(w_obj.map) is PlainAttribute
-    assert w_obj.map.terminator.allow_unboxing == False
+    # only the attribute that changed its type is boxed from now on
+    assert type(w_obj.map.back) is UnboxedPlainAttribute
+    assert w_obj.map.terminator.allow_unboxing
 
     w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", 2.5)
     w_obj.setdictvalue(space, "b", 15.12)
-    # next time we won't unbox
+    # next time we won't unbox b
     assert type(w_obj.map) is PlainAttribute
+    assert type(w_obj.map.back) is UnboxedPlainAttribute
 
 def test_unboxed_type_change_other_object():
     cls = Class(allow_unboxing=True)
@@ -673,13 +765,14 @@ def test_unboxed_type_change_other_object():
     w_obj1.setdictvalue(space, "b", "woopsie")
     assert w_obj1.getdictvalue(space, "b") == "woopsie"
     assert type(w_obj1.map) is PlainAttribute
-    assert w_obj1.map.terminator.allow_unboxing == False
+    assert not w_obj2.map.valid
 
     # w_obj2 is unaffected so far
     assert type(w_obj2.map) is UnboxedPlainAttribute
     assert w_obj2.getdictvalue(space, "b") == 16.12
     # now it's switched
     assert type(w_obj2.map) is PlainAttribute
+    assert w_obj2.map is w_obj1.map
     # but the value stays of course
     assert w_obj2.getdictvalue(space, "b") == 16.12
 
@@ -691,7 +784,89 @@ def test_unboxed_mixed_two_different_instances():
     w_obj2 = cls.instantiate(space)
     w_obj2.setdictvalue(space, "b", "abc")
 
-    assert w_obj2.map.terminator.allow_unboxing == False
+    assert type(w_obj2.map) is PlainAttribute
+    assert w_obj2.map.terminator.allow_unboxing
+
+def test_unboxed_bool():
+    cls = Class(allow_unboxing=True)
+    w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", True)
+    w_obj.setdictvalue(space, "b", False)
+    assert type(w_obj.map) is UnboxedPlainAttribute
+    assert w_obj.map.typ == UNBOXED_BOOL
+    assert unerase_unboxed(w_obj.storage[0]) == [1, 0]
+    assert w_obj.getdictvalue(space, "a") is True
+    assert w_obj.getdictvalue(space, "b") is False
+    w_obj.setdictvalue(space, "a", False)
+    assert w_obj.getdictvalue(space, "a") is False
+
+def test_unboxed_widen_to_number():
+    cls = Class(allow_unboxing=True)
+    w_obj1 = cls.instantiate(space)
+    w_obj1.setdictvalue(space, "a", "x")
+    w_obj1.setdictvalue(space, "b", 15.5)
+    w_obj1.setdictvalue(space, "c", 1.5)
+    w_obj2 = cls.instantiate(space)
+    w_obj2.setdictvalue(space, "a", "y")
+    w_obj2.setdictvalue(space, "b", 16.5)
+    w_obj2.setdictvalue(space, "c", 2.5)
+    old_map = w_obj2.map
+
+    w_obj1.setdictvalue(space, "b", True)
+    assert w_obj1.getdictvalue(space, "b") is True
+    attr = w_obj1.map.back
+    assert attr.name == "b"
+    assert attr.typ == UNBOXED_NUMBER
+    assert w_obj1.map.typ == UNBOXED_FLOAT
+    assert w_obj1.getdictvalue(space, "c") == 1.5
+    w_obj1._check_unboxed_storage_consistency()
+    # the whole subtree of the old map is stale now
+    assert not old_map.valid
+    assert not old_map.back.valid
+
+    # a tagged number takes every kind of number without changing the map
+    map = w_obj1.map
+    for w_value in [12.5, False, 3.25, True]:
+        w_obj1.setdictvalue(space, "b", w_value)
+        assert w_obj1.getdictvalue(space, "b") == w_value
+        assert type(w_obj1.getdictvalue(space, "b")) is type(w_value)
+        assert w_obj1.map is map
+
+    # w_obj2 follows the next time it is read
+    assert w_obj2.getdictvalue(space, "c") == 2.5
+    assert w_obj2.map is map
+    assert w_obj2.getdictvalue(space, "b") == 16.5
+    w_obj2._check_unboxed_storage_consistency()
+
+    # new objects use the tagged layout right away
+    w_obj3 = cls.instantiate(space)
+    w_obj3.setdictvalue(space, "a", "z")
+    w_obj3.setdictvalue(space, "b", 17.5)
+    w_obj3.setdictvalue(space, "c", 3.5)
+    assert w_obj3.map is map
+
+    # anything that is not a number makes the attribute boxed
+    w_obj3.setdictvalue(space, "b", "abc")
+    assert w_obj3.getdictvalue(space, "b") == "abc"
+    assert w_obj3.getdictvalue(space, "c") == 3.5
+    assert type(w_obj3.map.back) is PlainAttribute
+    assert w_obj3.map.typ == UNBOXED_FLOAT
+    assert not map.valid
+
+@skip_if_no_int_unboxing
+def test_unboxed_widen_int_to_number():
+    cls = Class(allow_unboxing=True)
+    w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", 15)
+    assert w_obj.map.typ == UNBOXED_INT
+    w_obj.setdictvalue(space, "a", 1.5)
+    assert w_obj.map.typ == UNBOXED_NUMBER
+    assert w_obj.getdictvalue(space, "a") == 1.5
+    w_obj.setdictvalue(space, "a", sys.maxint)
+    assert w_obj.getdictvalue(space, "a") == sys.maxint
+    assert type(w_obj.getdictvalue(space, "a")) is int
+    w_obj.setdictvalue(space, "b", 2)
+    assert unerase_unboxed(w_obj.storage[0]) == [UNBOXED_INT, sys.maxint, 2]
 
 def test_unboxed_attr_immutability(monkeypatch):
     cls = Class(allow_unboxing=True)
@@ -803,6 +978,72 @@ def test_unbox_reorder_bug3():
     assert obj2.getdictvalue(space, "blocked") == "blocked2"
 
 
+def make_compact_slots_class():
+    from pypy.objspace.std.mapdict import _make_storage_mixin_size_n
+    from pypy.objspace.std.objectobject import W_ObjectObject
+    class objectcls(W_ObjectObject):
+        objectmodel.import_from_mixin(BaseUserClassMapdict)
+        objectmodel.import_from_mixin(MapdictWeakrefSupport)
+        objectmodel.import_from_mixin(_make_storage_mixin_size_n(
+            SLOTS_SUBCLASSES_NUM_FIELDS, SLOTS_SUBCLASSES_NUM_UNBOXED))
+        _check_unboxed_storage_consistency = (
+            Object._check_unboxed_storage_consistency.im_func)
+    cls = Class(hasdict=False, allow_unboxing=True)
+    cls.terminator.inline_unboxed = SLOTS_SUBCLASSES_NUM_UNBOXED
+    return objectcls, cls
+
+def test_unboxed_inline_slots():
+    from pypy.module._weakref.interp__weakref import WeakrefLifeline
+    objectcls, cls = make_compact_slots_class()
+    obj = objectcls()
+    obj.user_setup(space, cls)
+    obj.setslotvalue(0, 1.5)
+    obj.setslotvalue(1, "a")
+    obj.setslotvalue(2, True)
+    obj.setslotvalue(3, 2.5)
+    # all values fit into the raw fields, nothing is allocated for them
+    assert obj.map.storageindex == -1
+    assert obj.map.storage_needed() == 1
+    assert obj._unboxed0 == float2longlong(1.5)
+    assert obj._unboxed1 == 1
+    assert obj._unboxed2 == float2longlong(2.5)
+    obj._check_unboxed_storage_consistency()
+
+    obj.setslotvalue(4, 3.5)
+    obj.setslotvalue(5, 4.5)
+    # the fifth unboxed value goes into a list
+    assert obj.map.back.storageindex == -1
+    assert obj.map.firstunwrapped
+    assert obj.map.storageindex == 1
+    assert unerase_unboxed(obj._value1) == [float2longlong(4.5)]
+    obj._check_unboxed_storage_consistency()
+
+    assert [obj.getslotvalue(i) for i in range(6)] == [
+        1.5, "a", True, 2.5, 3.5, 4.5]
+
+    # change of type, deleting slots and weakrefs keep working
+    obj.setslotvalue(0, False)
+    assert obj.getslotvalue(0) is False
+    assert obj.delslotvalue(3)
+    assert obj.getslotvalue(3) is None
+    obj._check_unboxed_storage_consistency()
+    obj.setweakref(space, WeakrefLifeline(space))
+    obj.setslotvalue(3, 5.5)
+    obj._check_unboxed_storage_consistency()
+    assert [obj.getslotvalue(i) for i in range(6)] == [
+        False, "a", True, 5.5, 3.5, 4.5]
+    assert isinstance(obj.getweakref(), WeakrefLifeline)
+
+    # another object with the same class gets the same maps
+    obj2 = objectcls()
+    obj2.user_setup(space, cls)
+    for i, w_value in enumerate([True, "b", False, 6.5, 7.5, 8.5]):
+        obj2.setslotvalue(i, w_value)
+    obj2.setweakref(space, WeakrefLifeline(space))
+    obj2.delslotvalue(3)
+    obj2.setslotvalue(3, 9.5)
+    assert obj2.map is obj.map
+
 def test_unboxed_insert_different_orders_perm():
     from itertools import permutations
     cls = Class(allow_unboxing=True)
@@ -1253,7 +1494,7 @@ class AppTestWithMapDict(object):
         a1.x = "a"
         a1.y = 1
         a1.z = "b"
-        a1.y = None # mark the terminator as allow_unboxing = False
+        a1.y = None # y is not unboxed any more, a's map is stale now
 
         d = a.__dict__
         # reading a.y during iteration changes the map! now that the iterators
@@ -1272,6 +1513,52 @@ class AppTestWithMapDict(object):
         a.z = "b"
         assert a.__dict__.copy() == {"x": "a", "y": 1, "z": "b"}
 
+    def test_unboxed_type_change(self):
+        class A(object):
+            pass
+
+        a = A()
+        a.x = True
+        a.y = 1.5
+        a.z = "c"
+        b = A()
+        b.x = False
+        b.y = 2.5
+        b.z = "d"
+        a.y = 7
+        assert a.y == 7 and type(a.y) is int
+        a.y = False
+        assert a.y is False
+        a.y = "y"
+        assert (a.x, a.y, a.z) == (True, "y", "c")
+        assert (b.x, b.y, b.z) == (False, 2.5, "d")
+        b.x = 0
+        assert b.x == 0 and type(b.x) is int
+        assert b.__dict__ == {"x": 0, "y": 2.5, "z": "d"}
+
+    def test_unboxed_slots(self):
+        import weakref
+        class A(object):
+            __slots__ = ['a', 'b', 'c', 'd', 'e', 'f', '__weakref__']
+        class B(object):
+            __slots__ = ['a', 'b', 'c', 'd', 'e', 'f', '__weakref__']
+        x = A()
+        x.a, x.b, x.c, x.d, x.e, x.f = 1, 2.5, True, "d", 5, 6.5
+        r = weakref.ref(x)
+        x.a = 1.5
+        del x.b
+        raises(AttributeError, "x.b")
+        x.b = False
+        assert (x.a, x.b, x.c, x.d, x.e, x.f) == (1.5, False, True, "d", 5, 6.5)
+        x.__class__ = B
+        assert (x.a, x.b, x.c, x.d, x.e, x.f) == (1.5, False, True, "d", 5, 6.5)
+        assert type(x.b) is bool and type(x.e) is int
+        assert r() is x
+        del x.e
+        raises(AttributeError, "x.e")
+        x.e = "e"
+        assert (x.a, x.b, x.c, x.d, x.e, x.f) == (1.5, False, True, "d", "e", 6.5)
+
 
 class AppTestWithMapDictAndCounters(object):
     spaceconfig = {"objspace.std.withmethodcachecounter": True}
@@ -1352,6 +1639,23 @@ class AppTestWithMapDictAndCounters(object):
         res = self.check(f, 'x')
         assert res == (0, 0, 1)
 
+    def test_non_mapdict_object(self):
+        import types
+        m = types.ModuleType('m')
+        m.x = 42
+        n = 42
+        def f():
+            return n.real
+        def g():
+            return m.x
+        #
+        res = self.check(f, 'real')
+        assert res == (0, 0, 1)
+        res = self.check(f, 'real')
+        assert res == (0, 0, 1)
+        res = self.check(g, 'x')
+        assert res == (0, 0, 0)
+
     def test_slots(self):
         class A(object):
             __slots__ = ['x']
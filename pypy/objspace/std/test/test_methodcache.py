@@ -201,3 +201,60 @@ class AppTestMethodCaching(test_typeobject.AppTestTypeObject):
                 setattr(a, "a%s" % i, i)
             cache_counter = __pypy__.method_cache_counter("x")
             assert cache_counter[0] == 0 # 0 hits, because all the attributes are new
+
+
+
+class TestMethodCacheGrowth:
+    spaceconfig = {"objspace.std.methodcachesizeexp": 4,
+                   "objspace.std.methodcachemaxsizeexp": 8}
+
+    def test_grows_on_collisions(self):
+        from pypy.objspace.std.typeobject import MethodCache
+        space = self.space
+        cache = space.fromcache(MethodCache)
+        assert len(cache.versions) <= 256
+        cache._allocate(4)
+        cache.reset_stats()
+        space.appexec([], """():
+            instances = [type("A%d" % i, (object,), {"f": i})()
+                         for i in range(200)]
+            for j in range(3):
+                for i, a in enumerate(instances):
+                    assert getattr(a, "f") == i
+        """)
+        assert cache.num_evictions > 0
+        assert cache.num_resizes > 0
+        assert 16 < len(cache.versions) <= 256
+        assert cache.size_exp <= cache.max_size_exp
+
+
+class AppTestMethodCacheStats:
+    spaceconfig = {"objspace.std.methodcachesizeexp": 4,
+                   "objspace.std.methodcachemaxsizeexp": 8}
+
+    def test_stats(self):
+        import __pypy__
+        class A(object):
+            def f(self):
+                return 42
+        __pypy__.reset_method_cache_stats()
+        for i in range(10):
+            assert getattr(A(), "f")() == 42
+        hits, misses, evictions, resizes, size = (
+            __pypy__.method_cache_stats())
+        assert hits >= 9
+        assert 16 <= size <= 256
+        __pypy__.reset_method_cache_stats()
+        assert __pypy__.method_cache_stats()[0] < hits
+
+    def test_evictions(self):
+        import __pypy__
+        instances = [type("A%d" % i, (object,), {"f": i})()
+                     for i in range(1000)]
+        __pypy__.reset_method_cache_stats()
+        for i, a in enumerate(instances):
+            assert getattr(a, "f") == i
+        hits, misses, evictions, resizes, size = (
+            __pypy__.method_cache_stats())
+        assert misses >= 1000
+        assert evictions > 0
@@ -81,7 +81,7 @@ class TestW_SetObject:
     def test_create_set_from_list(self):
         from pypy.interpreter.baseobjspace import W_Root
         from pypy.objspace.std.setobject import BytesSetStrategy, ObjectSetStrategy
-        from pypy.objspace.std.floatobject import W_FloatObject
+        from pypy.objspace.std.setobject import FloatSetStrategy
 
         w = self.space.wrap
         wb = self.space.newbytes
@@ -116,9 +116,9 @@ class TestW_SetObject:
         w_list = W_ListObject(self.space, [w(1.0), w(2.0), w(3.0)])
         w_set = W_SetObject(self.space)
         _initialize_set(self.space, w_set, w_list)
-        assert w_set.strategy is self.space.fromcache(ObjectSetStrategy)
-        for item in w_set.strategy.unerase(w_set.sstorage):
-            assert isinstance(item, W_FloatObject)
+        assert w_set.strategy is self.space.fromcache(FloatSetStrategy)
+        assert sorted(w_set.strategy.unerase(w_set.sstorage).keys()) == [
+            1.0, 2.0, 3.0]
 
         # changed cached object, need to change it back for other tests to pass
         intstr.get_storage_from_list = tmp_func
@@ -1070,6 +1070,56 @@ class AppTestAppSetTest:
         s.intersection_update(set())
         assert strategy(s) == "EmptySetStrategy"
 
+    def test_float_strategy(self):
+        from __pypy__ import strategy
+        s = set([1.5, 2.5, -0.0])
+        assert strategy(s) == "FloatSetStrategy"
+        s.add(0.0)
+        assert len(s) == 3
+        assert 0 in s
+        assert 2.5 in s
+        assert "2.5" not in s
+        nan = float("nan")
+        s.add(nan)
+        assert nan in s
+        assert strategy(s) == "FloatSetStrategy"
+        t = set([2.5, 3.5])
+        assert s & t == set([2.5])
+        assert s - t == set([1.5, -0.0, nan])
+        assert set([1.5]).issubset(s)
+        assert strategy(s | t) == "FloatSetStrategy"
+        s = set()
+        s.add(1.5)
+        assert strategy(s) == "FloatSetStrategy"
+        s.add("x")
+        assert strategy(s) == "ObjectSetStrategy"
+
+    def test_int_or_float_strategy(self):
+        from __pypy__ import strategy
+        s = set([1, 2, 3])
+        s.add(2.0)
+        assert strategy(s) == "IntOrFloatSetStrategy"
+        assert len(s) == 3
+        assert type([x for x in s if x == 2][0]) is int
+        s.add(1.5)
+        assert strategy(s) == "IntOrFloatSetStrategy"
+        assert 1.5 in s
+        assert 3.0 in s
+        assert s == set([1, 2, 3, 1.5])
+        s2 = set([1.5, 4.0])
+        s2 |= set([4, 5])
+        assert strategy(s2) == "IntOrFloatSetStrategy"
+        assert s2 == set([1.5, 4, 5])
+        assert type([x for x in s2 if x == 4][0]) is float
+        assert s & s2 == set([1.5])
+        assert s - s2 == set([1, 2, 3])
+        assert set([1, 1.5]).issubset(s)
+        assert frozenset([1.0, 2]) == frozenset([1, 2.0])
+        assert hash(frozenset([1.0, 2])) == hash(frozenset([1, 2]))
+        s.add("x")
+        assert strategy(s) == "ObjectSetStrategy"
+        assert s == set([1, 2, 3, 1.5, "x"])
+
     def test_weird_exception_from_iterable(self):
         def f():
            raise ValueError
@@ -2,7 +2,8 @@ from pypy.objspace.std.setobject import W_SetObject
 from pypy.objspace.std.setobject import (
     BytesIteratorImplementation, BytesSetStrategy, EmptySetStrategy,
     IntegerIteratorImplementation, IntegerSetStrategy, ObjectSetStrategy,
-    UnicodeIteratorImplementation, AsciiSetStrategy)
+    UnicodeIteratorImplementation, AsciiSetStrategy, FloatSetStrategy,
+    IntOrFloatSetStrategy)
 from pypy.objspace.std.listobject import W_ListObject
 
 class TestW_SetStrategies:
@@ -29,6 +30,28 @@ class TestW_SetStrategies:
         s = W_SetObject(self.space, self.wrapped([u"a", u"b"]))
         assert s.strategy is self.space.fromcache(AsciiSetStrategy)
 
+        s = W_SetObject(self.space, self.wrapped([1.5, 2.5]))
+        assert s.strategy is self.space.fromcache(FloatSetStrategy)
+
+    def test_switch_to_int_or_float(self):
+        s = W_SetObject(self.space, self.wrapped([1, 2, 3]))
+        s.add(self.space.wrap(1.5))
+        assert s.strategy is self.space.fromcache(IntOrFloatSetStrategy)
+        s.add(self.space.wrap(1.0))
+        assert s.length() == 4
+        s.add(self.space.wrap("x"))
+        assert s.strategy is self.space.fromcache(ObjectSetStrategy)
+
+        s1 = W_SetObject(self.space, self.wrapped([1.5, 2.0]))
+        s2 = W_SetObject(self.space, self.wrapped([2, 3]))
+        s1.update(s2)
+        assert s1.strategy is self.space.fromcache(IntOrFloatSetStrategy)
+        assert s1.length() == 3
+
+        s1 = W_SetObject(self.space, self.wrapped([1.5, 2.0]))
+        s1.add(self.space.wrap(2 ** 40))
+        assert s1.strategy is self.space.fromcache(ObjectSetStrategy)
+
     def test_switch_to_object(self):
         s = W_SetObject(self.space, self.wrapped([1,2,3,4,5]))
         s.add(self.space.wrap("six"))
@@ -142,5 +165,8 @@ class TestW_SetStrategies:
         s = W_SetObject(space, self.wrapped(["a", "b"]))
         assert sorted(space.listview_bytes(s)) == ["a", "b"]
         #
+        s = W_SetObject(space, self.wrapped([1.5, 2.5]))
+        assert sorted(space.listview_float(s)) == [1.5, 2.5]
+        #
         #s = W_SetObject(space, self.wrapped([u"a", u"b"]))
         #assert sorted(space.listview_unicode(s)) == [u"a", u"b"]
@@ -0,0 +1,131 @@
+import py
+
+from pypy.objspace.std.test import test_bytesobject
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_basic(self):
+        import __pypy__
+        # cannot do "Hello, " + "World!" because cpy2.5 optimises this
+        # away on AST level
+        s = "Hello, ".__add__("World!")
+        assert type(s) is str
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+
+    def test_add_twice(self):
+        x = "a".__add__("b")
+        y = x + "c"
+        c = x + "d"
+        assert y == "abc"
+        assert c == "abd"
+
+    def test_add(self):
+        import __pypy__
+        all = ""
+        for i in range(20):
+            all += str(i)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(all)
+        assert all == "012345678910111213141516171819"
+
+    def test_hash(self):
+        import __pypy__
+        def join(s): return s[:len(s) // 2] + s[len(s) // 2:]
+        t = 'a' * 101
+        s = join(t)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+        assert hash(s) == hash(t)
+
+    def test_len(self):
+        s = "a".__add__("b")
+        r = "c".__add__("d")
+        t = s + r
+        assert len(s) == 2
+        assert len(r) == 2
+        assert len(t) == 4
+
+    def test_buffer(self):
+        s = b'a'.__add__(b'b')
+        assert buffer(s) == buffer(b'ab')
+        assert memoryview(s) == b'ab'
+
+    def test_add_strbuf(self):
+        # make three strbuf objects
+        s = 'a'.__add__('b')
+        t = 'x'.__add__('c')
+        u = 'y'.__add__('d')
+
+        # add two different strbufs to the same string
+        v = s + t
+        w = s + u
+
+        # check that insanity hasn't resulted.
+        assert v == "abxc"
+        assert w == "abyd"
+
+    def test_compare_strbufs(self):
+        s = 'a'.__add__('b')
+        t = 'a'.__add__('b')
+        assert s == t
+        assert not s != t
+        assert s <= t
+        assert 'ab' == s
+        assert s < 'a'.__add__('c')
+
+    def test_add_unicode(self):
+        s = 'a'.__add__('b')
+        t = s + u'c'
+        assert type(t) is unicode
+        assert t == u'abc'
+        assert u'x' + s == u'xab'
+
+    def test_methods(self):
+        s = 'abc'.__add__('def')
+        assert s.upper() == 'ABCDEF'
+        assert s[1:4] == 'bcd'
+        assert s.find('cd') == 2
+        assert 'x%sx' % s == 'xabcdefx'
+        assert '{0}'.format(s) == 'abcdef'
+        assert s.format() == 'abcdef'
+        assert 'cd' in s
+        assert str(s) is s
+
+    def test_strategies(self):
+        import __pypy__
+        s = 'a'.__add__('b')
+        d = {}
+        d[s] = 1
+        assert __pypy__.strategy(d) == "BytesDictStrategy"
+        assert d['ab'] == 1
+        assert d['a'.__add__('b')] == 1
+        l = ['a'.__add__('b'), 'x']
+        assert __pypy__.strategy(l) == "BytesListStrategy"
+        l.append('y'.__add__('z'))
+        assert __pypy__.strategy(l) == "BytesListStrategy"
+        assert l == ['ab', 'x', 'yz']
+        l = []
+        l.append('a'.__add__('b'))
+        assert __pypy__.strategy(l) == "BytesListStrategy"
+        assert __pypy__.strategy(set(['a'.__add__('b')])) == "BytesSetStrategy"
+        s = set()
+        s.add('a'.__add__('b'))
+        assert __pypy__.strategy(s) == "BytesSetStrategy"
+        assert 'ab' in s
+
+    def test_add_unicode_stays_plain(self):
+        import __pypy__
+        s = u'a'.__add__(u'b')
+        assert 'W_UnicodeObject' in __pypy__.internal_repr(s)
+
+    def test_consumers(self):
+        import marshal
+        from __pypy__.builders import StringBuilder
+        assert int('1'.__add__('2')) == 12
+        assert float('1'.__add__('.5')) == 1.5
+        assert list('a'.__add__('b')) == ['a', 'b']
+        assert marshal.loads(marshal.dumps('a'.__add__('b'))) == 'ab'
+        b = StringBuilder()
+        b.append('a'.__add__('b'))
+        assert b.build() == 'ab'
+        assert u'xaby'.find('a'.__add__('b')) == 1
+        assert ('a'.__add__('b')).decode('ascii') == u'ab'
@@ -462,3 +462,113 @@ class AppTestW_TupleObject:
         if hasattr(unboundmeth, 'im_func'):
             e = raises(TypeError, unboundmeth.im_func, 42)
             assert "'tuple'" in str(e.value)
+
+
+class TestW_UnboxedTupleObject:
+    spaceconfig = {"objspace.std.withunboxedtuple": True}
+
+    def test_newtuple_is_unboxed(self):
+        from pypy.objspace.std.tupleobject import (
+            W_IntTupleObject, W_FloatTupleObject, W_BytesTupleObject)
+        space = self.space
+        w = space.wrap
+        w_tuple = space.newtuple([w(1), w(2), w(3)])
+        assert isinstance(w_tuple, W_IntTupleObject)
+        assert w_tuple.items == [1, 2, 3]
+        w_tuple = space.newtuple([w(1.5), w(2.5), w(3.5)])
+        assert isinstance(w_tuple, W_FloatTupleObject)
+        w_tuple = space.newtuple([space.newbytes(c) for c in "abc"])
+        assert isinstance(w_tuple, W_BytesTupleObject)
+        w_tuple = space.newtuple([w(1), w(2.5), w(3)])
+        assert isinstance(w_tuple, W_TupleObject)
+        w_tuple = space.newtuple([w(1), w(2)])
+        assert not isinstance(w_tuple, W_IntTupleObject)
+
+    def hash_test(self, values):
+        space = self.space
+        N_w_tuple = W_TupleObject([space.wrap(value) for value in values])
+        U_w_tuple = space.newtuple([space.wrap(value) for value in values])
+        assert type(U_w_tuple) is not W_TupleObject
+        assert space.is_true(space.eq(N_w_tuple, U_w_tuple))
+        assert space.is_true(space.eq(U_w_tuple, N_w_tuple))
+        assert space.int_w(space.hash(N_w_tuple)) == space.int_w(
+            space.hash(U_w_tuple))
+
+    def test_hash_against_normal_tuple(self):
+        self.hash_test([-1, -1, -1])
+        self.hash_test([1, 2, 1 << 62, 4])
+        self.hash_test([1.5, -0.0, 2.0, 1e300])
+        self.hash_test(["abc", "", "x"])
+
+
+class AppTestW_UnboxedTupleObject:
+    spaceconfig = {"objspace.std.withunboxedtuple": True}
+
+    def w_isunboxed(self, obj, expected):
+        import __pypy__
+        r = __pypy__.internal_repr(obj)
+        return ("W_%sTupleObject" % expected) in r
+
+    def test_create(self):
+        assert self.isunboxed((1, 2, 3), "Int")
+        assert self.isunboxed((1.0, 2.0, 3.0), "Float")
+        assert self.isunboxed(("a", "b", "c"), "Bytes")
+        assert not self.isunboxed((1, 2.0, 3), "Int")
+        assert not self.isunboxed((1, 2.0, 3), "Float")
+        assert not self.isunboxed((True, 2, 3), "Int")
+
+    def test_operations(self):
+        t = tuple(range(10))
+        assert len(t) == 10
+        assert t[3] == 3
+        assert t[-1] == 9
+        raises(IndexError, "t[10]")
+        assert t[2:5] == (2, 3, 4)
+        assert 5 in t
+        assert 5.0 in t
+        assert t.index(4) == 4
+        assert t == tuple([i for i in range(10)])
+        assert t != tuple(range(9))
+        assert t < tuple(range(1, 11))
+        assert t == tuple(float(i) for i in range(10))
+        assert hash(t) == hash(tuple(float(i) for i in range(10)))
+        a, b, c = (1.5, 2.5, 3.5)
+        assert (a, b, c) == (1.5, 2.5, 3.5)
+        assert repr(("a", "b", "c")) == "('a', 'b', 'c')"
+
+    def test_nans(self):
+        N = float('nan')
+        T = (N, N, N)
+        assert N in T
+        assert T == (N, N, N)
+        assert (0.0, 0.0, 0.0) == (-0.0, -0.0, -0.0)
+
+    def test_list_conversion(self):
+        from __pypy__ import strategy
+        l = list((1, 2, 3))
+        assert l == [1, 2, 3]
+        assert strategy(l) == "IntegerListStrategy"
+        l = list((1.5, 2.5, 3.5))
+        assert strategy(l) == "FloatListStrategy"
+        l = list(("a", "b", "c"))
+        assert strategy(l) == "BytesListStrategy"
+        l.append("d")
+        assert l == ["a", "b", "c", "d"]
+        t = tuple([1, 2, 3, 4])
+        assert self.isunboxed(t, "Int")
+        assert t == (1, 2, 3, 4)
+        t = tuple([1.5, 2.5, 3.5])
+        assert self.isunboxed(t, "Float")
+        t = tuple(["x", "y", "z"])
+        assert self.isunboxed(t, "Bytes")
+
+    def test_subclass(self):
+        class T(tuple):
+            pass
+        t = T([1, 2, 3])
+        assert type(t) is T
+        assert t == (1, 2, 3)
+
+
+class AppTestAllUnboxed(AppTestW_TupleObject):
+    spaceconfig = {"objspace.std.withunboxedtuple": True}
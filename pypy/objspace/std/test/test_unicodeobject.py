@@ -53,6 +53,44 @@ class TestUnicodeObject:
         assert space.eq_w(w_char1, w_uni._getitem_result(space, 0))
         assert space.eq_w(w_char2, w_uni._getitem_result(space, 1))
 
+    def test_split_pieces(self):
+        space = self.space
+        u = u"\xe4b c\u1234 d  \u1234"
+        w_uni = space.newutf8(u.encode("utf-8"), len(u))
+        for name in ["split", "rsplit"]:
+            w_res = space.call_method(w_uni, name)
+            pieces_w = space.listview(w_res)
+            assert [w_piece._length for w_piece in pieces_w] == [2, 2, 1, 1]
+            assert space.eq_w(w_res, space.wrap(getattr(u, name)()))
+            w_res = space.call_method(w_uni, name, space.newutf8(" ", 1))
+            assert space.eq_w(w_res, space.wrap(getattr(u, name)(u" ")))
+
+    def test_split_or_slice_whole_string_is_self(self):
+        space = self.space
+        w_uni = space.newutf8(u"a\xe4".encode("utf-8"), 2)
+        w_res = space.call_method(w_uni, "split")
+        assert space.listview(w_res)[0] is w_uni
+        w_res = space.call_method(w_uni, "rsplit", space.newutf8(",", 1))
+        assert space.listview(w_res)[0] is w_uni
+        w_res = space.getslice(w_uni, space.newint(0), space.newint(2))
+        assert w_res is w_uni
+
+    def test_prefix_slice_shares_index_storage(self):
+        space = self.space
+        u = u"\xe4x" * 1000
+        w_uni = space.newutf8(u.encode("utf-8"), len(u))
+        w_prefix = space.getslice(w_uni, space.newint(0), space.newint(1500))
+        assert w_prefix._index_storage == w_uni._index_storage
+        assert space.eq_w(space.getitem(w_prefix, space.newint(1499)),
+                          space.newutf8("x", 1))
+        assert space.int_w(space.call_method(
+            w_prefix, "find", space.newutf8("x", 1),
+            space.newint(1401))) == 1401
+        w_short = space.getslice(w_uni, space.newint(0), space.newint(100))
+        assert not w_short._index_storage
+        w_middle = space.getslice(w_uni, space.newint(1), space.newint(1900))
+        assert not w_middle._index_storage
+
 
     if HAS_HYPOTHESIS:
         @given(strategies.text(), strategies.integers(min_value=0, max_value=10),
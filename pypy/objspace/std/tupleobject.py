@@ -12,11 +12,16 @@ from pypy.objspace.std.sliceobject import (W_SliceObject, unwrap_start_stop,
 from pypy.objspace.std.util import negate, IDTAG_SPECIAL, IDTAG_SHIFT
 from rpython.rlib import jit
 from rpython.rlib.debug import make_sure_not_resized
+from rpython.rlib.longlong2float import float2longlong
+from rpython.rlib.objectmodel import compute_hash, import_from_mixin
 from rpython.rlib.rarithmetic import intmask
 
 
 UNROLL_CUTOFF = 10
 
+# tuples shorter than this are never stored unboxed
+MIN_UNBOXED_TUPLE_LENGTH = 3
+
 
 def _unroll_condition_cmp(self, space, other):
     return self._unroll_condition() or other._unroll_condition()
@@ -76,6 +81,19 @@ class W_AbstractTupleObject(W_Root):
         """Returns a copy of the items, as a resizable list."""
         raise NotImplementedError
 
+    def getitems_int_copy(self):
+        """Returns a resizable list of the unwrapped items if this tuple
+        stores ints unboxed, or None."""
+        return None
+
+    def getitems_float_copy(self):
+        """Same as getitems_int_copy, but for floats."""
+        return None
+
+    def getitems_bytes_copy(self):
+        """Same as getitems_int_copy, but for bytes."""
+        return None
+
     def length(self):
         raise NotImplementedError
 
@@ -98,6 +116,11 @@ class W_AbstractTupleObject(W_Root):
               space.is_w(space.type(w_sequence), space.w_tuple)):
             return w_sequence
         else:
+            if (space.config.objspace.std.withunboxedtuple and
+                    space.is_w(w_tupletype, space.w_tuple)):
+                w_tuple = unboxedtuple_from_listview(space, w_sequence)
+                if w_tuple is not None:
+                    return w_tuple
             tuple_w = space.fixedview(w_sequence)
         w_obj = space.allocate_instance(W_TupleObject, w_tupletype)
         W_TupleObject.__init__(w_obj, tuple_w)
@@ -367,7 +390,239 @@ class W_TupleObject(W_AbstractTupleObject):
                 self.wrappeditems, self.length(), UNROLL_CUTOFF)
 
 
+class UnboxedTupleMixin(object):
+    """Tuples whose items all have the same primitive type, stored unboxed
+    in a fixed-size list.  The concrete classes define how to wrap, hash
+    and compare a single item."""
+    _immutable_fields_ = ['items[*]']
+
+    def __init__(self, space, items):
+        make_sure_not_resized(items)
+        self.space = space
+        self.items = items
+
+    def wrap_item(self, space, item):
+        raise NotImplementedError("abstract base class")
+
+    def hash_item(self, space, item):
+        raise NotImplementedError("abstract base class")
+
+    def item_eq(self, item1, item2):
+        raise NotImplementedError("abstract base class")
+
+    def unboxed_items_of(self, w_other):
+        """Returns the items of w_other if it is an unboxed tuple of the
+        same kind as self, and None otherwise."""
+        raise NotImplementedError("abstract base class")
+
+    def tolist(self):
+        items = self.items
+        list_w = [None] * len(items)
+        for i in range(len(items)):
+            list_w[i] = self.wrap_item(self.space, items[i])
+        return list_w
+
+    def getitems_copy(self):
+        return [self.wrap_item(self.space, item) for item in self.items]
+
+    def length(self):
+        return len(self.items)
+
+    @jit.look_inside_iff(lambda self, space: self._unroll_condition())
+    def descr_hash(self, space):
+        mult = 1000003
+        x = 0x345678
+        z = len(self.items)
+        for item in self.items:
+            y = self.hash_item(space, item)
+            x = (x ^ y) * mult
+            z -= 1
+            mult += 82520 + z + z
+        x += 97531
+        return space.newint(intmask(x))
+
+    def descr_eq(self, space, w_other):
+        if not isinstance(w_other, W_AbstractTupleObject):
+            return space.w_NotImplemented
+        items2 = self.unboxed_items_of(w_other)
+        if items2 is None:
+            return self._descr_eq_wrapped(space, w_other)
+        return self._descr_eq_unboxed(space, items2)
+
+    @jit.look_inside_iff(lambda self, space, items2: self._unroll_condition())
+    def _descr_eq_unboxed(self, space, items2):
+        items1 = self.items
+        if len(items1) != len(items2):
+            return space.w_False
+        for i in range(len(items1)):
+            if not self.item_eq(items1[i], items2[i]):
+                return space.w_False
+        return space.w_True
+
+    @jit.look_inside_iff(lambda self, space, w_other: self._unroll_condition())
+    def _descr_eq_wrapped(self, space, w_other):
+        items1 = self.items
+        items2_w = w_other.tolist()
+        if len(items1) != len(items2_w):
+            return space.w_False
+        for i in range(len(items1)):
+            if not space.eq_w(self.wrap_item(space, items1[i]), items2_w[i]):
+                return space.w_False
+        return space.w_True
+
+    def descr_ne(self, space, w_other):
+        w_res = self.descr_eq(space, w_other)
+        if w_res is space.w_NotImplemented:
+            return space.w_NotImplemented
+        return space.newbool(w_res is space.w_False)
+
+    def getitem(self, space, index):
+        try:
+            item = self.items[index]
+        except IndexError:
+            raise oefmt(space.w_IndexError, "tuple index out of range")
+        return self.wrap_item(space, item)
+
+    def _unroll_condition(self):
+        return jit.loop_unrolling_heuristic(
+                self.items, len(self.items), UNROLL_CUTOFF)
+
+
+class W_IntTupleObject(W_AbstractTupleObject):
+    import_from_mixin(UnboxedTupleMixin)
+
+    def wrap_item(self, space, item):
+        return space.newint(item)
+
+    def hash_item(self, space, item):
+        from pypy.objspace.std.intobject import _hash_int
+        return _hash_int(item)
+
+    def item_eq(self, item1, item2):
+        return item1 == item2
+
+    def getitems_int_copy(self):
+        return self.items[:]
+
+    def unboxed_items_of(self, w_other):
+        if isinstance(w_other, W_IntTupleObject):
+            return w_other.items
+        return None
+
+
+class W_FloatTupleObject(W_AbstractTupleObject):
+    import_from_mixin(UnboxedTupleMixin)
+
+    def wrap_item(self, space, item):
+        return space.newfloat(item)
+
+    def hash_item(self, space, item):
+        from pypy.objspace.std.floatobject import _hash_float
+        return _hash_float(space, item)
+
+    def item_eq(self, item1, item2):
+        # identical NaNs are equal here, like in a tuple of boxed floats
+        return item1 == item2 or float2longlong(item1) == float2longlong(item2)
+
+    def getitems_float_copy(self):
+        return self.items[:]
+
+    def unboxed_items_of(self, w_other):
+        if isinstance(w_other, W_FloatTupleObject):
+            return w_other.items
+        return None
+
+
+class W_BytesTupleObject(W_AbstractTupleObject):
+    import_from_mixin(UnboxedTupleMixin)
+
+    def wrap_item(self, space, item):
+        return space.newbytes(item)
+
+    def hash_item(self, space, item):
+        x = compute_hash(item)
+        x -= (x == -1)
+        return x
+
+    def item_eq(self, item1, item2):
+        return item1 == item2
+
+    def getitems_bytes_copy(self):
+        return self.items[:]
+
+    def unboxed_items_of(self, w_other):
+        if isinstance(w_other, W_BytesTupleObject):
+            return w_other.items
+        return None
+
+
+@jit.look_inside_iff(lambda space, list_w:
+        jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
+def makeunboxedtuple(space, list_w):
+    """Returns an unboxed tuple if all the items of list_w are exact ints,
+    floats or bytes, and None otherwise."""
+    length = len(list_w)
+    if length < MIN_UNBOXED_TUPLE_LENGTH:
+        return None
+    w_first = list_w[0]
+    if space.config.objspace.std.withstrbuf:
+        from pypy.objspace.std.strbufobject import unwrap_strbuf
+        w_first = unwrap_strbuf(w_first)
+    if type(w_first) is space.IntObjectCls:
+        intitems = [0] * length
+        for i in range(length):
+            w_item = list_w[i]
+            if type(w_item) is not space.IntObjectCls:
+                return None
+            intitems[i] = space.int_w(w_item)
+        return W_IntTupleObject(space, intitems)
+    elif type(w_first) is space.FloatObjectCls:
+        floatitems = [0.0] * length
+        for i in range(length):
+            w_item = list_w[i]
+            if type(w_item) is not space.FloatObjectCls:
+                return None
+            floatitems[i] = space.float_w(w_item)
+        return W_FloatTupleObject(space, floatitems)
+    elif type(w_first) is space.StringObjectCls:
+        bytesitems = [None] * length
+        for i in range(length):
+            w_item = list_w[i]
+            if space.config.objspace.std.withstrbuf:
+                from pypy.objspace.std.strbufobject import unwrap_strbuf
+                w_item = unwrap_strbuf(w_item)
+            if type(w_item) is not space.StringObjectCls:
+                return None
+            bytesitems[i] = space.bytes_w(w_item)
+        return W_BytesTupleObject(space, bytesitems)
+    return None
+
+def unboxedtuple_from_listview(space, w_sequence):
+    """tuple(lst) for a list with an int, float or bytes strategy: build an
+    unboxed tuple directly from the list storage."""
+    intlist = space.listview_int(w_sequence)
+    if intlist is not None:
+        if len(intlist) < MIN_UNBOXED_TUPLE_LENGTH:
+            return None
+        return W_IntTupleObject(space, intlist[:])
+    floatlist = space.listview_float(w_sequence)
+    if floatlist is not None:
+        if len(floatlist) < MIN_UNBOXED_TUPLE_LENGTH:
+            return None
+        return W_FloatTupleObject(space, floatlist[:])
+    byteslist = space.listview_bytes(w_sequence)
+    if byteslist is not None:
+        if len(byteslist) < MIN_UNBOXED_TUPLE_LENGTH:
+            return None
+        return W_BytesTupleObject(space, byteslist[:])
+    return None
+
+
 def wraptuple(space, list_w):
+    if space.config.objspace.std.withunboxedtuple:
+        w_tuple = makeunboxedtuple(space, list_w)
+        if w_tuple is not None:
+            return w_tuple
     if space.config.objspace.std.withspecialisedtuple:
         from specialisedtupleobject import makespecialisedtuple, NotSpecialised
         try:
@@ -69,20 +69,41 @@ class VersionTag(object):
     pass
 
 class MethodCache(object):
+    """A two-way set-associative cache of type lookups, indexed by the
+    version tag of the type and the name.  It starts with
+    2 ** methodcachesizeexp entries and doubles, up to
+    2 ** methodcachemaxsizeexp entries, when too many of the lookups of a
+    measurement window had to evict a previous entry.
+    """
+
+    # grow if more than 1/GROW_EVICTION_RATE of the lookups evict an entry
+    GROW_EVICTION_RATE = 16
 
     def __init__(self, space):
-        # Note: these attributes never change which object they contain,
-        # so reading 'cache.versions' for example is constant-folded.
-        # The actual list in 'cache.versions' is not a constant, of
-        # course.
-        SIZE = 1 << space.config.objspace.std.methodcachesizeexp
-        self.versions = [None] * SIZE
-        self.names = [None] * SIZE
-        self.lookup_where = [(None, None)] * SIZE
+        self.initial_size_exp = space.config.objspace.std.methodcachesizeexp
+        self.max_size_exp = max(space.config.objspace.std.methodcachemaxsizeexp,
+                                self.initial_size_exp)
+        self._allocate(self.initial_size_exp)
+        self.reset_stats()
         if space.config.objspace.std.withmethodcachecounter:
             self.hits = {}
             self.misses = {}
 
+    def _allocate(self, size_exp):
+        SIZE = 1 << size_exp
+        self.size_exp = size_exp
+        self.versions = [None] * SIZE
+        self.names = [None] * SIZE
+        self.lookup_where = [(None, None)] * SIZE
+
+    def reset_stats(self):
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_evictions = 0
+        self.num_resizes = 0
+        self.window_start = 0
+        self.window_evictions = 0
+
     def clear(self):
         None_None = (None, None)
         for i in range(len(self.versions)):
@@ -93,7 +114,57 @@ class MethodCache(object):
             self.lookup_where[i] = None_None
 
     def _cleanup_(self):
-        self.clear()
+        self._allocate(self.initial_size_exp)
+        self.reset_stats()
+
+    def set_index(self, version_tag, name):
+        """Return the index of the first of the two entries where 'name'
+        looked up in a type with the given version tag can be cached."""
+        SHIFT2 = r_uint.BITS - self.size_exp
+        SHIFT1 = SHIFT2 - 5
+        version_tag_as_int = current_object_addr_as_int(version_tag)
+        # ^^^Note: if the version_tag object is moved by a moving GC, the
+        # existing method cache entries won't be found any more; new
+        # entries will be created based on the new address.  The
+        # assumption is that the version_tag object won't keep moving all
+        # the time - so using the fast current_object_addr_as_int() instead
+        # of a slower solution like hash() is still a good trade-off.
+        hash_name = compute_hash(name)
+        product = intmask(version_tag_as_int * hash_name)
+        method_hash = (r_uint(product) ^ (r_uint(product) << SHIFT1)) >> SHIFT2
+        # ^^^Note2: we used to just take product>>SHIFT2, but on 64-bit
+        # platforms SHIFT2 is really large, and we loose too much information
+        # that way (as shown by failures of the tests that typically have
+        # method names like 'f' who hash to a number that has only ~33 bits).
+        return intmask(method_hash) & ~1
+
+    def insert(self, index, version_tag, name, tup):
+        # the new entry goes first in its set, the previous first entry
+        # becomes the second one, and the previous second one is evicted
+        evicted = self.versions[index + 1] is not None
+        self.versions[index + 1] = self.versions[index]
+        self.names[index + 1] = self.names[index]
+        self.lookup_where[index + 1] = self.lookup_where[index]
+        self.versions[index] = version_tag
+        self.names[index] = name
+        self.lookup_where[index] = tup
+        if evicted:
+            self.num_evictions += 1
+            self.window_evictions += 1
+        self._check_window()
+
+    def _check_window(self):
+        # a measurement window lasts as many lookups as there are entries
+        lookups = self.num_hits + self.num_misses - self.window_start
+        if lookups < len(self.versions):
+            return
+        if (self.window_evictions * self.GROW_EVICTION_RATE > lookups and
+                self.size_exp < self.max_size_exp):
+            # the entries are lost, but the next lookups will refill them
+            self._allocate(self.size_exp + 1)
+            self.num_resizes += 1
+        self.window_start = self.num_hits + self.num_misses
+        self.window_evictions = 0
 
 class _Global(object):
     weakref_warning_printed = False
@@ -200,7 +271,9 @@ class W_TypeObject(W_Root):
             # dict_w of any of the types in the mro changes, or if the mro
             # itself changes
             self._version_tag = VersionTag()
-        from pypy.objspace.std.mapdict import DictTerminator, NoDictTerminator
+        from pypy.objspace.std.mapdict import (DictTerminator,
+                NoDictTerminator, SLOTS_SUBCLASSES_NUM_UNBOXED)
+        from pypy.objspace.std.objectobject import W_ObjectObject
         # if the typedef has a dict, then the rpython-class does all the dict
         # management, which means from the point of view of mapdict there is no
         # dict. However, W_InstanceObjects are an exception to this
@@ -211,6 +284,13 @@ class W_TypeObject(W_Root):
             self.terminator = DictTerminator(space, self)
         else:
             self.terminator = NoDictTerminator(space, self)
+            if (typedef is W_ObjectObject.typedef and not self.hasdict and
+                    layout.nslots > 0):
+                # instances of classes with __slots__ only store some
+                # unboxed values inline, see get_compact_slots_subclass.
+                # this only depends on the layout, so __class__ assignment
+                # keeps working
+                self.terminator.inline_unboxed = SLOTS_SUBCLASSES_NUM_UNBOXED
 
     @not_rpython
     def __repr__(self):
@@ -446,36 +526,23 @@ class W_TypeObject(W_Root):
     def _pure_lookup_where_with_method_cache(self, name, version_tag):
         space = self.space
         cache = space.fromcache(MethodCache)
-        SHIFT2 = r_uint.BITS - space.config.objspace.std.methodcachesizeexp
-        SHIFT1 = SHIFT2 - 5
-        version_tag_as_int = current_object_addr_as_int(version_tag)
-        # ^^^Note: if the version_tag object is moved by a moving GC, the
-        # existing method cache entries won't be found any more; new
-        # entries will be created based on the new address.  The
-        # assumption is that the version_tag object won't keep moving all
-        # the time - so using the fast current_object_addr_as_int() instead
-        # of a slower solution like hash() is still a good trade-off.
-        hash_name = compute_hash(name)
-        product = intmask(version_tag_as_int * hash_name)
-        method_hash = (r_uint(product) ^ (r_uint(product) << SHIFT1)) >> SHIFT2
-        # ^^^Note2: we used to just take product>>SHIFT2, but on 64-bit
-        # platforms SHIFT2 is really large, and we loose too much information
-        # that way (as shown by failures of the tests that typically have
-        # method names like 'f' who hash to a number that has only ~33 bits).
-        cached_version_tag = cache.versions[method_hash]
-        if cached_version_tag is version_tag:
-            cached_name = cache.names[method_hash]
+        index = cache.set_index(version_tag, name)
+        if (cache.versions[index] is not version_tag or
+                cache.names[index] is not name):
+            index += 1
+        if cache.versions[index] is version_tag:
+            cached_name = cache.names[index]
             if cached_name is name:
-                tup = cache.lookup_where[method_hash]
+                tup = cache.lookup_where[index]
+                cache.num_hits += 1
                 if space.config.objspace.std.withmethodcachecounter:
                     cache.hits[name] = cache.hits.get(name, 0) + 1
 #                print "hit", self, name
                 return tup
         tup = self._lookup_where_all_typeobjects(name)
         if space._side_effects_ok():
-            cache.versions[method_hash] = version_tag
-            cache.names[method_hash] = name
-            cache.lookup_where[method_hash] = tup
+            cache.num_misses += 1
+            cache.insert(index & ~1, version_tag, name, tup)
             if space.config.objspace.std.withmethodcachecounter:
                 cache.misses[name] = cache.misses.get(name, 0) + 1
 #        print "miss", self, name
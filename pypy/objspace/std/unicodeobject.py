@@ -695,36 +695,61 @@ class W_UnicodeObject(W_Root):
     def descr_split(self, space, w_sep=None, maxsplit=-1):
         res = []
         value = self._utf8
-        is_ascii = self.is_ascii()
         if space.is_none(w_sep):
             # need two calls, due to the specialization
-            if is_ascii:
+            if self.is_ascii():
                 res = split(value, maxsplit=maxsplit, isutf8=False)
             else:
                 res = split(value, maxsplit=maxsplit, isutf8=True)
-            return space.newlist_utf8(res, is_ascii)
+            return self._newlist_pieces(space, res)
 
         by = self.convert_arg_to_w_unicode(space, w_sep)._utf8
         if len(by) == 0:
             raise oefmt(space.w_ValueError, "empty separator")
         res = split(value, by, maxsplit, isutf8=True)
 
-        return space.newlist_utf8(res, self.is_ascii())
+        return self._newlist_pieces(space, res)
 
     @unwrap_spec(maxsplit=int)
     def descr_rsplit(self, space, w_sep=None, maxsplit=-1):
         res = []
         value = self._utf8
         if space.is_none(w_sep):
-            res = rsplit(value, maxsplit=maxsplit, isutf8=True)
-            return space.newlist_utf8(res, self.is_ascii())
+            if self.is_ascii():
+                res = rsplit(value, maxsplit=maxsplit, isutf8=False)
+            else:
+                res = rsplit(value, maxsplit=maxsplit, isutf8=True)
+            return self._newlist_pieces(space, res)
 
         by = self.convert_arg_to_w_unicode(space, w_sep)._utf8
         if len(by) == 0:
             raise oefmt(space.w_ValueError, "empty separator")
         res = rsplit(value, by, maxsplit, isutf8=True)
 
-        return space.newlist_utf8(res, self.is_ascii())
+        return self._newlist_pieces(space, res)
+
+    def _newlist_pieces(self, space, pieces):
+        # 'pieces' are cut out of self._utf8 at code point boundaries, so
+        # they are valid utf-8 already and only need their code points
+        # counted, not checked.  A piece that is the whole string is self.
+        if self.is_ascii():
+            if len(pieces) == 1 and len(pieces[0]) == len(self._utf8):
+                return space.newlist([self._unicode_self(space)])
+            return space.newlist_utf8(pieces, True)
+        pieces_w = [None] * len(pieces)
+        for i in range(len(pieces)):
+            piece = pieces[i]
+            if len(piece) == len(self._utf8):
+                pieces_w[i] = self._unicode_self(space)
+            else:
+                pieces_w[i] = W_UnicodeObject(
+                    piece, rutf8.codepoints_in_utf8(piece))
+        return space.newlist(pieces_w)
+
+    def _unicode_self(self, space):
+        if type(self) is W_UnicodeObject:
+            return self
+        return W_UnicodeObject(self._utf8, self._length)
 
     def descr_getitem(self, space, w_index):
         if isinstance(w_index, W_SliceObject):
@@ -774,9 +799,17 @@ class W_UnicodeObject(W_Root):
         #     full index, but second does?
         assert start >= 0
         assert stop >= 0
+        if start == 0 and stop == self._length:
+            return self._unicode_self(space)
         byte_start = self._index_to_byte(start)
         byte_stop = self._index_to_byte(stop)
-        return W_UnicodeObject(self._utf8[byte_start:byte_stop], stop - start)
+        w_res = W_UnicodeObject(self._utf8[byte_start:byte_stop], stop - start)
+        if start == 0 and stop >= self._length // 2 and not self.is_ascii():
+            # a long enough prefix can share our index storage: its
+            # codepoints are at the same byte positions, and computing
+            # byte_stop above filled in all the blocks it can ever need
+            w_res._index_storage = self._index_storage
+        return w_res
 
     @jit.unroll_safe
     def _unicode_sliced_constant_index_jit(self, space, start, stop):
@@ -927,7 +960,7 @@ class W_UnicodeObject(W_Root):
                     W_UnicodeObject._compute_index_storage, self)
 
     def _compute_index_storage(self):
-        storage = rutf8.create_utf8_index_storage(self._utf8, self._length)
+        storage = rutf8.new_utf8_index_storage(self._length)
         self._index_storage = storage
         return storage
 
@@ -10,6 +10,11 @@ class CPUTotalTracker(object):
     total_compiled_bridges = 0
     total_freed_loops = 0
     total_freed_bridges = 0
+    # memory used by the loops and bridges not freed yet, in bytes;
+    # see CompiledLoopToken.record_memory_usage()
+    asm_memory = 0
+    resume_memory = 0
+    descr_memory = 0
 
 class AbstractCPU(object):
     supports_floats = False
@@ -292,6 +297,9 @@ class AbstractCPU(object):
 class CompiledLoopToken(object):
     asmmemmgr_blocks = None
     asmmemmgr_gcreftracers = None
+    asm_memory = 0
+    resume_memory = 0
+    descr_memory = 0
 
     def __init__(self, cpu, number):
         cpu.tracker.total_compiled_loops += 1
@@ -313,6 +321,25 @@ class CompiledLoopToken(object):
         debug_print("allocating Bridge #", self.bridges_count, "of Loop #", self.number)
         debug_stop("jit-mem-looptoken-alloc")
 
+    def record_memory_usage(self, resume_memory, descr_memory):
+        """Called after a loop or bridge was compiled for this token, with
+        the estimated size of the resume data and of the guard descrs that
+        it added.  The machine code is measured from asmmemmgr_blocks."""
+        asm_memory = 0
+        if self.asmmemmgr_blocks is not None:
+            for rawstart, rawstop in self.asmmemmgr_blocks:
+                asm_memory += rawstop - rawstart
+        tracker = self.cpu.tracker
+        tracker.asm_memory += asm_memory - self.asm_memory
+        tracker.resume_memory += resume_memory
+        tracker.descr_memory += descr_memory
+        self.asm_memory = asm_memory
+        self.resume_memory += resume_memory
+        self.descr_memory += descr_memory
+
+    def get_memory_usage(self):
+        return self.asm_memory + self.resume_memory + self.descr_memory
+
     def update_frame_info(self, oldlooptoken, baseofs):
         new_fi = self.frame_info
         new_loop_tokens = []
@@ -335,4 +362,7 @@ class CompiledLoopToken(object):
         self.cpu.free_loop_and_bridges(self)
         self.cpu.tracker.total_freed_loops += 1
         self.cpu.tracker.total_freed_bridges += self.bridges_count
+        self.cpu.tracker.asm_memory -= self.asm_memory
+        self.cpu.tracker.resume_memory -= self.resume_memory
+        self.cpu.tracker.descr_memory -= self.descr_memory
         #debug_stop("jit-mem-looptoken-free")
@@ -5,6 +5,9 @@ class FakeCPU(object):
         total_compiled_loops = 0
         total_freed_loops = 0
         total_freed_bridges = 0
+        asm_memory = 0
+        resume_memory = 0
+        descr_memory = 0
 
     def free_loop_and_bridges(self, *args):
         pass
@@ -30,3 +33,18 @@ def test_redirect_loop_token():
     assert c.frame_info.jfi_frame_depth == 3
     assert c2.frame_info.jfi_frame_depth == 3
     
+
+def test_memory_usage():
+    cpu = FakeCPU()
+    c = CompiledLoopToken(cpu, 0)
+    c.asmmemmgr_blocks = [(1000, 1100)]
+    c.record_memory_usage(30, 40)
+    assert c.get_memory_usage() == 170
+    c.asmmemmgr_blocks.append((2000, 2050))    # a bridge
+    c.record_memory_usage(5, 8)
+    assert (c.asm_memory, c.resume_memory, c.descr_memory) == (150, 35, 48)
+    assert (cpu.tracker.asm_memory, cpu.tracker.resume_memory,
+            cpu.tracker.descr_memory) == (150, 35, 48)
+    del c       # frees the loop
+    assert (cpu.tracker.asm_memory, cpu.tracker.resume_memory,
+            cpu.tracker.descr_memory) == (0, 0, 0)
@@ -5,7 +5,7 @@ from rpython.rtyper.annlowlevel import (
 from rpython.rlib.objectmodel import we_are_translated
 from rpython.rlib.debug import (
     debug_start, debug_stop, debug_print, have_debug_prints)
-from rpython.rlib.rarithmetic import r_uint, intmask
+from rpython.rlib.rarithmetic import r_uint, intmask, LONG_BIT
 from rpython.rlib import rstack
 from rpython.rlib.jit import JitDebugInfo, Counters, dont_look_inside
 from rpython.rlib.rjitlog import rjitlog as jl
@@ -168,6 +168,21 @@ def make_jitcell_token(jitdriver_sd):
     jitcell_token.outermost_jitdriver_sd = jitdriver_sd
     return jitcell_token
 
+# rough estimates, in bytes, used for the memory budget (see memmgr.py)
+WORD = LONG_BIT // 8
+GUARD_DESCR_SIZE = 12 * WORD     # a ResumeGuardDescr with the backend's data
+PENDING_FIELD_SIZE = 3 * WORD
+
+def estimate_resume_memory(storage):
+    size = 0
+    if storage.rd_numb:
+        size += len(storage.rd_numb.code)
+    if storage.rd_virtuals is not None:
+        size += len(storage.rd_virtuals) * WORD
+    if storage.rd_pendingfields:
+        size += len(storage.rd_pendingfields) * PENDING_FIELD_SIZE
+    return size
+
 def record_loop_or_bridge(metainterp_sd, loop):
     """Do post-backend recordings and cleanups on 'loop'.
     """
@@ -180,10 +195,15 @@ def record_loop_or_bridge(metainterp_sd, loop):
     wref = weakref.ref(original_jitcell_token)
     clt = original_jitcell_token.compiled_loop_token
     clt.loop_token_wref = wref
+    resume_memory = 0
+    descr_memory = 0
     for op in loop.operations:
         descr = op.getdescr()
         if isinstance(descr, ResumeDescr):
             descr.rd_loop_token = clt   # stick it there
+            descr_memory += GUARD_DESCR_SIZE
+            if isinstance(descr, ResumeGuardDescr):
+                resume_memory += estimate_resume_memory(descr)
         if isinstance(descr, JitCellToken):
             # for a CALL_ASSEMBLER: record it as a potential jump.
             if descr is not original_jitcell_token:
@@ -201,6 +221,7 @@ def record_loop_or_bridge(metainterp_sd, loop):
                 op._descr_wref = weakref.ref(op._descr)
             op.cleardescr()    # clear reference to prevent the history.Stats
                                # from keeping the loop alive during tests
+    clt.record_memory_usage(resume_memory, descr_memory)
     # record this looptoken on the QuasiImmut used in the code
     if loop.quasi_immutable_deps is not None:
         for qmut in loop.quasi_immutable_deps:
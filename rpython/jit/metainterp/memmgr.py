@@ -2,6 +2,7 @@ import math
 from rpython.rlib.rarithmetic import r_int64
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
 from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.listsort import make_timsort_class
 
 #
 # Logic to decide which loops are old and not used any more.
@@ -19,6 +20,24 @@ from rpython.rlib.objectmodel import we_are_translated
 # 'generation' field is much smaller than the current generation, and
 # removed from the set.
 #
+# Optionally, the loops can also be given a memory budget: the estimated
+# memory used by the machine code, the resume data and the guard descrs
+# of the loops in 'alive_loops' (see CompiledLoopToken.get_memory_usage()).
+# Whenever the budget is exceeded, the least recently used loops are
+# removed from the set, in the same way as old loops.  The 'generation'
+# field records when a loop was last entered, so it gives the order.
+#
+
+def _used_before(looptoken1, looptoken2):
+    return looptoken1.generation < looptoken2.generation
+
+LoopTokenSort = make_timsort_class(lt=_used_before)
+
+def get_memory_usage(looptoken):
+    clt = looptoken.compiled_loop_token
+    if clt is None:
+        return 0
+    return clt.get_memory_usage()
 
 class MemoryManager(object):
 
@@ -38,6 +57,7 @@ class MemoryManager(object):
         self.current_generation = r_int64(1)
         self.next_check = r_int64(-1)
         self.alive_loops = {}
+        self.memory_budget = 0      # in bytes, 0 for no limit
 
     def set_max_age(self, max_age, check_frequency=0):
         if max_age <= 0:
@@ -49,11 +69,16 @@ class MemoryManager(object):
             self.check_frequency = check_frequency
             self.next_check = self.current_generation + 1
 
+    def set_memory_budget(self, memory_budget):
+        self.memory_budget = max(memory_budget, 0)
+
     def next_generation(self):
         self.current_generation += 1
         if self.current_generation == self.next_check:
             self._kill_old_loops_now()
             self.next_check = self.current_generation + self.check_frequency
+        if self.memory_budget > 0:
+            self._kill_loops_over_budget()
 
     def keep_loop_alive(self, looptoken):
         if looptoken.generation != self.current_generation:
@@ -82,6 +107,36 @@ class MemoryManager(object):
             rgc.collect(); rgc.collect(); rgc.collect()
         debug_stop("jit-mem-collect")
 
+    def _kill_loops_over_budget(self):
+        looptokens = self.alive_loops.keys()
+        total = 0
+        for looptoken in looptokens:
+            total += get_memory_usage(looptoken)
+        if total <= self.memory_budget:
+            return
+        debug_start("jit-mem-budget")
+        oldtotal = len(self.alive_loops)
+        debug_print("Memory budget:      ", self.memory_budget)
+        debug_print("Memory before:      ", total)
+        LoopTokenSort(looptokens).sort()
+        for looptoken in looptokens:
+            if total <= self.memory_budget:
+                break
+            if looptoken.generation < 0:
+                continue
+            total -= get_memory_usage(looptoken)
+            del self.alive_loops[looptoken]
+        newtotal = len(self.alive_loops)
+        debug_print("Memory after:       ", total)
+        debug_print("Loop tokens freed:  ", oldtotal - newtotal)
+        debug_print("Loop tokens left:   ", newtotal)
+        if not we_are_translated():
+            looptoken = None
+            looptokens = None
+            from rpython.rlib import rgc
+            rgc.collect(); rgc.collect(); rgc.collect()
+        debug_stop("jit-mem-budget")
+
     def release_all_loops(self):
         debug_start("jit-mem-releaseall")
         debug_print("Loop tokens cleared:", len(self.alive_loops))
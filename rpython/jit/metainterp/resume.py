@@ -182,6 +182,7 @@ class ResumeDataLoopMemo(object):
         self.refs = new_ref_dict()
         self.cached_boxes = {}
         self.cached_virtuals = {}
+        self.numberings = {}    # hash -> list of NUMBERINGs
 
         self.nvirtuals = 0
         self.nvholes = 0
@@ -285,6 +286,27 @@ class ResumeDataLoopMemo(object):
         return numb_state
 
 
+    def create_numbering(self, numb_state):
+        """Encode the resume data in 'numb_state'.  Guards of the same loop
+        whose encoded resume data is identical share the same NUMBERING
+        (for example the same guard in the preamble and in the peeled
+        loop, which differ only by their failargs)."""
+        numb = numb_state.create_numbering()
+        size = len(numb.code)
+        profiler = self.metainterp_sd.profiler
+        profiler.count(jitprof.Counters.RESUME_BYTES, size)
+        hash = resumecode.numbering_hash(numb)
+        numbs = self.numberings.get(hash, None)
+        if numbs is None:
+            self.numberings[hash] = [numb]
+            return numb
+        for other in numbs:
+            if resumecode.numbering_eq(other, numb):
+                profiler.count(jitprof.Counters.RESUME_BYTES_SHARED, size)
+                return other
+        numbs.append(numb)
+        return numb
+
     # caching for virtuals and boxes inside them
 
     def num_cached_boxes(self):
@@ -470,7 +492,7 @@ class ResumeDataVirtualAdder(VirtualVisitor):
         numb_state.patch(1, len(liveboxes))
 
         self._add_optimizer_sections(numb_state, liveboxes, liveboxes_from_env)
-        storage.rd_numb = numb_state.create_numbering()
+        storage.rd_numb = self.memo.create_numbering(numb_state)
         storage.rd_consts = self.memo.consts
         return liveboxes[:]
 
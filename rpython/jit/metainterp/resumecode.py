@@ -24,6 +24,7 @@
 
 from rpython.rtyper.lltypesystem import rffi, lltype
 from rpython.rlib import objectmodel
+from rpython.rlib.rarithmetic import intmask
 
 NUMBERINGP = lltype.Ptr(lltype.GcForwardReference())
 NUMBERING = lltype.GcStruct('Numbering',
@@ -72,6 +73,20 @@ def numb_next_n_items(numb, size, index):
         _, index = numb_next_item(numb, index)
     return index
 
+def numbering_hash(numb):
+    x = len(numb.code)
+    for i in range(len(numb.code)):
+        x = intmask((1000003 * x) ^ rffi.cast(lltype.Signed, numb.code[i]))
+    return x
+
+def numbering_eq(numb1, numb2):
+    if len(numb1.code) != len(numb2.code):
+        return False
+    for i in range(len(numb1.code)):
+        if numb1.code[i] != numb2.code[i]:
+            return False
+    return True
+
 def unpack_numbering(numb):
     l = []
     i = 0
@@ -139,6 +139,34 @@ class BasicTests:
 
         self.interp_operations(m, [123232])
 
+    def test_rutf8_lazy_index_storage(self):
+        from rpython.rlib import rutf8
+        myjitdriver = JitDriver(greens=[], reds=['n', 'i', 'total', 'b'])
+        u = u'\xe4x' * 100
+        @dont_look_inside
+        def new_storage():
+            return rutf8.new_utf8_index_storage(len(u))
+        def f(n):
+            b = u.encode('utf8')
+            i = 0
+            total = 0
+            while i < n:
+                myjitdriver.jit_merge_point(n=n, i=i, total=total, b=b)
+                # the result is not used, but the blocks must be filled in
+                storage = new_storage()
+                rutf8.codepoint_at_index(b, storage, (i * 61) % 200)
+                total += storage.built
+                i += 1
+            return total
+        stats = rutf8.utf8_index_stats
+        old_chunk = stats.chunk
+        stats.set_chunk(64)
+        try:
+            res = self.meta_interp(f, [30])
+        finally:
+            stats.set_chunk(old_chunk)
+        assert res == sum([(i * 61) % 200 // 64 + 1 for i in range(30)])
+        self.check_trace_count(1)
 
     def test_loop_variant_mul_ovf(self):
         myjitdriver = JitDriver(greens = [], reds = ['y', 'res', 'x'])
@@ -14,7 +14,8 @@ class FakeCPU(object):
     supports_guard_gc_type = True
 
     class Storage:
-        pass
+        def record_memory_usage(self, resume_memory, descr_memory):
+            pass
 
     class tracker:
         pass
@@ -15,12 +15,21 @@ from rpython.jit.metainterp.memmgr import MemoryManager
 from rpython.jit.metainterp.test.support import LLJitMixin
 from rpython.rlib.jit import JitDriver, dont_look_inside
 from rpython.jit.metainterp.warmspot import get_stats
+from rpython.jit.metainterp import pyjitpl
 from rpython.jit.metainterp.warmstate import BaseJitCell
 from rpython.rlib import rgc
 
 class FakeLoopToken:
     generation = 0
     invalidated = False
+    compiled_loop_token = None
+
+class FakeCompiledLoopToken:
+    def __init__(self, memory):
+        self.memory = memory
+
+    def get_memory_usage(self):
+        return self.memory
 
 
 class _TestMemoryManager:
@@ -79,6 +88,39 @@ class _TestMemoryManager:
                 assert tokens[i] in memmgr.alive_loops
 
 
+    def test_memory_budget(self):
+        memmgr = MemoryManager()
+        memmgr.set_max_age(0)
+        memmgr.set_memory_budget(250)
+        tokens = [FakeLoopToken() for i in range(3)]
+        for token in tokens:
+            token.compiled_loop_token = FakeCompiledLoopToken(100)
+        memmgr.keep_loop_alive(tokens[0])
+        memmgr.next_generation()
+        memmgr.keep_loop_alive(tokens[1])
+        memmgr.next_generation()
+        assert memmgr.alive_loops == dict.fromkeys(tokens[:2])
+        memmgr.keep_loop_alive(tokens[2])
+        memmgr.keep_loop_alive(tokens[0])
+        memmgr.next_generation()
+        # tokens[1] is the least recently used one
+        assert memmgr.alive_loops == dict.fromkeys([tokens[0], tokens[2]])
+
+    def test_memory_budget_and_max_age(self):
+        memmgr = MemoryManager()
+        memmgr.set_max_age(4, 1)
+        memmgr.set_memory_budget(1000)
+        tokens = [FakeLoopToken() for i in range(10)]
+        for token in tokens:
+            token.compiled_loop_token = FakeCompiledLoopToken(300)
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation()
+        assert memmgr.alive_loops == dict.fromkeys(tokens[7:])
+        memmgr.set_memory_budget(500)
+        memmgr.next_generation()
+        assert memmgr.alive_loops == dict.fromkeys(tokens[9:])
+
+
 class _TestIntegration(LLJitMixin):
     # See comments in TestMemoryManager.  To get temporarily the normal
     # behavior just rename this class to TestIntegration.
@@ -212,6 +254,35 @@ class _TestIntegration(LLJitMixin):
         assert res == 42
         self.check_enter_count(2 + 10*4)
 
+    def test_memory_budget(self):
+        myjitdriver = JitDriver(greens=['m'], reds=['n'])
+        def g(m):
+            n = 10
+            while n > 0:
+                myjitdriver.can_enter_jit(n=n, m=m)
+                myjitdriver.jit_merge_point(n=n, m=m)
+                n = n - 1
+            return 21
+        def f():
+            for i in range(10):
+                for m in range(8):
+                    g(m)
+            return 42
+
+        res = self.meta_interp(f, [])
+        assert res == 42
+        # a loop and an entry bridge for each g(m)
+        self.check_enter_count(16)
+        tracker = pyjitpl._warmrunnerdesc.cpu.tracker
+        assert tracker.resume_memory > 0
+        assert tracker.descr_memory > 0
+
+        # the loops of all the g(m) don't fit in 1KB, so the least
+        # recently used ones are freed and compiled again
+        res = self.meta_interp(f, [], memory_budget=1)
+        assert res == 42
+        assert get_stats().enter_count > 16
+
     def test_call_assembler_keep_alive(self):
         myjitdriver1 = JitDriver(greens=['m'], reds=['n'])
         myjitdriver2 = JitDriver(greens=['m'], reds=['n', 'rec'])
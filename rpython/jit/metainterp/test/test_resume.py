@@ -9,7 +9,7 @@ from rpython.jit.metainterp.resume import (
     VArrayInfoNotClear, VStrPlainInfo, VStrConcatInfo, VStrSliceInfo,
     VUniPlainInfo, VUniConcatInfo, VUniSliceInfo,
     ResumeDataLoopMemo, UNASSIGNEDVIRTUAL, INT, annlowlevel, PENDINGFIELDSP,
-    TAG_CONST_OFFSET)
+    TAG_CONST_OFFSET, NumberingState)
 from rpython.jit.metainterp.resumecode import (
     unpack_numbering, create_numbering)
 from rpython.jit.metainterp.opencoder import Trace
@@ -20,7 +20,7 @@ from rpython.jit.metainterp.history import (
     RefFrontendOp, CONST_NULL)
 from rpython.jit.metainterp.support import ptr2int
 from rpython.jit.metainterp.optimizeopt.test.test_util import LLtypeMixin
-from rpython.jit.metainterp import executor
+from rpython.jit.metainterp import executor, jitprof
 from rpython.jit.codewriter import longlong
 from rpython.jit.metainterp.resoperation import ResOperation, rop
 from rpython.rlib.debug import debug_start, debug_stop, debug_print,\
@@ -538,6 +538,7 @@ class FakeJitCode(object):
 class FakeMetaInterpStaticData:
     cpu = LLtypeMixin.cpu
     all_descrs = []
+    profiler = jitprof.EmptyProfiler()
 
     class options:
         failargs_limit = 100
@@ -769,6 +770,32 @@ def test_ResumeDataLoopMemo_number_boxes():
     memo.clear_box_virtual_numbers()
     assert memo.num_cached_boxes() == 0
 
+def test_ResumeDataLoopMemo_create_numbering_shared():
+    class Profiler:
+        def __init__(self):
+            self.counters = {}
+        def count(self, kind, inc=1):
+            self.counters[kind] = self.counters.get(kind, 0) + inc
+    metainterp_sd = FakeMetaInterpStaticData()
+    metainterp_sd.profiler = Profiler()
+    memo = ResumeDataLoopMemo(metainterp_sd)
+    def numbering(items):
+        numb_state = NumberingState(len(items))
+        for item in items:
+            numb_state.append_int(item)
+        return memo.create_numbering(numb_state)
+    numb1 = numbering([5, 0, 3, 300, -2])
+    numb2 = numbering([5, 0, 3, 300, -1])
+    numb3 = numbering([5, 0, 3, 300, -2])
+    assert numb3 is numb1
+    assert numb2 is not numb1
+    assert unpack_numbering(numb2) == [5, 0, 3, 300, -1]
+    size = len(numb1.code)
+    assert len(numb2.code) == size
+    counters = metainterp_sd.profiler.counters
+    assert counters[jitprof.Counters.RESUME_BYTES] == 3 * size
+    assert counters[jitprof.Counters.RESUME_BYTES_SHARED] == size
+
 def test_ResumeDataLoopMemo_number_virtuals():
     memo = ResumeDataLoopMemo(FakeMetaInterpStaticData())
     b1, b2 = [IntFrontendOp(0, 0), IntFrontendOp(0, 0)]
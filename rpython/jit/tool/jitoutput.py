@@ -30,6 +30,8 @@ REGEXES = [
     (('nvirtuals',), '^nvirtuals:\s+(\d+)$'),
     (('nvholes',), '^nvholes:\s+(\d+)$'),
     (('nvreused',), '^nvreused:\s+(\d+)$'),
+    (('resume_bytes',), '^resume bytes:\s+(\d+)$'),
+    (('resume_bytes_shared',), '^resume bytes shared:\s+(\d+)$'),
     (('vecopt_tried',), '^vecopt tried:\s+(\d+)$'),
     (('vecopt_success',), '^vecopt success:\s+(\d+)$'),
     (('total_compiled_loops',),   '^Total # of loops:\s+(\d+)$'),
@@ -63,6 +65,8 @@ class OutputInfo(object):
     nvirtuals = 0
     nvholes = 0
     nvreused = 0
+    resume_bytes = 0
+    resume_bytes_shared = 0
     vecopt_tried = 0
     vecopt_success = 0
 
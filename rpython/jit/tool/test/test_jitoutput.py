@@ -65,6 +65,8 @@ virtualizables forced:  1123
 nvirtuals:              13
 nvholes:                14
 nvreused:               15
+resume bytes:           1000
+resume bytes shared:    300
 vecopt tried:           12
 vecopt success:         4
 Total # of loops:       100
@@ -96,5 +98,7 @@ def test_parse():
     assert info.nvirtuals == 13
     assert info.nvholes == 14
     assert info.nvreused == 15
+    assert info.resume_bytes == 1000
+    assert info.resume_bytes_shared == 300
     assert info.vecopt_tried == 12
     assert info.vecopt_success == 4
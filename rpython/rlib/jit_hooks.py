@@ -128,6 +128,22 @@ def stats_asmmemmgr_allocated(warmrunnerdesc):
 def stats_asmmemmgr_used(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[1]
 
+@register_helper(annmodel.SomeInteger())
+def stats_memory_asm(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.cpu.tracker.asm_memory
+
+@register_helper(annmodel.SomeInteger())
+def stats_memory_resume(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.cpu.tracker.resume_memory
+
+@register_helper(annmodel.SomeInteger())
+def stats_memory_descrs(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.cpu.tracker.descr_memory
+
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_memory_budget(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.memory_budget
+
 @register_helper(None)
 def stats_memmgr_release_all(warmrunnerdesc):
     warmrunnerdesc.memory_manager.release_all_loops()
@@ -1,4 +1,4 @@
-from rpython.rlib.rarithmetic import ovfcheck
+from rpython.rlib.rarithmetic import ovfcheck, r_uint, intmask
 from rpython.rlib.objectmodel import specialize
 
 
@@ -678,3 +678,161 @@ def make_timsort_class(getitem=None, setitem=None, length=None,
     return TimSort
 
 TimSort = make_timsort_class() #backward compatible interface
+
+
+## ------------------------------------------------------------------------
+## Non-comparison sorts for lists of machine-sized ints and of strings.
+## They only sort the list if they expect to be faster than TimSort, and
+## return False without touching it otherwise.  Both are stable, even if
+## that cannot be observed for ints or strings.
+## ------------------------------------------------------------------------
+
+RADIX_SORT_MIN_LENGTH = 512    # below this, TimSort always wins
+RADIX_PRESORTED_SHIFT = 6      # leave lists with <= n>>6 descents to TimSort
+RADIX_BITS = 8
+RADIX_BUCKETS = 1 << RADIX_BITS
+RADIX_PASS_COST = 2            # a pass costs about as much as 2 compares
+COUNTING_SORT_SPAN_FACTOR = 2  # counting sort if max - min < n * factor
+STRING_INSERTION_CUTOFF = 32
+
+
+def _log2(n):
+    result = 0
+    while n > 1:
+        n >>= 1
+        result += 1
+    return result
+
+
+def int_radix_sort(lst):
+    """Sort a list of ints in place with a counting sort if the values are
+    dense, or with an LSD radix sort on the bytes of (value - min) if there
+    are few enough of them.  Returns False, leaving the list untouched, if
+    TimSort is expected to be faster: for short lists, nearly sorted lists
+    and lists whose value range needs too many radix passes."""
+    n = len(lst)
+    if n < RADIX_SORT_MIN_LENGTH:
+        return False
+    lo = hi = prev = lst[0]
+    descents = 0
+    for i in range(1, n):
+        x = lst[i]
+        if x < prev:
+            descents += 1
+        if x < lo:
+            lo = x
+        elif x > hi:
+            hi = x
+        prev = x
+    if descents == 0:
+        return True
+    if descents <= n >> RADIX_PRESORTED_SHIFT:
+        return False
+    ulo = r_uint(lo)
+    span = r_uint(hi) - ulo
+    if span < r_uint(n) * COUNTING_SORT_SPAN_FACTOR:
+        _int_counting_sort(lst, lo, intmask(span) + 1)
+        return True
+    passes = 0
+    while span:
+        span >>= RADIX_BITS
+        passes += 1
+    if passes * RADIX_PASS_COST > _log2(n):
+        return False
+    _int_lsd_radix_sort(lst, ulo, passes)
+    return True
+
+def _int_counting_sort(lst, lo, size):
+    counts = [0] * size
+    for x in lst:
+        counts[x - lo] += 1
+    i = 0
+    for k in range(size):
+        value = lo + k
+        for j in range(counts[k]):
+            lst[i] = value
+            i += 1
+
+def _int_lsd_radix_sort(lst, ulo, passes):
+    n = len(lst)
+    src = lst
+    dst = [0] * n
+    shift = 0
+    for p in range(passes):
+        counts = [0] * (RADIX_BUCKETS + 1)
+        for x in src:
+            digit = intmask(((r_uint(x) - ulo) >> shift) & (RADIX_BUCKETS - 1))
+            counts[digit + 1] += 1
+        for b in range(RADIX_BUCKETS):
+            counts[b + 1] += counts[b]
+        for x in src:
+            digit = intmask(((r_uint(x) - ulo) >> shift) & (RADIX_BUCKETS - 1))
+            dst[counts[digit]] = x
+            counts[digit] += 1
+        src, dst = dst, src
+        shift += RADIX_BITS
+    if src is not lst:
+        for i in range(n):
+            lst[i] = src[i]
+
+
+def string_radix_sort(lst):
+    """Sort a list of strings in place with an MSD radix sort, finishing
+    small buckets with an insertion sort.  Returns False, leaving the list
+    untouched, for short or nearly sorted lists where TimSort is expected to
+    be faster."""
+    n = len(lst)
+    if n < RADIX_SORT_MIN_LENGTH:
+        return False
+    descents = 0
+    for i in range(1, n):
+        if lst[i] < lst[i - 1]:
+            descents += 1
+    if descents == 0:
+        return True
+    if descents <= n >> RADIX_PRESORTED_SHIFT:
+        return False
+    scratch = [lst[0]] * n
+    # all strings in lst[start:stop] have the same first 'depth' characters
+    pending = [(0, n, 0)]
+    while pending:
+        start, stop, depth = pending.pop()
+        if stop - start <= STRING_INSERTION_CUTOFF:
+            _string_insertion_sort(lst, start, stop)
+            continue
+        # bucket 0 is for the strings of length 'depth', which come first
+        counts = [0] * (RADIX_BUCKETS + 2)
+        for i in range(start, stop):
+            counts[_string_digit(lst[i], depth) + 1] += 1
+        counts[0] = start
+        for b in range(RADIX_BUCKETS + 1):
+            counts[b + 1] += counts[b]
+        for i in range(start, stop):
+            s = lst[i]
+            digit = _string_digit(s, depth)
+            scratch[counts[digit]] = s
+            counts[digit] += 1
+        for i in range(start, stop):
+            lst[i] = scratch[i]
+        # counts[b] is now the end of bucket b; bucket 0 is all equal
+        bucket_start = counts[0]
+        for b in range(1, RADIX_BUCKETS + 1):
+            bucket_stop = counts[b]
+            if bucket_stop - bucket_start > 1:
+                pending.append((bucket_start, bucket_stop, depth + 1))
+            bucket_start = bucket_stop
+    return True
+
+def _string_digit(s, depth):
+    if depth < len(s):
+        return ord(s[depth]) + 1
+    return 0
+
+def _string_insertion_sort(lst, start, stop):
+    for i in range(start + 1, stop):
+        s = lst[i]
+        j = i
+        while j > start and s < lst[j - 1]:
+            lst[j] = lst[j - 1]
+            j -= 1
+        lst[j] = s
@@ -22,7 +22,8 @@ from rpython.rlib.rstring import StringBuilder
 from rpython.rlib import jit, types, rarithmetic
 from rpython.rlib.signature import signature, finishsigs
 from rpython.rlib.types import char, none
-from rpython.rlib.rarithmetic import r_uint
+from rpython.rlib.rarithmetic import r_uint, r_longlong
+from rpython.rlib.rtimer import read_timestamp
 from rpython.rlib.unicodedata import unicodedb
 from rpython.rtyper.lltypesystem import lltype, rffi
 
@@ -505,55 +506,130 @@ def surrogate_in_utf8(utf8):
     return -1
 
 
-UTF8_INDEX_STORAGE = lltype.GcArray(lltype.Struct('utf8_loc_elem',
+UTF8_INDEX_BLOCKS = lltype.GcArray(lltype.Struct('utf8_loc_elem',
         ('baseindex', lltype.Signed),
         ('ofs', lltype.FixedSizeArray(lltype.Char, 16)),
     ))
+UTF8_INDEX_STORAGE = lltype.GcStruct('utf8_index_storage',
+        ('length', lltype.Signed),     # number of codepoints in the string
+        ('built', lltype.Signed),      # number of blocks filled in so far
+        ('nextbase', lltype.Signed),   # byte position of block 'built'
+        ('blocks', lltype.Ptr(UTF8_INDEX_BLOCKS)),
+    )
+
+class Utf8IndexStats(object):
+    """ Global settings and counters of the utf8 index storages.  The
+    'chunk' is the number of codepoints whose position is computed at once
+    when an index storage is filled in lazily; it is rounded up to a
+    multiple of 64.
+    """
+    def __init__(self):
+        self.chunk = 1024
+        self.reset()
+
+    def reset(self):
+        self.storages = 0        # number of index storages allocated
+        self.builds = 0          # number of times some blocks were filled in
+        self.blocks = 0          # number of blocks filled in
+        self.build_time = r_longlong(0)   # in units of read_timestamp()
+
+    def set_chunk(self, chunk):
+        self.chunk = max(chunk, 1)
+
+utf8_index_stats = Utf8IndexStats()
 
 def null_storage():
     return lltype.nullptr(UTF8_INDEX_STORAGE)
 
+def new_utf8_index_storage(utf8len):
+    """ Create an empty index storage for a utf8 encoded unicode string of
+    'utf8len' codepoints.  The storage is filled in lazily, in chunks of
+    utf8_index_stats.chunk codepoints, by the functions that use it.
+    """
+    arraysize = utf8len // 64 + 1
+    storage = lltype.malloc(UTF8_INDEX_STORAGE)
+    storage.blocks = lltype.malloc(UTF8_INDEX_BLOCKS, arraysize)
+    storage.length = utf8len
+    storage.built = 0
+    storage.nextbase = 0
+    utf8_index_stats.storages += 1
+    return storage
+
 def create_utf8_index_storage(utf8, utf8len):
     """ Create an index storage which stores index of each 4th character
     in utf8 encoded unicode string.
     """
-    arraysize = utf8len // 64 + 1
-    storage = lltype.malloc(UTF8_INDEX_STORAGE, arraysize)
-    baseindex = 0
-    current = 0
-    while True:
-        storage[current].baseindex = baseindex
+    storage = new_utf8_index_storage(utf8len)
+    _fill_utf8_index_storage(utf8, storage, len(storage.blocks))
+    return storage
+
+# The lookups below are elidable: they only read blocks that are filled in
+# already, and filled in blocks never change.  Filling in blocks updates the
+# storage and utf8_index_stats, so it is done before calling them, by
+# functions that the JIT does not look inside.
+
+def _ensure_utf8_index_block(utf8, storage, current):
+    if current >= storage.built:
+        _fill_utf8_index_chunk(utf8, storage, current)
+
+@jit.dont_look_inside
+def _fill_utf8_index_chunk(utf8, storage, current):
+    stop = current + (utf8_index_stats.chunk + 63) // 64
+    _fill_utf8_index_storage(utf8, storage, min(stop, len(storage.blocks)))
+
+@jit.dont_look_inside
+def _ensure_utf8_index_bytepos(utf8, storage, bytepos):
+    # fill in the storage at least up to the block containing bytepos
+    while (storage.built < len(storage.blocks) and
+           storage.nextbase <= bytepos):
+        _ensure_utf8_index_block(utf8, storage, storage.built)
+
+def _fill_utf8_index_storage(utf8, storage, stop):
+    """ Fill in the blocks of the storage from 'storage.built' up to 'stop'.
+    Each block stores the position of each 4th character of a range of 64.
+    """
+    t0 = read_timestamp()
+    current = storage.built
+    baseindex = storage.nextbase
+    remaining = storage.length - (current << 6)
+    while current < stop:
+        storage.blocks[current].baseindex = baseindex
         next = baseindex
         for i in range(16):
-            if utf8len == 0:
+            if remaining == 0:
                 next += 1      # assume there is an extra '\x00' character
             else:
                 next = next_codepoint_pos(utf8, next)
-            storage[current].ofs[i] = chr(next - baseindex)
-            utf8len -= 4
-            if utf8len < 0:
-                assert current + 1 == len(storage)
+            storage.blocks[current].ofs[i] = chr(next - baseindex)
+            remaining -= 4
+            if remaining < 0:
+                assert current + 1 == len(storage.blocks)
                 break
             next = next_codepoint_pos(utf8, next)
             next = next_codepoint_pos(utf8, next)
             next = next_codepoint_pos(utf8, next)
-        else:
-            current += 1
-            baseindex = next
-            continue
-        break
-    return storage
+        utf8_index_stats.blocks += 1
+        current += 1
+        baseindex = next
+    storage.built = current
+    storage.nextbase = baseindex
+    utf8_index_stats.builds += 1
+    utf8_index_stats.build_time += read_timestamp() - t0
 
-@jit.elidable
 def codepoint_position_at_index(utf8, storage, index):
     """ Return byte index of a character inside utf8 encoded string, given
     storage of type UTF8_INDEX_STORAGE.  The index must be smaller than
     or equal to the utf8 length: if needed, check explicitly before calling
     this function.
     """
+    _ensure_utf8_index_block(utf8, storage, index >> 6)
+    return _codepoint_position_at_index(utf8, storage, index)
+
+@jit.elidable
+def _codepoint_position_at_index(utf8, storage, index):
     current = index >> 6
-    ofs = ord(storage[current].ofs[(index >> 2) & 0x0F])
-    bytepos = storage[current].baseindex + ofs
+    ofs = ord(storage.blocks[current].ofs[(index >> 2) & 0x0F])
+    bytepos = storage.blocks[current].baseindex + ofs
     index &= 0x3
     if index == 0:
         return prev_codepoint_pos(utf8, bytepos)
@@ -572,14 +648,18 @@ def _pos_at_index(utf8, index):
         pos = next_codepoint_pos(utf8, pos)
     return pos
 
-@jit.elidable
 def codepoint_at_index(utf8, storage, index):
     """ Return codepoint of a character inside utf8 encoded string, given
     storage of type UTF8_INDEX_STORAGE
     """
+    _ensure_utf8_index_block(utf8, storage, index >> 6)
+    return _codepoint_at_index(utf8, storage, index)
+
+@jit.elidable
+def _codepoint_at_index(utf8, storage, index):
     current = index >> 6
-    ofs = ord(storage[current].ofs[(index >> 2) & 0x0F])
-    bytepos = storage[current].baseindex + ofs
+    ofs = ord(storage.blocks[current].ofs[(index >> 2) & 0x0F])
+    bytepos = storage.blocks[current].baseindex + ofs
     index &= 0x3
     if index == 0:
         return codepoint_before_pos(utf8, bytepos)
@@ -590,7 +670,6 @@ def codepoint_at_index(utf8, storage, index):
         bytepos = next_codepoint_pos(utf8, bytepos)
     return codepoint_at_pos(utf8, bytepos)
 
-@jit.elidable
 def codepoint_index_at_byte_position(utf8, storage, bytepos, num_codepoints):
     """ Return the character index for which
     codepoint_position_at_index(index) == bytepos.
@@ -600,32 +679,39 @@ def codepoint_index_at_byte_position(utf8, storage, bytepos, num_codepoints):
     """
     if bytepos < 0:
         return bytepos
+    _ensure_utf8_index_bytepos(utf8, storage, bytepos)
+    return _codepoint_index_at_byte_position(utf8, storage, bytepos,
+                                             num_codepoints)
+
+@jit.elidable
+def _codepoint_index_at_byte_position(utf8, storage, bytepos,
+                                      num_codepoints):
     # binary search on elements of storage
     index_min = 0
-    index_max = len(storage) - 1
+    index_max = storage.built - 1
     while index_min < index_max:
         # this addition can't overflow because storage has a length that is
         # 1/64 of the length of a string
         index_middle = (index_min + index_max + 1) // 2
-        base_bytepos = storage[index_middle].baseindex
+        base_bytepos = storage.blocks[index_middle].baseindex
         if bytepos < base_bytepos:
             index_max = index_middle - 1
         else:
             index_min = index_middle
 
-    baseindex = storage[index_min].baseindex
+    baseindex = storage.blocks[index_min].baseindex
     if baseindex == bytepos:
         return index_min << 6
 
     # use ofs to get closer to the correct character index
     result = index_min << 6
     bytepos1 = baseindex
-    if index_min == len(storage) - 1:
+    if index_min == len(storage.blocks) - 1:
         maxindex = ((num_codepoints - 1) >> 2) & 0x0F
     else:
         maxindex = 16
     for i in range(maxindex):
-        x = baseindex + ord(storage[index_min].ofs[i])
+        x = baseindex + ord(storage.blocks[index_min].ofs[i])
         if x >= bytepos:
             break
         bytepos1 = x
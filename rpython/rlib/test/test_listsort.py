@@ -1,6 +1,7 @@
 import py
 from rpython.rlib.listsort import TimSort, powerloop
-import random, os
+from rpython.rlib.listsort import int_radix_sort, string_radix_sort
+import random, os, sys
 
 from hypothesis import given, strategies as st, example
 
@@ -84,3 +85,63 @@ def test_powerloop_equal_power(s1, n1, n2, moreitems):
     n = s1 + n1 + n2 + moreitems
     assert powerloop(s1, n1, n2, n) == power(s1, n1, n2, n)
 
+
+def test_int_radix_sort_counting():
+    lst = [random.randrange(-100, 900) for i in range(1000)]
+    expected = sorted(lst)
+    assert int_radix_sort(lst)
+    assert lst == expected
+
+def test_int_radix_sort_lsd():
+    for bits in [16, 24]:
+        lst = [random.randrange(-2**bits, 2**bits) for i in range(4000)]
+        expected = sorted(lst)
+        assert int_radix_sort(lst)
+        assert lst == expected
+
+def test_int_radix_sort_refuses():
+    short = [3, 1, 2]
+    assert not int_radix_sort(short)
+    assert short == [3, 1, 2]
+    nearly_sorted = range(1000)
+    nearly_sorted[10], nearly_sorted[20] = nearly_sorted[20], nearly_sorted[10]
+    copy = nearly_sorted[:]
+    assert not int_radix_sort(nearly_sorted)
+    assert nearly_sorted == copy
+    wide = [-sys.maxint-1, sys.maxint, 0, 1] * 150
+    random.shuffle(wide)
+    copy = wide[:]
+    assert not int_radix_sort(wide)
+    assert wide == copy
+
+def test_int_radix_sort_sorted():
+    lst = range(1000)
+    assert int_radix_sort(lst)
+    assert lst == range(1000)
+
+@given(st.lists(st.integers(min_value=-sys.maxint-1, max_value=sys.maxint),
+                min_size=512, max_size=1000))
+def test_int_radix_sort_hypothesis(lst):
+    expected = sorted(lst)
+    if not int_radix_sort(lst):
+        lst.sort()
+    assert lst == expected
+
+def test_string_radix_sort():
+    alphabet = 'ab\x00\xff'
+    lst = [''.join([random.choice(alphabet)
+                    for j in range(random.randrange(6))])
+           for i in range(2000)]
+    expected = sorted(lst)
+    assert string_radix_sort(lst)
+    assert lst == expected
+    short = ['b', 'a']
+    assert not string_radix_sort(short)
+    assert short == ['b', 'a']
+
+@given(st.lists(st.binary(max_size=8), min_size=512, max_size=1000))
+def test_string_radix_sort_hypothesis(lst):
+    expected = sorted(lst)
+    if not string_radix_sort(lst):
+        lst.sort()
+    assert lst == expected
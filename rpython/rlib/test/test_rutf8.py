@@ -154,6 +154,35 @@ def test_codepoint_position_at_index_inverse(u):
         assert rutf8.codepoint_index_at_byte_position(
                        b, storage, bytepos, len(u)) == i
 
+def test_utf8_index_storage_lazy():
+    u = (u'ä' + u'x«' * 1000 + u'–' + u'y' * 100) * 3
+    b = u.encode('utf8')
+    stats = rutf8.utf8_index_stats
+    old_chunk = stats.chunk
+    stats.set_chunk(100)    # rounded up to two blocks
+    stats.reset()
+    try:
+        storage = rutf8.new_utf8_index_storage(len(u))
+        assert storage.built == 0
+        assert rutf8.codepoint_position_at_index(b, storage, 130) == (
+            len(u[:130].encode('utf8')))
+        assert storage.built == 4
+        assert stats.storages == 1
+        assert stats.builds == 1
+        assert stats.blocks == 4
+        assert rutf8.codepoint_at_index(b, storage, 200) == ord(u[200])
+        assert storage.built == 4
+        bytepos = len(u[:5000].encode('utf8'))
+        assert rutf8.codepoint_index_at_byte_position(
+            b, storage, bytepos, len(u)) == 5000
+        assert 5000 // 64 < storage.built < len(storage.blocks)
+        for i in range(len(u) + 1):
+            assert (rutf8.codepoint_position_at_index(b, storage, i) ==
+                    len(u[:i].encode('utf8')))
+        assert storage.built == len(storage.blocks)
+    finally:
+        stats.set_chunk(old_chunk)
+
 
 repr_func = rutf8.make_utf8_escape_function(prefix='u', pass_printable=False,
                                             quotes=True)